@@ -0,0 +1,2 @@
+# Benchmarks for the game's hot paths. Run from the repository root, e.g.:
+#     python -m benchmarks.bench_platform_collision
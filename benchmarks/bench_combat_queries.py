@@ -0,0 +1,70 @@
+# Cost of the player attack hitbox test and the pet target search with
+# linear scans vs. MonsterIndex.
+#     python -m benchmarks.bench_combat_queries
+from benchmarks import common
+from benchmarks.common import time_per_call
+
+import config
+from src.player import Player
+from src.spatial import MonsterIndex
+
+MONSTER_COUNTS = [50, 500, 2000, 5000]
+TICKS = 50
+
+
+def make_monsters(count, seed=0):
+    """Grunts spread over a level that widens with the count (constant density)."""
+    return common.make_monsters(count, max(config.SCREEN_WIDTH, count * 20), seed=seed,
+                                monster_mix={"Grunt": 1}, monster_stats={"health": 10**9})
+
+
+def make_player():
+    player = Player(config.PLAYER_START_X, config.PLAYER_START_Y, config.PLAYER_WIDTH,
+                    config.PLAYER_HEIGHT, config.PLAYER_COLOR)
+    player.attack_damage = 0
+    player.pet.attack_damage = 0
+    return player
+
+
+def patrol(monsters):
+    """Nudges every monster a couple of pixels, alternating direction, like a patrol step."""
+    for i, monster in enumerate(monsters):
+        monster.speed = -monster.speed if i % 7 == 0 else monster.speed
+        monster.rect.x += monster.speed
+
+
+def linear_tick(player, monsters):
+    patrol(monsters)
+    player.last_attack_time = player.attack_cooldown
+    player.attempt_attack(monsters)
+    player.pet.last_attack_time = player.pet.attack_cooldown
+    player.pet.update([], monsters, player)
+
+
+def indexed_tick(player, monsters, index):
+    patrol(monsters)
+    index.mark_dirty() # Monsters moved this tick, so every query tick pays for a refresh
+    player.last_attack_time = player.attack_cooldown
+    player.attempt_attack(monsters, index)
+    player.pet.last_attack_time = player.pet.attack_cooldown
+    player.pet.update([], monsters, player, index)
+
+
+def run():
+    results = []
+    for count in MONSTER_COUNTS:
+        monsters = make_monsters(count, seed=count)
+        player = make_player()
+        index = MonsterIndex(monsters)
+        linear_cost = time_per_call(lambda: linear_tick(player, monsters), TICKS)
+        indexed_cost = time_per_call(lambda: indexed_tick(player, monsters, index), TICKS)
+        results.append({"monsters": count, "linear_us": linear_cost * 1e6, "indexed_us": indexed_cost * 1e6})
+    return results
+
+
+if __name__ == '__main__':
+    print("Cost of a tick where both the player attack and the pet target search fire")
+    print("(both include a patrol step; index time includes its refresh after monsters moved)")
+    print(f"{'monsters':>10} {'linear (us)':>12} {'index (us)':>12} {'speedup':>8}")
+    for row in run():
+        print(f"{row['monsters']:>10} {row['linear_us']:>12.1f} {row['indexed_us']:>12.1f} {row['linear_us'] / row['indexed_us']:>7.1f}x")
@@ -0,0 +1,81 @@
+# All-or-nothing crafting: InventoryManager.apply_batch vs. the same guarantee
+# built from single calls (probe with has_item, apply, undo if an add doesn't fit).
+#     python -m benchmarks.bench_inventory_batch
+from benchmarks.common import time_per_call
+
+from src.inventory_manager import InventoryManager
+from src.items import Item
+
+STACK_COUNTS = [100, 1000]
+CALLS = 2000
+
+INGREDIENTS = [Item(f"Ingredient {i}", "", stackable=True, max_stack=20) for i in range(3)]
+PRODUCT = Item("Crafted Blade", "", stackable=False)
+RECIPE_REMOVES = [(ingredient.name, 2) for ingredient in INGREDIENTS]
+RECIPE_ADDS = [(PRODUCT, 1)]
+
+
+def apply_with_single_calls(inventory, adds, removes):
+    """What callers had to write before apply_batch."""
+    for item_name, quantity in removes:
+        if not inventory.has_item(item_name, quantity):
+            return False
+    taken = [(inventory.stacks_by_name[item_name][0]['item'], quantity) for item_name, quantity in removes]
+    for item_name, quantity in removes:
+        inventory.remove_item(item_name, quantity)
+    added = []
+    for item, quantity in adds:
+        held = inventory.get_item_count(item.name)
+        if not inventory.add_item(item, quantity):
+            # Undo: drop what this call and the earlier adds put in, give the ingredients back
+            inventory.remove_item(item.name, inventory.get_item_count(item.name) - held)
+            for added_item, added_quantity in added:
+                inventory.remove_item(added_item.name, added_quantity)
+            for taken_item, taken_quantity in taken:
+                inventory.add_item(taken_item, taken_quantity)
+            return False
+        added.append((item, quantity))
+    return True
+
+
+def make_inventory(stacks, free_slots):
+    """`stacks` stacks: filler materials plus partly used stacks of each ingredient."""
+    inventory = InventoryManager(capacity=stacks + free_slots)
+    for ingredient in INGREDIENTS:
+        inventory.add_item(ingredient, 10)
+    for i in range(stacks - len(INGREDIENTS)):
+        inventory.add_item(Item(f"Material {i}", "", stackable=True, max_stack=20), 20)
+    return inventory
+
+
+def make_round(stacks, free_slots, batched):
+    """A callable that crafts once and then reverses it, so the inventory stays the same."""
+    inventory = make_inventory(stacks, free_slots)
+    undo_adds = [(ingredient, 2) for ingredient in INGREDIENTS]
+    undo_removes = [(PRODUCT.name, 1)]
+    if batched:
+        def craft_round():
+            if inventory.apply_batch(RECIPE_ADDS, RECIPE_REMOVES):
+                inventory.apply_batch(undo_adds, undo_removes)
+    else:
+        def craft_round():
+            if apply_with_single_calls(inventory, RECIPE_ADDS, RECIPE_REMOVES):
+                apply_with_single_calls(inventory, undo_adds, undo_removes)
+    return craft_round
+
+
+def run():
+    results = []
+    for stacks in STACK_COUNTS:
+        for scenario, free_slots in (("crafted", 1), ("no room", 0)):
+            single = time_per_call(make_round(stacks, free_slots, batched=False), CALLS)
+            batched = time_per_call(make_round(stacks, free_slots, batched=True), CALLS)
+            results.append({"stacks": stacks, "scenario": scenario, "single_us": single * 1e6, "batched_us": batched * 1e6})
+    return results
+
+
+if __name__ == '__main__':
+    print("Craft 3 ingredients x2 -> 1 item (and reverse it), all or nothing")
+    print(f"{'stacks':>8} {'scenario':>10} {'single calls (us)':>18} {'apply_batch (us)':>17} {'speedup':>8}")
+    for row in run():
+        print(f"{row['stacks']:>8} {row['scenario']:>10} {row['single_us']:>18.2f} {row['batched_us']:>17.2f} {row['single_us'] / row['batched_us']:>7.1f}x")
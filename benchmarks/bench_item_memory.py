@@ -0,0 +1,70 @@
+# Memory held by 100k stored item drops: a new item object per drop (the old
+# __dict__-based Item, and the same with __slots__) vs. slots that all reference
+# the one shared Monster Part definition.
+#     python -m benchmarks.bench_item_memory
+import gc
+import tracemalloc
+
+import benchmarks.common # Selects the dummy video/audio drivers
+
+import config
+from src.items import Item, get_item_definition
+
+STORED_ITEMS = 100_000
+ITEM_ID = "MonsterPart"
+
+
+class DictItem:
+    """The previous Item layout: a full per-instance __dict__."""
+    def __init__(self, name, description, value=0, stackable=False, max_stack=1, sprite_id=None):
+        self.name = name
+        self.description = description
+        self.value = value
+        self.stackable = stackable
+        self.max_stack = max_stack if stackable else 1
+        self.sprite_id = sprite_id
+
+
+def constructor_args():
+    """What the old drop code passed to the item constructor: the defaults minus item_class_name."""
+    return {k: v for k, v in config.GENERIC_ITEM_DEFAULTS[ITEM_ID].items() if k != "item_class_name"}
+
+
+def store_new_dict_items():
+    return [{'item': DictItem(**constructor_args()), 'quantity': 1} for _ in range(STORED_ITEMS)]
+
+
+def store_new_slotted_items():
+    return [{'item': Item(**constructor_args()), 'quantity': 1} for _ in range(STORED_ITEMS)]
+
+
+def store_shared_definition():
+    return [{'item': get_item_definition(ITEM_ID), 'quantity': 1} for _ in range(STORED_ITEMS)]
+
+
+def measure(store):
+    """Bytes still allocated while the stored slots are alive."""
+    get_item_definition(ITEM_ID) # The shared definition exists before measuring, as in a running game
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    slots = store()
+    held = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del slots
+    return held
+
+
+def run():
+    return [
+        {"layout": "new item per drop (__dict__)", "bytes": measure(store_new_dict_items)},
+        {"layout": "new item per drop (__slots__)", "bytes": measure(store_new_slotted_items)},
+        {"layout": "shared definition", "bytes": measure(store_shared_definition)},
+    ]
+
+
+if __name__ == '__main__':
+    print(f"Memory for {STORED_ITEMS:,} stored '{ITEM_ID}' drops, one inventory slot dict each")
+    print(f"{'layout':<32} {'total (MB)':>11} {'per item (B)':>13}")
+    for row in run():
+        print(f"{row['layout']:<32} {row['bytes'] / 1e6:>11.1f} {row['bytes'] / STORED_ITEMS:>13.0f}")
@@ -0,0 +1,75 @@
+# Level transition cost: Game.load_level_assets for the game's own level files, read
+# cold or already prefetched, and for generated levels with many platforms and
+# monster groups.
+#     python -m benchmarks.bench_level_load
+import contextlib
+import os
+import time
+from unittest import mock
+
+from benchmarks.common import time_per_call
+
+import config
+from src.game import Game
+from src import levels
+from src.level_generator import generate_level
+
+GROUP_COUNTS = [10, 100, 1000] # Monster groups (and platforms) per generated level
+ITERATIONS = 50
+
+
+def make_level(groups, seed=0):
+    """A generated level with `groups` platforms and twice as many monsters, in groups of 2."""
+    return generate_level(seed=seed, platform_count=groups, monster_count=2 * groups, group_size=2)
+
+
+def _transition_ms(game, level_count, prefetched, repeat=5):
+    """Best-of-`repeat` average main-thread ms of loading each of the game's levels.
+
+    Cold levels are read and compiled during the load; prefetched ones were
+    prepared beforehand, as the background worker does while the previous level is
+    played (that time isn't counted).
+    """
+    best = float('inf')
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for _ in range(repeat):
+            total = 0.0
+            for i in range(ITERATIONS):
+                levels.clear_cache()
+                if prefetched:
+                    levels.get_level_blueprint(i % level_count)
+                start = time.perf_counter()
+                game.load_level_assets(i % level_count)
+                total += time.perf_counter() - start
+            best = min(best, total / ITERATIONS)
+    return best * 1e3
+
+
+def run():
+    game = Game(headless=True)
+    results = []
+    level_count = levels.level_count()
+    with mock.patch.object(config, "LEVEL_PREFETCH", False):
+        results.append({"level": "files, cold", "ms": _transition_ms(game, level_count, prefetched=False)})
+        results.append({"level": "prefetched", "ms": _transition_ms(game, level_count, prefetched=True)})
+
+    original = config.LEVEL_CONFIGS
+    try:
+        for groups in GROUP_COUNTS:
+            config.LEVEL_CONFIGS = [make_level(groups, seed=groups)]
+            cost = time_per_call(lambda: game.load_level_assets(0), max(3, ITERATIONS * 10 // groups))
+            results.append({"level": f"{groups} groups", "ms": cost * 1e3})
+        # The scale the generator is meant for: generating it, then loading it
+        generate = lambda: generate_level(seed=0, platform_count=10000, monster_count=5000)
+        results.append({"level": "generate 10k/5k", "ms": time_per_call(generate, 3) * 1e3})
+        config.LEVEL_CONFIGS = [generate()]
+        results.append({"level": "load 10k/5k", "ms": time_per_call(lambda: game.load_level_assets(0), 3) * 1e3})
+    finally:
+        config.LEVEL_CONFIGS = original
+    return results
+
+
+if __name__ == '__main__':
+    print(f"{'level':>16} {'load (ms)':>10}")
+    for row in run():
+        print(f"{row['level']:>16} {row['ms']:>10.3f}")
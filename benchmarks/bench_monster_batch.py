@@ -0,0 +1,50 @@
+# Per-tick monster update cost: Grunt.update / Flyer.update one object at a
+# time vs. the NumPy MonsterBatch.
+#     python -m benchmarks.bench_monster_batch
+from benchmarks.common import time_per_call, make_platforms, make_monsters
+
+import config
+from src.player import Player
+from src.monster_batch import MonsterBatch
+from src.spatial import PlatformGrid
+
+MONSTER_COUNTS = [10, 100, 1000, 10000]
+PLATFORM_COUNT = 50
+TICKS = 20
+
+
+def make_player():
+    return Player(config.PLAYER_START_X, config.PLAYER_START_Y, config.PLAYER_WIDTH,
+                  config.PLAYER_HEIGHT, config.PLAYER_COLOR)
+
+
+def run():
+    results = []
+    grid = PlatformGrid(make_platforms(PLATFORM_COUNT, seed=1))
+    for count in MONSTER_COUNTS:
+        clock = {"ms": 0.0}
+        monsters, player = make_monsters(count, PLATFORM_COUNT * 40, seed=count), make_player()
+
+        def per_object_tick():
+            clock["ms"] += 1000.0 / config.FPS
+            for monster in monsters:
+                monster.update(grid, player, time_ticks=clock["ms"])
+
+        batch_monsters, batch_player = make_monsters(count, PLATFORM_COUNT * 40, seed=count), make_player()
+        batch = MonsterBatch(batch_monsters)
+
+        def batched_tick():
+            clock["ms"] += 1000.0 / config.FPS
+            batch.update(grid, batch_player, time_ticks=clock["ms"])
+
+        per_object_cost = time_per_call(per_object_tick, TICKS)
+        batched_cost = time_per_call(batched_tick, TICKS)
+        results.append({"monsters": count, "per_object_us": per_object_cost * 1e6, "batched_us": batched_cost * 1e6})
+    return results
+
+
+if __name__ == '__main__':
+    print(f"Per-tick monster update cost ({PLATFORM_COUNT} platforms, 70% Grunts / 30% Flyers)")
+    print(f"{'monsters':>10} {'objects (us)':>13} {'batched (us)':>13} {'speedup':>8}")
+    for row in run():
+        print(f"{row['monsters']:>10} {row['per_object_us']:>13.1f} {row['batched_us']:>13.1f} {row['per_object_us'] / row['batched_us']:>7.1f}x")
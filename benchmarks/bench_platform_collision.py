@@ -0,0 +1,51 @@
+# Frame cost of platform collision (Player.update, Pet.update, Grunt.update)
+# as the platform count grows, with a plain list vs. the PlatformGrid.
+#     python -m benchmarks.bench_platform_collision
+from benchmarks.common import time_per_call, make_platforms
+
+import config
+from src.player import Player
+from src.monster import Grunt
+from src.spatial import PlatformGrid
+
+PLATFORM_COUNTS = [10, 100, 1000, 5000]
+GRUNT_COUNT = 10
+FRAMES = 200
+
+
+def make_frame(platforms):
+    """Returns a callable that runs one frame of entity movement against `platforms`."""
+    player = Player(config.PLAYER_START_X, config.PLAYER_START_Y, config.PLAYER_WIDTH,
+                    config.PLAYER_HEIGHT, config.PLAYER_COLOR)
+    stats = config.DEFAULT_GRUNT_STATS
+    grunts = [Grunt(x=100 + i * 60, y=config.SCREEN_HEIGHT - 40 - stats["height"],
+                    width=stats["width"], height=stats["height"], color=stats["color"],
+                    health=stats["health"], attack_damage=0, attack_range=stats["attack_range"],
+                    attack_cooldown=stats["attack_cooldown"], speed=stats["speed"],
+                    patrol_range_x=stats["patrol_range_x"], gravity_val=config.GRAVITY,
+                    screen_height_val=config.SCREEN_HEIGHT)
+              for i in range(GRUNT_COUNT)]
+
+    def frame():
+        player.update(platforms, grunts)
+        player.pet.update(platforms, grunts, player)
+        for grunt in grunts:
+            grunt.update(platforms, player)
+    return frame
+
+
+def run():
+    results = []
+    for count in PLATFORM_COUNTS:
+        platforms = make_platforms(count, seed=count)
+        list_cost = time_per_call(make_frame(platforms), FRAMES)
+        grid_cost = time_per_call(make_frame(PlatformGrid(platforms)), FRAMES)
+        results.append({"platforms": count, "list_us": list_cost * 1e6, "grid_us": grid_cost * 1e6})
+    return results
+
+
+if __name__ == '__main__':
+    print(f"Per-frame movement cost: player + pet + {GRUNT_COUNT} grunts")
+    print(f"{'platforms':>10} {'list (us)':>12} {'grid (us)':>12} {'speedup':>8}")
+    for row in run():
+        print(f"{row['platforms']:>10} {row['list_us']:>12.1f} {row['grid_us']:>12.1f} {row['list_us'] / row['grid_us']:>7.1f}x")
@@ -0,0 +1,72 @@
+# Frame render + present cost of GameplayScreen: full redraw + flip vs. the
+# dirty-rect path (cached level layer + pygame.display.update(rects)), on a level
+# that fits the screen and on one that scrolls (src/camera.py).
+#     python -m benchmarks.bench_rendering
+import contextlib
+import os
+import time
+
+import benchmarks.common # Selects the dummy video/audio drivers
+
+import pygame
+
+import config
+from src.game import Game
+from src.level_generator import generate_level
+
+FRAMES = 600
+LEVEL_INDEX = 1
+# A screen-wide generated level, crowded well beyond the hand-made ones
+GENERATED_LEVEL = generate_level(seed=3, platform_count=60, monster_count=100, world_width=config.SCREEN_WIDTH,
+                                 monster_stats={"attack_damage": 0})
+# The same density over a level 20 screens wide: only the player's view is drawn,
+# so a frame should cost about the same as the screen-wide level
+WIDE_LEVEL = generate_level(seed=3, platform_count=60 * 20, monster_count=100 * 20,
+                            world_width=config.SCREEN_WIDTH * 20, monster_stats={"attack_damage": 0})
+
+
+def render_cost(dirty, level=None):
+    """Average seconds to draw and present one frame while the bot-free game runs
+    (on level LEVEL_INDEX, or on `level`, a level dict)."""
+    config.DIRTY_RECT_RENDERING = dirty
+    original_levels = config.LEVEL_CONFIGS
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        game = Game()
+        game.start_new_game()
+        if level is not None:
+            config.LEVEL_CONFIGS = [level]
+        game.load_level_assets(LEVEL_INDEX if level is None else 0)
+        game.current_screen.monster_index.reset(game.monsters_list)
+        step = 1.0 / config.SIMULATION_HZ
+        total = 0.0
+        previous_screen = None
+        for frame in range(FRAMES):
+            game.current_screen.update(step) # Simulation isn't timed, only drawing
+            game.render_alpha = 0.5
+            start = time.perf_counter()
+            game.present_frame(previous_screen)
+            total += time.perf_counter() - start
+            previous_screen = game.current_screen
+        pygame.quit()
+    config.LEVEL_CONFIGS = original_levels
+    return total / FRAMES
+
+
+def run():
+    original = config.DIRTY_RECT_RENDERING
+    try:
+        rows = []
+        for name, level in ((f"level {LEVEL_INDEX + 1}", None), ("generated", GENERATED_LEVEL), ("20x wide", WIDE_LEVEL)):
+            full = render_cost(dirty=False, level=level)
+            dirty = render_cost(dirty=True, level=level)
+            rows.append({"level": name, "full_us": full * 1e6, "dirty_us": dirty * 1e6})
+    finally:
+        config.DIRTY_RECT_RENDERING = original
+    return rows
+
+
+if __name__ == '__main__':
+    print(f"Gameplay frame draw + present, {config.SCREEN_WIDTH}x{config.SCREEN_HEIGHT}, {FRAMES} frames")
+    print(f"{'level':>10} {'full redraw (us)':>18} {'dirty rects (us)':>18} {'speedup':>8}")
+    for row in run():
+        print(f"{row['level']:>10} {row['full_us']:>18.1f} {row['dirty_us']:>18.1f} {row['full_us'] / row['dirty_us']:>7.1f}x")
@@ -0,0 +1,65 @@
+# Save file size and load time: JSON vs. the binary format with an item table.
+# A load is what Game.load_game_state does with the file: decode it, then rebuild
+# the inventory from the slot list.
+#     python -m benchmarks.bench_save_format
+import random
+
+from benchmarks.common import time_per_call
+
+import config
+from src.inventory_manager import InventoryManager
+from src.items import Item
+from src.save_format import serialize, deserialize, JSON, BINARY
+
+STACK_COUNTS = [100, 1000, 10000]
+DISTINCT_ITEMS = 50 # Large inventories hold many stacks of a few kinds of item
+
+
+def make_save(stacks, seed=0):
+    """Save data like Game.snapshot_game_state's, with `stacks` inventory slots."""
+    rng = random.Random(seed)
+    items = [Item(f"Material {i}", f"A crafting material found in zone {i}.", value=rng.randint(1, 50),
+                  stackable=True, max_stack=config.DEFAULT_ITEM_MAX_STACK) for i in range(DISTINCT_ITEMS)]
+    inventory = InventoryManager(capacity=stacks)
+    for i in range(stacks):
+        item = items[i % DISTINCT_ITEMS]
+        inventory.slots.append({'item': item, 'quantity': rng.randint(1, item.max_stack)})
+    inventory.rebuild_index()
+    return {
+        "current_level_index": 2,
+        "player_data": {
+            "health": 90, "max_health": 120, "level": 7, "xp": 40, "xp_to_next_level": 700,
+            "inventory": inventory.get_serializable_data(),
+            "position": [config.PLAYER_START_X, config.PLAYER_START_Y],
+            "pet_data": {"health": 50, "position": [config.PLAYER_START_X - 40, config.PLAYER_START_Y]},
+        },
+    }
+
+
+def make_load(raw, stacks):
+    def load():
+        data = deserialize(raw)
+        InventoryManager(capacity=stacks).load_from_serializable_data(data["player_data"]["inventory"])
+    return load
+
+
+def run():
+    results = []
+    for stacks in STACK_COUNTS:
+        data = make_save(stacks)
+        iterations = max(3, 20000 // stacks)
+        row = {"stacks": stacks}
+        for save_format in (JSON, BINARY):
+            raw = serialize(data, save_format)
+            row[f"{save_format}_bytes"] = len(raw)
+            row[f"{save_format}_decode_ms"] = time_per_call(lambda: deserialize(raw), iterations) * 1e3
+            row[f"{save_format}_load_ms"] = time_per_call(make_load(raw, stacks), iterations) * 1e3
+        results.append(row)
+    return results
+
+
+if __name__ == '__main__':
+    print(f"{'stacks':>7} {'json KB':>9} {'binary KB':>10} {'json decode':>12} {'bin decode':>11} {'json load':>10} {'bin load':>9}  (ms)")
+    for row in run():
+        print(f"{row['stacks']:>7} {row['json_bytes'] / 1024:>9.1f} {row['binary_bytes'] / 1024:>10.1f} "
+              f"{row['json_decode_ms']:>12.3f} {row['binary_decode_ms']:>11.3f} {row['json_load_ms']:>10.3f} {row['binary_load_ms']:>9.3f}")
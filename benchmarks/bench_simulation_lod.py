@@ -0,0 +1,51 @@
+# Per-tick GameplayScreen.update_monsters cost on generated levels of growing width
+# at a fixed monster density, with every monster updated every tick vs. with
+# simulation tiers (src/simulation_lod.py). Monsters update one object at a time
+# below MONSTER_BATCH_MIN_COUNT and batched above it, as in the game.
+#     python -m benchmarks.bench_simulation_lod
+import contextlib
+import os
+from unittest import mock
+
+from benchmarks.common import time_per_call
+
+import config
+from src.game import Game
+from src.level_generator import generate_level
+
+SCREENS = [1, 5, 20, 50] # Level width in screens
+MONSTERS_PER_SCREEN = 100
+TICKS = 20
+
+
+def update_cost(level, lod):
+    """Average seconds per update_monsters tick, with the player at the start of the level."""
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull), \
+         mock.patch.object(config, "LEVEL_CONFIGS", [level]):
+        game = Game(headless=True)
+        game.start_new_game()
+    gameplay = game.current_screen
+    step = 1.0 / config.SIMULATION_HZ
+    if lod:
+        return time_per_call(lambda: gameplay.update_monsters(step), TICKS)
+    with mock.patch.object(config, "MONSTER_ACTIVE_DISTANCE", float('inf')): # Every monster in the active tier
+        return time_per_call(lambda: gameplay.update_monsters(step), TICKS)
+
+
+def run():
+    results = []
+    for screens in SCREENS:
+        level = generate_level(seed=screens, platform_count=60 * screens, monster_count=MONSTERS_PER_SCREEN * screens,
+                               world_width=config.SCREEN_WIDTH * screens, monster_stats={"attack_damage": 0})
+        results.append({"screens": screens, "monsters": MONSTERS_PER_SCREEN * screens,
+                        "all_us": update_cost(level, lod=False) * 1e6, "lod_us": update_cost(level, lod=True) * 1e6})
+    return results
+
+
+if __name__ == '__main__':
+    print(f"Per-tick update_monsters cost, {MONSTERS_PER_SCREEN} monsters per screen "
+          f"(tiers: +{config.MONSTER_ACTIVE_DISTANCE} px active, every {config.MONSTER_REDUCED_TICK_INTERVAL} ticks "
+          f"to +{config.MONSTER_SLEEP_DISTANCE} px, frozen beyond)")
+    print(f"{'screens':>8} {'monsters':>9} {'all (us)':>10} {'tiered (us)':>12} {'speedup':>8}")
+    for row in run():
+        print(f"{row['screens']:>8} {row['monsters']:>9} {row['all_us']:>10.1f} {row['lod_us']:>12.1f} {row['all_us'] / row['lod_us']:>7.1f}x")
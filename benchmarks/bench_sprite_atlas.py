@@ -0,0 +1,68 @@
+# Entity drawing cost: one pygame.draw.rect per entity and state (the former
+# Player/Pet/BaseMonster.draw) vs. pre-rendered sprites from the sprite atlas
+# blitted with a single Surface.blits call, as GameplayScreen now draws.
+#     python -m benchmarks.bench_sprite_atlas
+import random
+
+from benchmarks.common import time_per_call
+
+import pygame
+
+import config
+from src.monster import Grunt
+from src.sprite_atlas import sprite_atlas
+
+ENTITY_COUNTS = [100, 1000, 5000, 20000]
+HIT_SHARE = 0.1 # Monsters flashing from a hit
+FRAMES = 20
+
+
+def make_entities(count, seed=0):
+    """Monsters all over the screen, some of them flashing from a hit."""
+    rng = random.Random(seed)
+    stats = config.DEFAULT_GRUNT_STATS
+    monsters = []
+    for _ in range(count):
+        monster = Grunt(x=rng.randint(0, config.SCREEN_WIDTH - stats["width"]),
+                        y=rng.randint(0, config.SCREEN_HEIGHT - stats["height"]),
+                        width=stats["width"], height=stats["height"], color=stats["color"], health=stats["health"],
+                        attack_damage=0, attack_range=stats["attack_range"], attack_cooldown=stats["attack_cooldown"],
+                        speed=stats["speed"], patrol_range_x=stats["patrol_range_x"], gravity_val=config.GRAVITY,
+                        screen_height_val=config.SCREEN_HEIGHT)
+        if rng.random() < HIT_SHARE:
+            monster.is_hit = True
+            monster.hit_flash_timer = monster.hit_flash_duration
+        monsters.append(monster)
+    return monsters
+
+
+def run():
+    pygame.display.init()
+    screen = pygame.display.set_mode((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
+    sprite_atlas.clear() # Rendered for this display
+    results = []
+    for count in ENTITY_COUNTS:
+        monsters = make_entities(count, seed=count)
+
+        def primitive_frame():
+            for monster in monsters:
+                color = config.HIT_COLOR if monster.is_hit and monster.hit_flash_timer > 0 else monster.original_color
+                pygame.draw.rect(screen, color, monster.rect)
+
+        def atlas_frame():
+            items = []
+            for monster in monsters:
+                items.extend(monster.sprite_items(monster.rect.topleft))
+            screen.blits(items, doreturn=False)
+
+        results.append({"entities": count, "primitive_us": time_per_call(primitive_frame, FRAMES) * 1e6,
+                        "atlas_us": time_per_call(atlas_frame, FRAMES) * 1e6})
+    pygame.quit()
+    return results
+
+
+if __name__ == '__main__':
+    print(f"Entity drawing per frame, {config.SCREEN_WIDTH}x{config.SCREEN_HEIGHT}, {HIT_SHARE:.0%} of entities hit-flashing")
+    print(f"{'entities':>9} {'draw.rect (us)':>15} {'atlas blits (us)':>17} {'speedup':>8}")
+    for row in run():
+        print(f"{row['entities']:>9} {row['primitive_us']:>15.1f} {row['atlas_us']:>17.1f} {row['primitive_us'] / row['atlas_us']:>7.1f}x")
@@ -0,0 +1,50 @@
+# Shared helpers for the benchmark scripts.
+import contextlib
+import os
+import time
+
+# Benchmarks never open a window or an audio device.
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import config
+from src import event_log
+from src.level_generator import generate_level
+from src.levels import compile_level, build_platforms, spawn_monsters
+
+event_log.disable() # No log writer thread competing with the timed code
+
+
+def time_per_call(func, iterations, repeat=5):
+    """Best-of-`repeat` average seconds per call of func() over `iterations` calls.
+    Game code prints as it runs; that output is discarded while timing."""
+    best = float('inf')
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(iterations):
+                func()
+            best = min(best, (time.perf_counter() - start) / iterations)
+    return best
+
+
+def make_platforms(count, seed=0, density_width=40):
+    """A ground platform plus `count - 1` random ledges, from the level generator.
+
+    The level widens with the platform count (one ledge per `density_width`
+    pixels) so the local platform density stays constant, like a long
+    generated level rather than one ever more crowded screen.
+    """
+    level = generate_level(seed=seed, platform_count=count, platform_spacing=density_width, monster_count=0)
+    return build_platforms(compile_level(level))
+
+
+def make_monsters(count, world_width, seed=0, monster_mix=None, monster_stats=None):
+    """Monsters (70% Grunts, 30% Flyers unless monster_mix says otherwise) at random spots
+    over a level `world_width` pixels wide, from the level generator.
+    They deal no damage, so benchmarks never end in a game over."""
+    stats = {"attack_damage": 0}
+    stats.update(monster_stats or {})
+    level = generate_level(seed=seed, platform_count=0, monster_count=count, monster_mix=monster_mix,
+                           monster_stats=stats, world_width=world_width)
+    return spawn_monsters(compile_level(level))
@@ -0,0 +1,254 @@
+# Deterministic benchmark suite over the real game systems. Every case builds its
+# inputs from fixed seeds and times the same code the game runs; results are
+# written as JSON so runs on different commits can be diffed.
+#     python -m benchmarks.suite                          # Writes benchmark_results.json
+#     python -m benchmarks.suite --output results.json
+#     python -m benchmarks.suite --compare baseline.json  # Also prints old vs. new times
+#     python -m benchmarks.suite --case inventory         # Only cases whose name contains "inventory"
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import tempfile
+
+from benchmarks.common import time_per_call, make_platforms, make_monsters
+
+import pygame
+
+import config
+from src.game import Game
+from src.player import Player
+from src.items import Item
+from src.inventory_manager import InventoryManager
+from src.save_manager import SaveManager
+from src import loot
+from src.spatial import PlatformGrid, MonsterIndex
+
+SEED = 1234
+SIZES = [10, 100, 1000]
+SAVE_EXTENSION = os.path.splitext(config.SAVE_GAME_FILENAME)[1] # Picks the save format, as in the game
+
+
+def _seeded(seed):
+    """Seeds the global random module and the loot RNG too, since game code uses them."""
+    random.seed(seed)
+    loot.seed(seed)
+    return random.Random(seed)
+
+
+def _make_player():
+    player = Player(config.PLAYER_START_X, config.PLAYER_START_Y, config.PLAYER_WIDTH,
+                    config.PLAYER_HEIGHT, config.PLAYER_COLOR)
+    player.health = player.max_health = 10 ** 9 # Never dies while being timed
+    return player
+
+
+def _make_gameplay(monster_count, seed):
+    """A headless game on level 1 whose monsters were replaced by `monster_count` seeded ones."""
+    game = Game(headless=True)
+    game.start_new_game()
+    screen = game.current_screen
+    screen.player.health = screen.player.max_health = 10 ** 9
+    screen.monsters_list[:] = make_monsters(monster_count, config.SCREEN_WIDTH, seed=seed)
+    screen.monster_index.reset(screen.monsters_list)
+    screen.monster_batch = screen._make_monster_batch()
+    return game, screen
+
+
+def _make_inventory(stacks, seed):
+    """An inventory with `stacks` full stacks of distinct stackable items."""
+    rng = _seeded(seed)
+    inventory = InventoryManager(capacity=stacks + 10)
+    for i in range(stacks):
+        item = Item(f"Material {i}", "Benchmark material", value=rng.randint(1, 50), stackable=True, max_stack=20)
+        inventory.add_item(item, 20)
+    return inventory
+
+
+# Each case takes a size and a seed and returns (callable to time, iterations)
+
+def case_player_update(size, seed):
+    """Player.update (gravity, platform collision) plus a horizontal Player.move against `size` platforms."""
+    grid = PlatformGrid(make_platforms(size, seed=seed))
+    player = _make_player()
+    right_edge = max(config.SCREEN_WIDTH, size * 40) - player.rect.width
+    step = [player.speed]
+
+    def tick():
+        player.update(grid, [])
+        x = player.rect.x
+        player.move(step[0], 0, grid)
+        if player.rect.x == x or not 0 < player.rect.x < right_edge:
+            step[0] = -step[0] # Turn around at walls and level edges
+    return tick, 500
+
+
+def case_update_monsters(size, seed):
+    """GameplayScreen.update_monsters with `size` Grunts/Flyers (70/30) on level 1."""
+    _seeded(seed)
+    game, screen = _make_gameplay(size, seed)
+    dt = 1.0 / config.SIMULATION_HZ
+
+    def tick():
+        game.sim_time_ms += dt * 1000.0
+        screen.update_monsters(dt)
+    return tick, max(20, 2000 // size)
+
+
+def case_pet_update(size, seed):
+    """Pet.update target search and attack among `size` monsters, through the MonsterIndex."""
+    _seeded(seed)
+    platforms = PlatformGrid(make_platforms(20, seed=seed))
+    player = _make_player()
+    monsters = make_monsters(size, config.SCREEN_WIDTH, seed=seed)
+    for monster in monsters:
+        monster.health = 10 ** 9 # Stays a target for the whole run
+    index = MonsterIndex(monsters)
+
+    pet = player.pet
+
+    def tick():
+        index.mark_dirty() # As after every monster update in the game
+        pet.last_attack_time = pet.attack_cooldown # Searches every call instead of once per cooldown
+        pet.update(platforms, monsters, player, index)
+    return tick, max(50, 20000 // size)
+
+
+def case_inventory_add_remove(size, seed):
+    """InventoryManager.add_item then remove_item of a stackable item in an inventory of `size` stacks."""
+    inventory = _make_inventory(size, seed)
+    loot = Item("Monster Part", "Benchmark drop", value=5, stackable=True, max_stack=20)
+    inventory.add_item(loot, 1) # Stays at one unit: each call adds one and removes one
+
+    def tick():
+        inventory.add_item(loot, 1)
+        inventory.remove_item(loot.name, 1)
+    return tick, max(50, 50000 // size)
+
+
+def case_inventory_get_item_count(size, seed):
+    """InventoryManager.get_item_count of the last stacked item in an inventory of `size` stacks."""
+    inventory = _make_inventory(size, seed)
+    name = f"Material {size - 1}"
+
+    def tick():
+        inventory.get_item_count(name)
+    return tick, max(50, 50000 // size)
+
+
+def _save_data(stacks, seed):
+    """What Game.save_game_state writes, with an inventory of `stacks` stacks."""
+    inventory = _make_inventory(stacks, seed)
+    return {
+        "current_level_index": 1,
+        "player_data": {
+            "health": 90, "max_health": 120, "level": 3, "xp": 40, "xp_to_next_level": 300,
+            "inventory": inventory.get_serializable_data(),
+            "position": [config.PLAYER_START_X, config.PLAYER_START_Y],
+            "pet_data": {"health": 50, "position": [config.PLAYER_START_X - 40, config.PLAYER_START_Y]},
+        },
+    }
+
+
+def case_save_data(size, seed, directory):
+    """SaveManager.save_data of a save whose inventory has `size` stacks, in the game's save format."""
+    manager = SaveManager(save_filename=os.path.join(directory, f"save_{size}{SAVE_EXTENSION}"))
+    data = _save_data(size, seed)
+    return (lambda: manager.save_data(data)), max(10, 2000 // size)
+
+
+def case_load_data(size, seed, directory):
+    """SaveManager.load_data of a save whose inventory has `size` stacks, in the game's save format."""
+    manager = SaveManager(save_filename=os.path.join(directory, f"load_{size}{SAVE_EXTENSION}"))
+    manager.save_data(_save_data(size, seed))
+    return manager.load_data, max(10, 2000 // size)
+
+
+def case_gameplay_draw(size, seed):
+    """GameplayScreen.draw (the full redraw) of level 1 with `size` monsters."""
+    _seeded(seed)
+    game, screen = _make_gameplay(size, seed)
+    game.render_alpha = 0.5
+    screen._remember_positions() # Draws interpolated positions, like the windowed game
+    return screen.draw, max(20, 5000 // size)
+
+
+CASES = {
+    "player_update": case_player_update,
+    "update_monsters": case_update_monsters,
+    "pet_update": case_pet_update,
+    "inventory_add_remove": case_inventory_add_remove,
+    "inventory_get_item_count": case_inventory_get_item_count,
+    "save_data": case_save_data,
+    "load_data": case_load_data,
+    "gameplay_draw": case_gameplay_draw,
+}
+FILE_CASES = {"save_data", "load_data"} # Take a scratch directory too
+
+
+def run(case_filter=None, sizes=SIZES, repeat=5):
+    """Runs the matching cases at every size; returns the results document."""
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for name, case in CASES.items():
+            if case_filter and case_filter not in name:
+                continue
+            for size in sizes:
+                seed = SEED + size
+                with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull): # Game setup prints
+                    if name in FILE_CASES:
+                        func, iterations = case(size, seed, directory)
+                    else:
+                        func, iterations = case(size, seed)
+                seconds = time_per_call(func, iterations, repeat=repeat)
+                results.append({"case": name, "size": size, "iterations": iterations, "us_per_call": round(seconds * 1e6, 3)})
+    pygame.quit()
+    return {
+        "seed": SEED,
+        "repeat": repeat,
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+def format_results(document):
+    """Lines of a table of one results document."""
+    lines = [f"{'case':<26} {'size':>6} {'us/call':>12}"]
+    for row in document["results"]:
+        lines.append(f"{row['case']:<26} {row['size']:>6} {row['us_per_call']:>12.1f}")
+    return lines
+
+
+def compare(baseline, current):
+    """Lines of a table comparing two results documents, case by case."""
+    old_times = {(row["case"], row["size"]): row["us_per_call"] for row in baseline["results"]}
+    lines = [f"{'case':<26} {'size':>6} {'old (us)':>12} {'new (us)':>12} {'new/old':>8}"]
+    for row in current["results"]:
+        old = old_times.get((row["case"], row["size"]))
+        ratio = f"{row['us_per_call'] / old:>7.2f}x" if old else f"{'-':>8}"
+        old_text = f"{old:>12.1f}" if old is not None else f"{'-':>12}"
+        lines.append(f"{row['case']:<26} {row['size']:>6} {old_text} {row['us_per_call']:>12.1f} {ratio}")
+    return lines
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Deterministic benchmarks of the game's systems.")
+    parser.add_argument("--output", default="benchmark_results.json", help="Where to write the JSON results.")
+    parser.add_argument("--compare", help="A previous results file to compare against.")
+    parser.add_argument("--case", help="Only run cases whose name contains this.")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repeats per case; the best is kept.")
+    args = parser.parse_args()
+
+    document = run(case_filter=args.case, repeat=args.repeat)
+    with open(args.output, 'w') as f:
+        json.dump(document, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            print("\n".join(compare(json.load(f), document)))
+    else:
+        print("\n".join(format_results(document)))
+    print(f"Results written to {args.output}")
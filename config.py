@@ -1,28 +1,8 @@
 # config.py - Centralized game configuration settings
-import pygame # Added to define RED, YELLOW, BLUE if not already
-
-# Screen Dimensions
-SCREEN_WIDTH = 800
-SCREEN_HEIGHT = 600
-FPS = 60
+import os
+import sys
 
-# Player Default Stats & Properties
-PLAYER_WIDTH = 40
-PLAYER_HEIGHT = 50
-PLAYER_COLOR = GREEN # Defined below
-PLAYER_START_X = SCREEN_WIDTH // 2 - PLAYER_WIDTH // 2
-PLAYER_START_Y = SCREEN_HEIGHT - PLAYER_HEIGHT - 20 # 20px offset from bottom
-PLAYER_MAX_HEALTH = 200
-PLAYER_SPEED = 5
-PLAYER_ATTACK_DAMAGE = 20
-PLAYER_ATTACK_RANGE = 75
-PLAYER_ATTACK_COOLDOWN = 60 # In frames
-PLAYER_HIT_FLASH_DURATION = 10 # In frames
-PLAYER_ATTACK_VISUAL_DURATION = 7 # In frames
-PLAYER_INVENTORY_CAPACITY = 16 # Max number of item STACKS
-XP_PER_LEVEL_BASE = 100      # Base XP needed for each level (e.g., level 1 needs 100, level 2 needs 200)
-XP_PER_MONSTER_DEFEAT = 25   # XP awarded for defeating a common monster
-HEALTH_GAIN_PER_LEVEL = 20   # How much max_health increases per level
+import pygame # Added to define RED, YELLOW, BLUE if not already
 
 # Colors (RGB)
 WHITE = (255, 255, 255)
@@ -44,6 +24,38 @@ GAME_WON_BG_COLOR = (20, 50, 20) # Dark greenish
 HIT_COLOR = (255, 100, 100)       # For damage flash
 ATTACK_VISUAL_COLOR = (200, 200, 0) # For player attack visual
 
+# Screen Dimensions
+SCREEN_WIDTH = 800
+SCREEN_HEIGHT = 600
+FPS = 60
+GAME_TITLE = "My Autobattler Game"
+
+# Main Loop Timing
+# Gameplay constants below that say "in frames" are really simulation ticks of SIMULATION_HZ.
+SIMULATION_HZ = FPS # Fixed simulation rate, independent of how often frames are drawn
+MAX_RENDER_FPS = 144 # Cap on drawn frames per second (0 = uncapped)
+MAX_SIM_STEPS_PER_FRAME = 5 # Catch-up bound after a slow frame; beyond it the game slows down instead of stalling
+INTERPOLATE_RENDERING = True # Draw moving entities between their last two simulated positions
+INTERPOLATION_MAX_JUMP = 64 # Pixels; larger moves in one tick (teleports, level loads) are drawn without blending
+DIRTY_RECT_RENDERING = True # Gameplay redraws/presents only changed areas over a cached level layer (False: full redraw + flip)
+
+# Player Default Stats & Properties
+PLAYER_WIDTH = 40
+PLAYER_HEIGHT = 50
+PLAYER_COLOR = GREEN # Defined above
+PLAYER_START_X = SCREEN_WIDTH // 2 - PLAYER_WIDTH // 2
+PLAYER_START_Y = SCREEN_HEIGHT - 40 - PLAYER_HEIGHT # Standing on the 40px ground platform every level starts with
+PLAYER_MAX_HEALTH = 200
+PLAYER_SPEED = 5
+PLAYER_ATTACK_DAMAGE = 20
+PLAYER_ATTACK_RANGE = 75
+PLAYER_ATTACK_COOLDOWN = 60 # In frames
+PLAYER_HIT_FLASH_DURATION = 10 # In frames
+PLAYER_ATTACK_VISUAL_DURATION = 7 # In frames
+PLAYER_INVENTORY_CAPACITY = 16 # Max number of item STACKS
+XP_PER_LEVEL_BASE = 100      # Base XP needed for each level (e.g., level 1 needs 100, level 2 needs 200)
+XP_PER_MONSTER_DEFEAT = 25   # XP awarded for defeating a common monster
+HEALTH_GAIN_PER_LEVEL = 20   # How much max_health increases per level
 
 # Pet Default Stats
 # PET_WIDTH, PET_HEIGHT, PET_COLOR are already defined
@@ -66,6 +78,21 @@ MONSTER_HIT_FLASH_DURATION = 10 # In frames
 GRAVITY = 1
 JUMP_STRENGTH = -20
 
+# Spatial Indexing
+PLATFORM_GRID_CELL_SIZE = 128 # Pixels per cell of the static platform collision grid
+
+# Camera (src/camera.py) and Simulation LOD (src/simulation_lod.py)
+# Levels wider than the screen (their "width", or as far as their platforms reach) scroll
+# with the player; only what's in view is drawn, and far-off monsters update less often.
+# Distances are in pixels beyond the edges of the player's view.
+MONSTER_ACTIVE_DISTANCE = 200 # Monsters this close update every tick
+MONSTER_REDUCED_TICK_INTERVAL = 4 # Farther out, they patrol and attack once every this many ticks (1: every tick); they still fall every tick
+MONSTER_SLEEP_DISTANCE = SCREEN_WIDTH # Beyond this they're frozen until the player comes near (None: never frozen)
+
+# Batched Monster Updates (src/monster_batch.py, needs NumPy)
+USE_BATCHED_MONSTERS = True
+MONSTER_BATCH_MIN_COUNT = 500 # Below this many monsters the per-object update is faster than NumPy's fixed costs
+
 # Item Defaults
 DEFAULT_ITEM_MAX_STACK = 20 # Default max stack for generic items if not specified
 
@@ -89,7 +116,11 @@ GENERIC_ITEM_DEFAULTS = {
     }
 }
 
-# Default Monster Stats (base values, can be overridden by LEVEL_CONFIGS)
+# Loot Tables (src/loot.py)
+LOOT_RNG_SEED = None # Set to an int for the same drops every run (e.g. reproducible headless runs)
+LOOT_TABLE_MAX_COMBINED_ENTRIES = 8 # Uncertain drops per table precombined into one cumulative table (2**n outcomes); more are rolled one by one
+
+# Default Monster Stats (base values, can be overridden by the level files)
 DEFAULT_GRUNT_WIDTH = 40
 DEFAULT_GRUNT_HEIGHT = 40
 DEFAULT_GRUNT_STATS = {
@@ -121,89 +152,16 @@ DEFAULT_FLYER_STATS = {
     "y_offset": 50 # Default y offset for flyers from the top or a reference point
 }
 
-# LEVEL_CONFIGS
-# Defines platforms, monsters per level, their stats (can override defaults), and drops.
-# Platform format: [x, y, width, height, (optional) color]
-LEVEL_CONFIGS = [
-    {
-        "platforms": [
-            [0, SCREEN_HEIGHT - 40, SCREEN_WIDTH, 40, GREY], # Ground
-            [200, SCREEN_HEIGHT - 200, 150, 20, GREY],
-            [SCREEN_WIDTH - 350, SCREEN_HEIGHT - 350, 150, 20, GREY]
-        ],
-        "monsters": [
-            {
-                "type": "Grunt", "count": 1, "x": 300, "y": SCREEN_HEIGHT - 40 - DEFAULT_GRUNT_HEIGHT, # on ground
-                "drops": [
-                    {"item_id": "MonsterPart", "chance": 1.0, "quantity": 1},
-                    {"item_id": "HealthPotion", "chance": 0.2, "quantity": 1}
-                ]
-            }
-        ],
-        "message": "Level 1: A Grunt with potential drops!"
-    },
-    {
-        "platforms": [
-            [0, SCREEN_HEIGHT - 40, SCREEN_WIDTH, 40, GREY], # Ground
-            [100, SCREEN_HEIGHT - 150, 100, 20, GREY],
-            [300, SCREEN_HEIGHT - 250, 100, 20, GREY],
-            [500, SCREEN_HEIGHT - 150, 100, 20, GREY]
-        ],
-        "monsters": [
-            {
-                "type": "Grunt", "count": 2, "x": [200, 400], "y": SCREEN_HEIGHT - 40 - DEFAULT_GRUNT_HEIGHT,
-                "drops": [
-                    {"item_id": "MonsterPart", "chance": 1.0, "quantity": 1},
-                    {"item_id": "HealthPotion", "chance": 0.2, "quantity": 1}
-                ]
-            }
-        ],
-        "message": "Level 2: Two Grunts, more chances for loot!"
-    },
-    {
-        "platforms": [
-            [0, SCREEN_HEIGHT - 40, SCREEN_WIDTH, 40, GREY], # Ground
-            [150, SCREEN_HEIGHT - 200, 200, 20, GREY],
-            [SCREEN_WIDTH - 350, SCREEN_HEIGHT - 300, 200, 20, GREY]
-        ],
-        "monsters": [
-            {
-                "type": "Flyer", "count": 1, "x": SCREEN_WIDTH // 2, "y": DEFAULT_FLYER_STATS["y_offset"],
-                "drops": [
-                    {"item_id": "MonsterPart", "chance": 0.75, "quantity": 1},
-                    {"item_id": "HealthPotion", "chance": 0.05, "quantity": 1}
-                ]
-            }
-        ],
-        "message": "Level 3: A Flyer appears with its own loot table!"
-    },
-    {
-        "platforms": [
-            [0, SCREEN_HEIGHT - 40, SCREEN_WIDTH, 40, GREY], # Ground
-            [50, SCREEN_HEIGHT - 150, 100, 20, DARK_GREY],
-            [200, SCREEN_HEIGHT - 250, 100, 20, DARK_GREY],
-            [350, SCREEN_HEIGHT - 350, 100, 20, DARK_GREY],
-            [SCREEN_WIDTH - 150, SCREEN_HEIGHT - 150, 100, 20, DARK_GREY]
-        ],
-        "monsters": [
-            {
-                "type": "Grunt", "count": 1, "x": 100, "y": SCREEN_HEIGHT - 40 - DEFAULT_GRUNT_HEIGHT,
-                "drops": [
-                    {"item_id": "MonsterPart", "chance": 1.0, "quantity": 1},
-                    {"item_id": "HealthPotion", "chance": 0.2, "quantity": 1}
-                ]
-            },
-            {
-                "type": "Flyer", "count": 1, "x": SCREEN_WIDTH - 200, "y": DEFAULT_FLYER_STATS["y_offset"] + 50, # Slightly lower
-                "drops": [
-                    {"item_id": "MonsterPart", "chance": 0.75, "quantity": 1},
-                    {"item_id": "HealthPotion", "chance": 0.05, "quantity": 1}
-                ]
-            }
-        ],
-        "message": "Level 4: Mixed company, mixed loot!"
-    }
-]
+# Levels (src/levels.py)
+# Each level is a JSON file in LEVELS_DIR (level_01.json, level_02.json, ...), played in
+# file name order and loaded when it's reached: platforms, monster groups (their stats
+# can override the defaults above) and drops.
+# Platform format: [x, y, width, height, (optional) color as [r, g, b] or a color name from this file]
+# Found next to this file, or in the bundle of a frozen (PyInstaller) build, whatever the current directory
+_GAME_DIR = sys._MEIPASS if getattr(sys, "frozen", False) else os.path.dirname(os.path.abspath(__file__))
+LEVELS_DIR = os.path.join(_GAME_DIR, "levels")
+LEVEL_CONFIGS = None # A list of level dicts (same layout as the files) to play instead of the files, e.g. in tests
+LEVEL_PREFETCH = True # Prepare the next level on a background thread while the current one is played
 
 
 # UI settings
@@ -215,6 +173,7 @@ UI_GAME_OVER_FONT_SIZE = 72
 UI_PAUSED_FONT_SIZE = 48
 UI_BUTTON_HEIGHT = 50
 UI_BUTTON_PADDING = 10
+TEXT_CACHE_MAX_ENTRIES = 256 # Rendered text surfaces kept by src/text_cache.py (least recently used are dropped)
 
 # Sound Keys (used with SoundManager)
 SOUND_UI_CLICK = "ui_click"
@@ -233,8 +192,48 @@ SOUND_PET_ATTACK = "pet_attack" # Added
 MUSIC_MAIN_MENU = "music_main_menu"
 MUSIC_GAMEPLAY = "music_gameplay"
 
+# Game State Keys (shared by Game and the screens)
+STATE_MAIN_MENU = "main_menu"
+STATE_GAMEPLAY = "gameplay"
+STATE_PAUSED = "paused"
+STATE_GAME_OVER = "game_over"
+STATE_GAME_WON = "game_won"
+
+# Headless Simulation (automated balance playthroughs)
+HEADLESS_DEFAULT_MAX_TICKS = 60 * 60 * 10 # Ten minutes of game time at 60 ticks per second
+
+# Event Log (src/event_log.py)
+# Lowest level recorded per category: "DEBUG", "INFO", "WARNING", "ERROR", or None to turn it off.
+# Per-hit combat messages are DEBUG; defeats, XP, level-ups and loot are INFO.
+EVENT_LOG_LEVELS = {
+    "combat": "INFO",
+    "loot": "INFO",
+    "xp": "INFO",
+    "inventory": "INFO",
+}
+EVENT_LOG_CONSOLE = True # Print messages to stdout (from the writer thread)
+EVENT_LOG_JSONL_PATH = None # e.g. "events.jsonl" to append one JSON record per event
+
+# Frame Profiler (src/profiler.py; enable with `python main.py --profile`)
+PROFILER_ENABLED = False
+PROFILER_WINDOW = 600 # Samples kept per phase for the rolling percentiles (10 s at 60 Hz)
+PROFILER_OVERLAY = True # Show the percentile table while profiling (F3 toggles it)
+PROFILER_OVERLAY_REFRESH_FRAMES = 30 # Re-render the overlay text this often
+PROFILER_OVERLAY_FONT = "monospace"
+PROFILER_OVERLAY_FONT_SIZE = 16
+PROFILER_OVERLAY_TEXT_COLOR = (0, 255, 0)
+PROFILER_OVERLAY_BG_COLOR = (0, 0, 0)
+PROFILER_DUMP_PATH = "frame_profile.json" # Written when the game exits; a .csv path writes CSV
+
+# Autosave (src/autosave.py); windowed games only, headless runs never autosave
+AUTOSAVE_ENABLED = True
+AUTOSAVE_INTERVAL_SECONDS = 5.0 # Gameplay time between autosaves (paused time doesn't count)
+AUTOSAVE_FULL_SNAPSHOT_EVERY = 12 # Journal records between full snapshots
+AUTOSAVE_MIN_SNAPSHOT_SLOTS = 32 # From this inventory size on, a change to most of the slots writes a snapshot instead of a record
+AUTOSAVE_SLOT = "autosave" # Its own slot, resumed by the menu's "Continue"; None would overwrite the default slot's save
+
 # File paths
-SAVE_GAME_FILENAME = "savegame.json"
+SAVE_GAME_FILENAME = "savegame.sav" # Binary save (src/save_format.py); a .json name saves JSON instead. An older savegame.json still loads
 
 # Sound File Paths (Placeholders)
 ASSETS_SOUNDS_DIR = "assets/sounds/"
@@ -1,5 +1,22 @@
+import argparse
+
 from src.game import Game
 
 if __name__ == '__main__':
-    game = Game()
-    game.run()
+    parser = argparse.ArgumentParser(description="My Autobattler Game")
+    parser.add_argument("--headless", action="store_true",
+                        help="Run an automated playthrough without a window, audio or frame pacing.")
+    parser.add_argument("--ticks", type=int, default=None,
+                        help="Maximum simulation ticks for --headless (default: config.HEADLESS_DEFAULT_MAX_TICKS).")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Seed the loot RNG for --headless, so a run's drops can be reproduced.")
+    parser.add_argument("--profile", action="store_true",
+                        help="Time each frame phase, show the percentile overlay (F3 toggles it) and dump it on exit.")
+    args = parser.parse_args()
+
+    if args.headless:
+        from src.simulation import run_headless_playthrough, format_report
+        print(format_report(run_headless_playthrough(max_ticks=args.ticks, seed=args.seed)))
+    else:
+        game = Game(profile=args.profile or None)
+        game.run()
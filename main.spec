@@ -1,11 +1,12 @@
 # -*- mode: python ; coding: utf-8 -*-
+import os
 
 
 a = Analysis(
     ['main.py'],
     pathex=[],
     binaries=[],
-    datas=[],
+    datas=[(os.path.join(SPECPATH, 'levels'), 'levels')], # Level files (config.LEVELS_DIR), read at run time
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
@@ -0,0 +1,104 @@
+# Incremental autosave: periodic full snapshots, and in between an append-only
+# journal of only what changed.
+#
+# Every AUTOSAVE_INTERVAL_SECONDS of gameplay the Autosaver appends a record of the
+# state that changed since the last autosave to the slot's journal
+# (SaveManager.append_journal_async). Every AUTOSAVE_FULL_SNAPSHOT_EVERY autosaves
+# it writes a full snapshot instead, which starts a new journal; loading the slot
+# replays the journal onto the snapshot (SaveManager.load_data). Records name their
+# snapshot's journal_id and are only appended to that snapshot's journal; if a
+# snapshot fails to write, the next autosave writes a new one.
+#
+# Inventory slots are tracked by InventoryManager itself (take_dirty_slots), so a
+# record costs the slots that changed, not the whole inventory. The player, pet and
+# level are a fixed handful of values (Game.snapshot_game_state without the
+# inventory), compared against the ones last written.
+import uuid
+
+import config
+
+INVENTORY_PATH = "player_data.inventory" # Where the inventory slot list sits in save data
+_MISSING = object()
+
+
+def flatten(data, prefix=""):
+    """{dotted path: value} of the leaves of nested dicts (lists are leaves)."""
+    values = {}
+    for key, value in data.items():
+        path = prefix + key
+        if isinstance(value, dict):
+            values.update(flatten(value, path + "."))
+        else:
+            values[path] = value
+    return values
+
+
+class Autosaver:
+    def __init__(self, game, slot=_MISSING, interval=None, full_every=None):
+        self.game = game
+        self.slot = slot if slot is not _MISSING else config.AUTOSAVE_SLOT # None is the default slot
+        self.interval = interval if interval is not None else config.AUTOSAVE_INTERVAL_SECONDS
+        self.full_every = full_every if full_every is not None else config.AUTOSAVE_FULL_SNAPSHOT_EVERY
+        self.elapsed = 0.0 # Gameplay seconds since the last autosave
+        self.journal_id = None # Names the last snapshot; None until one was written
+        self.snapshot_future = None # Future of the last snapshot's write
+        self.records_since_snapshot = 0
+        self.saved_values = {} # Dotted path -> value last written, except the inventory
+        self.saved_slot_count = 0
+
+    def tick(self, dt):
+        """Advances the autosave timer by one simulation step; autosaves when it runs out."""
+        self.elapsed += dt
+        if self.elapsed >= self.interval:
+            self.elapsed = 0.0
+            self.autosave()
+
+    def autosave(self):
+        """Writes a journal record, or a full snapshot when one is due. Returns the save's Future, or None."""
+        if self.game.player is None:
+            return None
+        if self.snapshot_future is not None and self.snapshot_future.done() and not self.snapshot_future.result():
+            self.journal_id = None # The records since were computed against a snapshot that isn't on disk
+        if self.journal_id is None or self.records_since_snapshot >= self.full_every:
+            return self.save_snapshot()
+        return self.save_changes()
+
+    def save_snapshot(self, callback=None):
+        """Writes the whole game state and starts a new journal."""
+        data = self.game.snapshot_game_state()
+        if data is None:
+            return None
+        self.journal_id = uuid.uuid4().hex
+        data["journal_id"] = self.journal_id
+        inventory = self.game.player.inventory
+        self.saved_slot_count, _ = inventory.take_dirty_slots() # All of it is in the snapshot
+        self.saved_values = flatten(data)
+        del self.saved_values[INVENTORY_PATH]
+        del self.saved_values["journal_id"]
+        self.records_since_snapshot = 0
+        self.snapshot_future = self.game.save_manager.save_snapshot_async(data, self.journal_id, self.slot, callback=callback)
+        return self.snapshot_future
+
+    def save_changes(self, callback=None):
+        """Appends what changed since the last autosave to the journal (nothing if nothing did)."""
+        values = flatten(self.game.snapshot_game_state(include_inventory=False))
+        changed = {path: value for path, value in values.items() if self.saved_values.get(path, _MISSING) != value}
+
+        inventory = self.game.player.inventory
+        slot_count, slots = inventory.take_dirty_slots()
+        if slots and len(slots) * 2 > slot_count >= config.AUTOSAVE_MIN_SNAPSHOT_SLOTS:
+            return self.save_snapshot(callback) # Most of the inventory changed: a snapshot is smaller than the record
+
+        record = {}
+        if changed:
+            record["set"] = changed
+        if slots or slot_count != self.saved_slot_count:
+            serialize_slot = inventory.serialize_slot
+            record["lists"] = {INVENTORY_PATH: [slot_count, {str(position): serialize_slot(slot)
+                                                             for position, slot in slots.items()}]}
+        if not record:
+            return None
+        self.saved_values.update(changed)
+        self.saved_slot_count = slot_count
+        self.records_since_snapshot += 1
+        return self.game.save_manager.append_journal_async(record, self.journal_id, self.slot, callback=callback)
@@ -0,0 +1,57 @@
+# Camera over a level wider (or taller) than the screen.
+#
+# Entities, platforms and physics stay in world coordinates; the camera is the
+# world position of the screen's top-left corner. GameplayScreen points it at the
+# player each frame and draws only what intersects view_rect, shifted by the
+# offset, so drawing costs what's on screen rather than the size of the level.
+# A level no larger than the screen keeps the camera at (0, 0), so it's drawn
+# exactly as before.
+import pygame
+
+import config
+
+
+class Camera:
+    def __init__(self, view_width=None, view_height=None):
+        self.view_width = view_width if view_width is not None else config.SCREEN_WIDTH
+        self.view_height = view_height if view_height is not None else config.SCREEN_HEIGHT
+        self.world_width = self.view_width
+        self.world_height = self.view_height
+        self.x = 0 # World position of the view's top-left corner (whole pixels)
+        self.y = 0
+
+    def set_world(self, width, height=None):
+        """Sets the level bounds the camera is kept inside (and re-clamps the view)."""
+        self.world_width = max(width, self.view_width)
+        self.world_height = max(height if height is not None else self.view_height, self.view_height)
+        self.x, self.y = self._clamp(self.x, self.y)
+
+    @property
+    def offset(self):
+        return (self.x, self.y)
+
+    @property
+    def scrolls(self):
+        """True if the level is larger than the view."""
+        return self.world_width > self.view_width or self.world_height > self.view_height
+
+    def _clamp(self, x, y):
+        return (min(max(int(round(x)), 0), self.world_width - self.view_width),
+                min(max(int(round(y)), 0), self.world_height - self.view_height))
+
+    def view_at(self, center_x, center_y):
+        """The view rect (world coordinates) centered as close to (center_x, center_y) as the level allows."""
+        x, y = self._clamp(center_x - self.view_width / 2, center_y - self.view_height / 2)
+        return pygame.Rect(x, y, self.view_width, self.view_height)
+
+    def look_at(self, center_x, center_y):
+        """Moves the view to be centered on (center_x, center_y), kept inside the level."""
+        self.x, self.y = self._clamp(center_x - self.view_width / 2, center_y - self.view_height / 2)
+
+    @property
+    def view_rect(self):
+        return pygame.Rect(self.x, self.y, self.view_width, self.view_height)
+
+    def to_screen(self, topleft):
+        """Screen position of a world position."""
+        return (topleft[0] - self.x, topleft[1] - self.y)
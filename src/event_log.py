@@ -0,0 +1,143 @@
+# Leveled game event log for the per-frame paths (combat, loot, xp, inventory).
+#
+# Call sites check enabled() before building a message, so a disabled category
+# costs one dict lookup and no string formatting:
+#
+#     if event_log.enabled(event_log.COMBAT, event_log.DEBUG):
+#         event_log.log(event_log.COMBAT, event_log.DEBUG, f"...", monster_id=id(monster))
+#
+# Enabled records are queued and written by a background thread, so console and
+# file I/O never run inside a frame. The JSON Lines output (one record per line
+# with time, level, category, message and the keyword fields) is meant for
+# offline analysis.
+import atexit
+import json
+import queue
+import sys
+import threading
+import time
+
+import config
+
+# Levels
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARNING", ERROR: "ERROR"}
+_LEVELS_BY_NAME = {name: level for level, name in LEVEL_NAMES.items()}
+_OFF = ERROR + 1 # Threshold of a disabled category
+
+# Categories
+COMBAT = "combat"
+LOOT = "loot"
+XP = "xp"
+INVENTORY = "inventory"
+CATEGORIES = (COMBAT, LOOT, XP, INVENTORY)
+
+_thresholds = {} # category -> lowest level recorded
+_console = False
+_jsonl_path = None
+_records = None # queue.Queue feeding the writer thread; created when the first record is logged
+_writer = None
+
+
+def enabled(category, level=INFO):
+    """True if records of this category and level are kept. Check it before formatting a message."""
+    return level >= _thresholds.get(category, _OFF)
+
+
+def log(category, level, message, /, **fields):
+    """Queues a record for the writer thread. Dropped if the category/level is disabled."""
+    if level < _thresholds.get(category, _OFF):
+        return
+    if _writer is None:
+        _start_writer()
+    _records.put((time.time(), level, category, message, fields))
+
+
+def configure(levels=None, console=None, jsonl_path=None):
+    """(Re)configures the log; arguments left as None come from config.
+
+    levels maps category -> level name ("DEBUG", "INFO", "WARNING", "ERROR") or
+    None to disable it. Records already queued are written with the old settings first.
+    """
+    global _thresholds, _console, _jsonl_path
+    close()
+    levels = config.EVENT_LOG_LEVELS if levels is None else levels
+    _thresholds = {category: _LEVELS_BY_NAME[name.upper()] for category, name in levels.items() if name is not None}
+    _console = config.EVENT_LOG_CONSOLE if console is None else console
+    _jsonl_path = config.EVENT_LOG_JSONL_PATH if jsonl_path is None else jsonl_path
+
+
+def disable():
+    """Drops every record from now on (e.g. while benchmarking)."""
+    configure(levels={}, console=False, jsonl_path="")
+
+
+def flush():
+    """Blocks until every queued record has been written."""
+    if _writer is not None:
+        _records.join()
+
+
+def close():
+    """Writes what's queued and stops the writer thread (a later log() starts a new one)."""
+    global _records, _writer
+    if _writer is None:
+        return
+    _records.put(None)
+    _writer.join()
+    _records = None
+    _writer = None
+
+
+def _start_writer():
+    global _records, _writer
+    _records = queue.Queue()
+    _writer = threading.Thread(target=_write_records, args=(_records, _console, _jsonl_path),
+                               name="event-log-writer", daemon=True)
+    _writer.start()
+
+
+def _write_records(records, console, jsonl_path):
+    """Writer thread: drains the queue in batches until it receives None."""
+    try:
+        jsonl_file = open(jsonl_path, 'a', encoding='utf-8') if jsonl_path else None
+    except OSError as e:
+        print(f"Error opening event log file {jsonl_path}: {e}. Writing to console only.")
+        jsonl_file = None
+    running = True
+    while running:
+        batch = [records.get()]
+        try:
+            while True:
+                batch.append(records.get_nowait())
+        except queue.Empty:
+            pass
+
+        messages, lines = [], []
+        for record in batch:
+            if record is None:
+                running = False
+                continue
+            timestamp, level, category, message, fields = record
+            messages.append(message)
+            if jsonl_file is not None:
+                entry = {"time": timestamp, "level": LEVEL_NAMES[level], "category": category, "message": message}
+                entry.update(fields)
+                lines.append(json.dumps(entry, default=str))
+        if console and messages:
+            sys.stdout.write("\n".join(messages) + "\n") # One write, so it doesn't interleave with the game's own prints
+        if lines:
+            jsonl_file.write("\n".join(lines) + "\n")
+            jsonl_file.flush()
+        for _ in batch:
+            records.task_done()
+
+    if jsonl_file is not None:
+        jsonl_file.close()
+
+
+configure()
+atexit.register(close)
@@ -1,36 +1,59 @@
+import time
+
 import pygame
 
 import config
 from src.world_elements import Platform
+from src.spatial import PlatformGrid
+from src.camera import Camera
+from src.text_cache import get_font, text_cache
+from src.profiler import FrameProfiler
 from src.save_manager import SaveManager
+from src.autosave import Autosaver
 from src.player import Player
 from src.items import ITEM_CLASS_MAP, create_item_from_dict
+from src.levels import level_count, get_level_blueprint, prefetch_level, build_platforms, spawn_monsters
 # Import screens here to avoid circular dependencies if screens also import Game
 from src.screens import MainMenuScreen, GameplayScreen, PauseScreen, GameOverScreen, GameWonScreen
 from src.sound_manager import SoundManager # Assuming SoundManager is ready
 
-# Game State Constants
-STATE_MAIN_MENU = "main_menu"
-STATE_GAMEPLAY = "gameplay"
-STATE_PAUSED = "paused"
-STATE_GAME_OVER = "game_over"
-STATE_GAME_WON = "game_won"
+# Game State Constants (defined in config so the screens can use them without importing Game)
+STATE_MAIN_MENU = config.STATE_MAIN_MENU
+STATE_GAMEPLAY = config.STATE_GAMEPLAY
+STATE_PAUSED = config.STATE_PAUSED
+STATE_GAME_OVER = config.STATE_GAME_OVER
+STATE_GAME_WON = config.STATE_GAME_WON
 
 class Game:
-    def __init__(self):
-        pygame.init()
-        pygame.font.init()
-        pygame.mixer.init()
+    def __init__(self, headless=False, profile=None):
+        # Headless mode skips the window, the audio mixer and frame pacing so that
+        # automated playthroughs can step the simulation as fast as the CPU allows.
+        self.headless = headless
+        # Per-phase frame timers (src/profiler.py); None unless profiling (default: config.PROFILER_ENABLED)
+        if profile is None:
+            profile = config.PROFILER_ENABLED
+        self.profiler = FrameProfiler() if profile else None
+        if headless:
+            pygame.font.init() # Screens still build their buttons/fonts, but nothing is displayed
+            self.screen = pygame.Surface((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
+        else:
+            pygame.init()
+            pygame.font.init()
+            pygame.mixer.init()
 
-        self.screen = pygame.display.set_mode((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
-        pygame.display.set_caption(config.GAME_TITLE)
+            self.screen = pygame.display.set_mode((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
+            pygame.display.set_caption(config.GAME_TITLE)
 
         self.clock = pygame.time.Clock()
         self.running = True
+        self.sim_accumulator = 0.0 # Real time not yet simulated, in seconds (see advance_simulation)
+        self.render_alpha = 1.0 # How far the next draw is between the last two simulation ticks (0..1)
 
         # Core Components
         self.save_manager = SaveManager(save_filename=config.SAVE_GAME_FILENAME) # Use config for filename
-        self.sound_manager = SoundManager() # Initialize SoundManager
+        self.autosaver = None # Set while a game is being played, if autosaving (see _start_autosave)
+        self.menu_message = None # Shown on the main menu, e.g. why a save didn't load
+        self.sound_manager = SoundManager(enable_mixer=not headless) # Initialize SoundManager
         
         # Load all game sounds
         self.sound_manager.load_sound(config.SOUND_UI_CLICK, config.SOUND_PATH_UI_CLICK)
@@ -45,17 +68,11 @@ class Game:
         self.sound_manager.load_sound(config.SOUND_GAME_OVER, config.SOUND_PATH_GAME_OVER)
         self.sound_manager.load_sound(config.SOUND_GAME_WON, config.SOUND_PATH_GAME_WON)
         
-        # Fonts
-        try:
-            # Use UI_FONT_FAMILY (None for default) and UI_FONT_SIZE for standard UI text
-            self.ui_font = pygame.font.Font(config.UI_FONT_FAMILY, config.UI_FONT_SIZE)
-            # Use UI_FONT_FAMILY (None for default) and UI_TITLE_FONT_SIZE for larger titles
-            self.title_font = pygame.font.Font(config.UI_FONT_FAMILY, config.UI_TITLE_FONT_SIZE)
-        except pygame.error as e:
-            print(f"Error loading font: {e}. Using default pygame font.")
-            # Fallback to pygame's default font with sizes from config
-            self.ui_font = pygame.font.Font(None, config.UI_FONT_SIZE)
-            self.title_font = pygame.font.Font(None, config.UI_TITLE_FONT_SIZE)
+        # Fonts (shared through text_cache.get_font, which falls back to pygame's default font)
+        # Use UI_FONT_FAMILY (None for default) and UI_FONT_SIZE for standard UI text
+        self.ui_font = get_font(config.UI_FONT_FAMILY, config.UI_FONT_SIZE)
+        # Use UI_FONT_FAMILY (None for default) and UI_TITLE_FONT_SIZE for larger titles
+        self.title_font = get_font(config.UI_FONT_FAMILY, config.UI_TITLE_FONT_SIZE)
 
 
         # Colors
@@ -75,8 +92,11 @@ class Game:
         # Player and Level Assets
         self.player = None
         self.platforms_list = []
+        self.platform_grid = PlatformGrid(self.platforms_list) # Rebuilt per level by load_level_assets
         self.monsters_list = []
+        self.camera = Camera(*self.screen.get_size()) # Fitted to each level's width by load_level_assets
         self.current_level_index = 0
+        self.sim_time_ms = 0 # Gameplay time; drives time-based motion (e.g. Flyer bobbing) instead of wall-clock ticks
 
         # Initial state and screen
         self.set_game_state(STATE_MAIN_MENU)
@@ -124,7 +144,10 @@ class Game:
             sound_manager=self.sound_manager
         )
         self.current_level_index = 0
+        self.sim_time_ms = 0
         self.load_level_assets(self.current_level_index) # This populates platforms_list and monsters_list
+        self.menu_message = None
+        self._start_autosave()
         self.set_game_state(STATE_GAMEPLAY) # This will create GameplayScreen with the new player and lists
         # If GameplayScreen needs to re-initialize with new player/level data:
         if isinstance(self.current_screen, GameplayScreen):
@@ -133,10 +156,12 @@ class Game:
             self.current_screen.monsters = self.monsters_list
             # self.current_screen.start_level(self.current_level_index) # If level setup is in GameplayScreen
 
-    def load_saved_game(self):
+    def load_saved_game(self, slot=None): # None: the default slot; the menu's Continue passes config.AUTOSAVE_SLOT
         print("DEBUG: Attempting to load saved game...")
-        if self.load_game_state(): # load_game_state handles player creation/update and current_level_index
+        if self.load_game_state(slot): # load_game_state handles player creation/update and current_level_index
             self.load_level_assets(self.current_level_index) # Load assets for the loaded level
+            self.menu_message = None
+            self._start_autosave()
             self.set_game_state(STATE_GAMEPLAY)
             # Ensure GameplayScreen uses the loaded player and assets
             if isinstance(self.current_screen, GameplayScreen):
@@ -147,7 +172,11 @@ class Game:
             print("DEBUG: Game loaded successfully.")
         else:
             print("DEBUG: Failed to load game. Returning to main menu.")
-            self.set_game_state(STATE_MAIN_MENU) # Or show an error message on current screen
+            self.menu_message = "The saved game couldn't be loaded (missing or damaged)."
+            if self.current_game_state == STATE_MAIN_MENU:
+                self.current_screen = MainMenuScreen(self.screen, self, self.ui_font) # Shows the message
+            else:
+                self.set_game_state(STATE_MAIN_MENU)
 
     def pause_game(self):
         if self.current_game_state == STATE_GAMEPLAY:
@@ -168,85 +197,47 @@ class Game:
 
     def go_to_main_menu(self):
         print("DEBUG: Going to main menu...")
+        self.autosave_now() # So "Continue" resumes from here
         self.set_game_state(STATE_MAIN_MENU)
 
     def quit_game(self):
         print("DEBUG: Quitting game...")
+        self.autosave_now()
         self.running = False
 
+    def _start_autosave(self):
+        """A fresh Autosaver for the game just started or loaded; its first autosave is a full snapshot."""
+        self.autosaver = Autosaver(self) if config.AUTOSAVE_ENABLED and not self.headless else None
+
+    def autosave_now(self):
+        """Autosaves right away if a game is in progress (not after it was lost or won)."""
+        if (self.autosaver and self.player is not None and self.player.health > 0
+                and self.current_game_state in (STATE_GAMEPLAY, STATE_PAUSED)):
+            return self.autosaver.autosave()
+        return None
+
     def load_level_assets(self, level_index):
-        if not (0 <= level_index < len(config.LEVEL_CONFIGS)):
+        if not (0 <= level_index < level_count()):
             print(f"Error: Level index {level_index} out of bounds.")
             self.go_to_main_menu() # Or handle error appropriately
             return
 
         self.current_level_index = level_index
-        level_data = config.LEVEL_CONFIGS[level_index]
-        
-        self.platforms_list.clear()
-        self.monsters_list.clear() # Assuming monsters are also defined in LEVEL_CONFIGS
-
-        for p_data in level_data.get("platforms", []):
-            if len(p_data) == 4: # x, y, width, height
-                self.platforms_list.append(Platform(p_data[0], p_data[1], p_data[2], p_data[3]))
-            elif len(p_data) == 5: # x, y, width, height, color
-                self.platforms_list.append(Platform(p_data[0], p_data[1], p_data[2], p_data[3], p_data[4]))
-        
-        # Example for monsters, if they are defined in config.LEVEL_CONFIGS
-        from src.monster import Grunt, Flyer # Import monster classes here to avoid circularity if monsters import Game/config
-
-        for monster_config_group in level_data.get("monsters", []):
-            monster_type = monster_config_group["type"]
-            count = monster_config_group["count"]
-            base_x_positions = monster_config_group.get("x", [100]) # Default x if not specified
-            if not isinstance(base_x_positions, list):
-                base_x_positions = [base_x_positions] # Ensure it's a list
-
-            y_pos = monster_config_group.get("y") # y should be specified per group or per type default
-
-            # Get drops for this monster group
-            drops = monster_config_group.get("drops", [])
+        # Validated and normalized once per run (src/levels.py); loading just builds the objects
+        blueprint = get_level_blueprint(level_index)
+        if blueprint is None: # Its file is missing or damaged (the error was printed)
+            self.go_to_main_menu()
+            return
 
-            for i in range(count):
-                # Determine x position for this specific monster instance
-                # If fewer x positions than count, reuse last one or distribute
-                current_x = base_x_positions[i % len(base_x_positions)]
-                
-                if monster_type == "Grunt":
-                    stats = config.DEFAULT_GRUNT_STATS.copy()
-                    # Override with any specific stats from monster_config_group if needed
-                    stats.update({k: v for k, v in monster_config_group.items() if k in stats})
-                    # Ensure 'y' is correctly set if not in stats or needs platform adjustment
-                    actual_y = y_pos if y_pos is not None else self.screen.get_height() - stats["height"] - 40 # Ground offset
-                                        
-                    self.monsters_list.append(Grunt(
-                        x=current_x, y=actual_y,
-                        width=stats["width"], height=stats["height"], color=stats["color"],
-                        health=stats["health"], attack_damage=stats["attack_damage"],
-                        attack_range=stats["attack_range"], attack_cooldown=stats["attack_cooldown"],
-                        speed=stats["speed"], patrol_range_x=stats["patrol_range_x"],
-                        gravity_val=config.GRAVITY, screen_height_val=config.SCREEN_HEIGHT,
-                        sound_manager=self.sound_manager, # Pass sound_manager
-                        possible_drops=drops
-                    ))
-                elif monster_type == "Flyer":
-                    stats = config.DEFAULT_FLYER_STATS.copy()
-                    stats.update({k: v for k, v in monster_config_group.items() if k in stats})
-                    actual_y = y_pos if y_pos is not None else stats["y_offset"]
-
-                    self.monsters_list.append(Flyer(
-                        x=current_x, y=actual_y,
-                        width=stats["width"], height=stats["height"], color=stats["color"],
-                        health=stats["health"], attack_damage=stats["attack_damage"],
-                        attack_range=stats["attack_range"], attack_cooldown=stats["attack_cooldown"],
-                        speed=stats["speed"], 
-                        vertical_amplitude=stats["vertical_amplitude"],
-                        vertical_speed_factor=stats["vertical_speed_factor"],
-                        patrol_range_x=stats["patrol_range_x"],
-                        y_offset=actual_y, # Pass the calculated y as y_offset for consistency or initial_y
-                        sound_manager=self.sound_manager, # Pass sound_manager
-                        possible_drops=drops
-                    ))
+        self.platforms_list[:] = build_platforms(blueprint)
+        # Platforms are static, so their collision grid is built once per level
+        self.platform_grid = PlatformGrid(self.platforms_list)
+        self.monsters_list[:] = spawn_monsters(blueprint, self.sound_manager)
+        self.camera.set_world(blueprint.world_width)
+        if self.player:
+            self.player.world_width = blueprint.world_width
+        if config.LEVEL_PREFETCH:
+            prefetch_level(level_index + 1) # Ready by the time this level is cleared
         
         print(f"Assets for level {level_index + 1} loaded. Platforms: {len(self.platforms_list)}, Monsters: {len(self.monsters_list)}")
         
@@ -267,6 +258,9 @@ class Game:
         previous_state = self.current_game_state
         self.current_game_state = new_state
         print(f"DEBUG: Transitioning from {previous_state} to {new_state}")
+        if isinstance(self.current_screen, GameplayScreen):
+            # A new GameplayScreen (e.g. after a pause) re-reads the monsters from their objects
+            self.current_screen.sync_monsters()
 
         # Handle Music Transitions
         if new_state == STATE_MAIN_MENU:
@@ -299,6 +293,7 @@ class Game:
                 self.player = Player(config.PLAYER_START_X, config.PLAYER_START_Y, 
                                      config.PLAYER_WIDTH, config.PLAYER_HEIGHT, 
                                      config.PLAYER_COLOR, self.sound_manager)
+                self.player.world_width = self.camera.world_width
             self.current_screen = GameplayScreen(self.screen, self, self.player, self.platforms_list, self.monsters_list, self.ui_font)
         elif new_state == STATE_PAUSED:
             self.current_screen = PauseScreen(self.screen, self, self.ui_font)
@@ -310,16 +305,22 @@ class Game:
             print(f"Warning: Unknown game state {new_state}. Falling back to Main Menu.")
             self.current_game_state = STATE_MAIN_MENU # Correct the state variable
             self.current_screen = MainMenuScreen(self.screen, self, self.ui_font)
-            if not pygame.mixer.music.get_busy() or self.sound_manager.current_music_path != config.MUSIC_PATH_MAIN_MENU:
+            if not self.sound_manager.music_playing or self.sound_manager.current_music_path != config.MUSIC_PATH_MAIN_MENU:
                 self.sound_manager.stop_music() # Ensure other music is stopped
                 self.sound_manager.play_music(config.MUSIC_PATH_MAIN_MENU, loops=-1)
 
-    def save_game_state(self, filename=None): # Allow dynamic filename
-        if filename is None:
-            filename = config.SAVE_GAME_FILENAME # Use from config
+    def snapshot_game_state(self, include_inventory=True):
+        """Everything a save holds, as plain data built now, or None without a player.
+
+        Nothing in it is shared with live game objects, so it can be written on the
+        save worker while the game keeps running. Without the inventory it's a small,
+        fixed set of values (what autosave compares between saves).
+        """
         if self.player is None:
             print("DEBUG: Player object does not exist, cannot save game state.")
-            return False # Or handle more gracefully, maybe save non-player data
+            return None # Or handle more gracefully, maybe save non-player data
+        if isinstance(self.current_screen, GameplayScreen):
+            self.current_screen.sync_monsters() # Monster objects are stale while batched
 
         player_data = {
             "health": self.player.health,
@@ -327,35 +328,51 @@ class Game:
             "level": self.player.level,
             "xp": self.player.experience_points,
             "xp_to_next_level": self.player.xp_to_next_level,
-            "inventory": self.player.inventory.get_serializable_data(),
             "position": [self.player.rect.x, self.player.rect.y],
             # Note: Player's width, height, color are usually part of its definition
             # if they are static. If they can change (e.g. power-ups), they should be saved.
         }
 
+        if include_inventory:
+            player_data["inventory"] = self.player.inventory.get_serializable_data()
+
         if self.player.pet:
             player_data["pet_data"] = {
                 "health": self.player.pet.health,
                 "position": [self.player.pet.rect.x, self.player.pet.rect.y]
             }
         
-        game_state_data = {
+        return {
             "current_level_index": self.current_level_index,
             "player_data": player_data,
             # Add other game-wide states here (e.g., game time, overall progress flags)
         }
-        
-        if self.save_manager.save_data(game_state_data, filename): # Pass filename along
-            print(f"Game state saved successfully to {filename}.")
-            return True
-        else:
-            print(f"Failed to save game state to {filename}.")
-            return False
 
-    def load_game_state(self, filename=None): # Allow dynamic filename
-        if filename is None:
-            filename = config.SAVE_GAME_FILENAME # Use from config
-        loaded_data = self.save_manager.load_data(filename)
+    def save_game_state(self, slot=None, callback=None):
+        """Snapshots the game now and writes it to a save slot in the background.
+
+        Returns the save's Future (its result is True once the save is on disk), or
+        None if there was nothing to save. callback(success, path) runs on the save
+        worker when the write finishes.
+        """
+        def report(success, path):
+            if success:
+                print(f"Game state saved successfully to {path}.")
+            else:
+                print(f"Failed to save game state to {path}.")
+            if callback is not None:
+                callback(success, path)
+
+        if self.autosaver and slot == self.autosaver.slot: # Also starts a new autosave journal for the slot
+            return self.autosaver.save_snapshot(callback=report)
+        game_state_data = self.snapshot_game_state()
+        if game_state_data is None:
+            return None
+        return self.save_manager.save_data_async(game_state_data, slot, callback=report)
+
+    def load_game_state(self, slot=None): # None loads the default slot (config.SAVE_GAME_FILENAME)
+        filename = self.save_manager.slot_path(slot)
+        loaded_data = self.save_manager.load_data(slot)
         if loaded_data is None:
             print(f"DEBUG: No save data found at '{filename}' or error loading.")
             return False
@@ -388,7 +405,8 @@ class Game:
             
             inventory_data = loaded_player_data.get("inventory")
             if inventory_data is not None and hasattr(self.player, 'inventory'):
-                self.player.inventory.load_from_serializable_data(inventory_data)
+                if not self.player.inventory.load_from_serializable_data(inventory_data):
+                    print("Warning: Saved inventory doesn't fit the player's inventory; it was not restored.")
 
             # Load pet data if available
             loaded_pet_data = loaded_player_data.get("pet_data")
@@ -418,42 +436,133 @@ class Game:
         # Priority: 1. Provided font_object, 2. font_name, 3. default font
         if font_object:
             current_font = font_object
-        elif font_name:
-            try:
-                current_font = pygame.font.Font(font_name, size)
-            except pygame.error:
-                current_font = pygame.font.Font(None, size) # Fallback to default
         else:
-            current_font = pygame.font.Font(None, size) # Default font
+            current_font = get_font(font_name, size) # Cached per (name, size); falls back to the default font
 
-        text_surface = current_font.render(text, True, color)
+        text_surface = text_cache.render(current_font, text, color) # Re-rendered only when the text changes
         text_rect = text_surface.get_rect()
         text_rect.midtop = (x, y)
         surface.blit(text_surface, text_rect)
+        return text_rect
+
+
+    def run_headless(self, max_ticks=None, controller=None):
+        """
+        Steps gameplay without drawing, audio or frame pacing until the game is won,
+        lost, or max_ticks simulation ticks have run. Each tick is one 1/SIMULATION_HZ
+        step, the same fixed step the windowed loop takes.
+        controller(gameplay_screen) is called before every tick to drive the player.
+        Returns a dict of run statistics, including ticks_per_second.
+        """
+        if max_ticks is None:
+            max_ticks = config.HEADLESS_DEFAULT_MAX_TICKS
+        if self.current_game_state != STATE_GAMEPLAY:
+            self.start_new_game()
+
+        dt = 1.0 / config.SIMULATION_HZ
+        ticks = 0
+        start_time = time.perf_counter()
+        while self.running and ticks < max_ticks and self.current_game_state == STATE_GAMEPLAY:
+            if controller:
+                controller(self.current_screen)
+            self.current_screen.update(dt)
+            ticks += 1
+        elapsed = time.perf_counter() - start_time
+
+        ticks_per_second = ticks / elapsed if elapsed > 0 else float('inf')
+        return {
+            "ticks": ticks,
+            "elapsed_seconds": elapsed,
+            "ticks_per_second": ticks_per_second,
+            "realtime_factor": ticks_per_second / config.SIMULATION_HZ, # How many times faster than real time
+            "final_state": self.current_game_state,
+            "levels_cleared": self.current_level_index,
+            "player_level": self.player.level if self.player else None,
+            "player_health": self.player.health if self.player else None,
+        }
 
+    def advance_simulation(self, frame_seconds):
+        """
+        Runs as many fixed 1/SIMULATION_HZ steps as the real time elapsed allows and
+        returns how many ran. At most MAX_SIM_STEPS_PER_FRAME steps run per frame; if
+        the simulation is still behind after that, the backlog is dropped, so a slow
+        machine sees the game slow down rather than stall while catching up.
+        Leaves render_alpha set to the fraction of a step left over, for interpolation.
+        """
+        step = 1.0 / config.SIMULATION_HZ
+        self.sim_accumulator += frame_seconds
+        steps = 0
+        while self.sim_accumulator >= step and steps < config.MAX_SIM_STEPS_PER_FRAME:
+            if self.current_screen:
+                self.current_screen.update(step)
+                if self.autosaver and self.current_game_state == STATE_GAMEPLAY:
+                    self.autosaver.tick(step)
+            self.sim_accumulator -= step
+            steps += 1
+        if self.sim_accumulator >= step: # Still behind after the bounded catch-up
+            self.sim_accumulator %= step
+        self.render_alpha = self.sim_accumulator / step
+        return steps
+
+    def present_frame(self, previous_screen=None):
+        """Draws the current screen and shows it. Gameplay uses the dirty-rect path when
+        enabled; other screens (and the full-redraw mode) clear, redraw everything and flip."""
+        screen = self.current_screen
+        profiler = self.profiler
+        if profiler: mark = time.perf_counter()
+        if config.DIRTY_RECT_RENDERING and hasattr(screen, 'draw_dirty'):
+            if screen is not previous_screen: # Something else drew last frame
+                screen.renderer.invalidate()
+            rects = screen.draw_dirty()
+            if profiler:
+                mark = profiler.lap("draw", mark)
+                overlay = profiler.draw_overlay(self.screen)
+                if overlay:
+                    rects.append(overlay)
+                    screen.renderer.previous_rects.append(overlay) # Erased with the rest next frame
+            pygame.display.update(rects)
+            if profiler: profiler.lap("display.flip", mark)
+            return
+
+        self.screen.fill(self.colors.get("BLACK", config.BLACK)) # Use defined color
+        if screen:
+            screen.draw() # Screens should draw on the surface passed to them
+        if profiler:
+            mark = profiler.lap("draw", mark)
+            profiler.draw_overlay(self.screen)
+        pygame.display.flip()
+        if profiler: profiler.lap("display.flip", mark)
 
     def run(self):
+        self.sim_accumulator = 0.0
+        presented_screen = None
+        profiler = self.profiler
         while self.running:
-            dt = self.clock.tick(config.FPS) / 1000.0
+            frame_seconds = self.clock.tick(config.MAX_RENDER_FPS) / 1000.0
+            if profiler: frame_start = mark = time.perf_counter() # Frame time excludes the clock.tick wait
 
             events = pygame.event.get()
             for event in events:
                 if event.type == pygame.QUIT:
                     self.quit_game() # Use the new method
+                if profiler and event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                    profiler.show_overlay = not profiler.show_overlay
                 
                 if self.current_screen:
                     self.current_screen.handle_event(event) # Pass single event
+            if profiler: profiler.lap("events", mark)
 
             if not self.running: # Check if quit_game was called
                 break
 
-            if self.current_screen:
-                self.current_screen.update(dt)
+            # Fixed-rate simulation, decoupled from how often frames are drawn
+            self.advance_simulation(frame_seconds)
 
-            self.screen.fill(self.colors.get("BLACK", config.BLACK)) # Use defined color
-            if self.current_screen:
-                self.current_screen.draw() # Screens should draw on the surface passed to them
-            
-            pygame.display.flip()
+            self.present_frame(presented_screen)
+            presented_screen = self.current_screen
+            if profiler: profiler.lap("frame", frame_start)
 
+        if profiler and config.PROFILER_DUMP_PATH:
+            profiler.dump(config.PROFILER_DUMP_PATH)
+        self.save_manager.close() # Finish writing any save still queued
         pygame.quit()
@@ -1,101 +1,309 @@
 # Manages the player's inventory, including adding, removing, and using items.
 from src.items import Item # Assuming Item class is in src.items
+from src import event_log
 
 class InventoryManager:
     def __init__(self, capacity=16):
         self.capacity = capacity
         self.slots = [] # Each slot will be a dictionary: {'item': ItemObject, 'quantity': int}
+        # Index over self.slots, kept in step by every method that changes them:
+        self.stacks_by_name = {} # item name -> that item's slot dicts, in slot order
+        self.totals = {} # item name -> total quantity across its stacks
+        # Slots changed since the last take_dirty_slots(), for incremental saves (src/autosave.py):
+        self.dirty_slots = {} # id(slot) -> slot dict whose quantity changed in place
+        self.dirty_from = 0 # Slots from this position on are new or moved (None: none are)
+        self.slot_positions = {} # id(slot) -> position in self.slots, correct below dirty_from
         # print(f"InventoryManager initialized with capacity {self.capacity}.")
 
+    def rebuild_index(self):
+        """Recomputes stacks_by_name and totals from self.slots (for code that edits slots directly)."""
+        self.stacks_by_name = {}
+        self.totals = {}
+        for slot in self.slots:
+            name = slot['item'].name
+            self.stacks_by_name.setdefault(name, []).append(slot)
+            self.totals[name] = self.totals.get(name, 0) + slot['quantity']
+        self.mark_all_dirty() # Whatever changed the slots didn't say which
+
+    def mark_all_dirty(self):
+        self.dirty_slots = {}
+        self.dirty_from = 0
+
+    def take_dirty_slots(self):
+        """(slot count, {position: slot dict}) of the slots changed since the last call; clears the tracking.
+
+        Costs the number of changed slots plus the slots after the earliest one
+        that moved, not the size of the inventory. Don't modify the returned slots.
+        """
+        slots = self.slots
+        positions = self.slot_positions
+        start = len(slots) if self.dirty_from is None else min(self.dirty_from, len(slots))
+        changed = {}
+        for key, slot in self.dirty_slots.items():
+            position = positions.get(key)
+            if position is not None and position < start and slots[position] is slot: # Not removed since
+                changed[position] = slot
+        for position in range(start, len(slots)):
+            slot = slots[position]
+            positions[id(slot)] = position
+            changed[position] = slot
+        self.dirty_slots = {}
+        self.dirty_from = None
+        return len(slots), changed
+
     def add_item(self, item_to_add, quantity=1):
         """Adds an item to the inventory. Handles stacking.
         Returns True if item (or part of it) was added, False otherwise (e.g., full).
         """
         if not isinstance(item_to_add, Item):
-            print(f"DEBUG: Attempted to add non-Item object: {item_to_add}")
+            if event_log.enabled(event_log.INVENTORY, event_log.WARNING):
+                event_log.log(event_log.INVENTORY, event_log.WARNING, f"Attempted to add non-Item object: {item_to_add}",
+                              event="invalid_item", item=item_to_add)
             return False
 
-        added_all = False
         # Try to stack with existing items first
         if item_to_add.stackable:
-            for slot in self.slots:
-                if slot['item'].name == item_to_add.name and slot['quantity'] < slot['item'].max_stack:
-                    can_add_to_stack = slot['item'].max_stack - slot['quantity']
-                    add_now = min(quantity, can_add_to_stack)
-                    slot['quantity'] += add_now
-                    quantity -= add_now
-                    # print(f"DEBUG: Stacked {add_now} of {item_to_add.name}. Remaining to add: {quantity}")
-                    if quantity == 0:
-                        added_all = True
-                        break 
+            quantity = self._fill_stacks(item_to_add, quantity)
             if quantity == 0:
                 return True # All items stacked
 
+        added_all = False
         # If items remain (or item not stackable with existing), try new slots
         while quantity > 0:
             if len(self.slots) < self.capacity:
-                add_to_new_slot = min(quantity, item_to_add.max_stack) if item_to_add.stackable else 1
                 # Create a new instance of the item for the new slot if it's a new item type being added
                 # or if we are adding to a new slot. This is important if items can have unique IDs or states.
                 # For now, assume item_to_add is a prototype or a single instance being distributed.
                 # A better way for multiple additions of same item type: pass item_class and create new.
                 # For this implementation, we assume item_to_add is 'one' item, and if quantity > 1, it's 'that many of this one item type'.
-                self.slots.append({'item': item_to_add, 'quantity': add_to_new_slot})
-                quantity -= add_to_new_slot
+                quantity -= self._new_stack(item_to_add, quantity)
                 # print(f"DEBUG: Added {add_to_new_slot} of {item_to_add.name} to new slot. Remaining to add: {quantity}")
                 added_all = (quantity == 0) # True if all were added in this last step
             else:
-                print(f"DEBUG: Inventory full. Could not add remaining {quantity} of {item_to_add.name}.")
+                if event_log.enabled(event_log.INVENTORY, event_log.INFO):
+                    event_log.log(event_log.INVENTORY, event_log.INFO,
+                                  f"Inventory full. Could not add remaining {quantity} of {item_to_add.name}.",
+                                  event="inventory_full", item=item_to_add.name, quantity=quantity)
                 return quantity == 0 # Returns True if all were added before becoming full, False otherwise
         return added_all
 
+    def _fill_stacks(self, item_to_add, quantity):
+        """Tops up this item's existing stacks (only those are looked at); returns the quantity left over."""
+        name = item_to_add.name
+        for slot in self.stacks_by_name.get(name, ()):
+            if slot['quantity'] < slot['item'].max_stack:
+                can_add_to_stack = slot['item'].max_stack - slot['quantity']
+                add_now = min(quantity, can_add_to_stack)
+                slot['quantity'] += add_now
+                self.totals[name] += add_now
+                self.dirty_slots[id(slot)] = slot
+                quantity -= add_now
+                # print(f"DEBUG: Stacked {add_now} of {item_to_add.name}. Remaining to add: {quantity}")
+                if quantity == 0:
+                    break
+        return quantity
+
+    def _new_stack(self, item_to_add, quantity):
+        """Puts up to one stack's worth of quantity into a new slot (capacity already checked); returns how much."""
+        add_to_new_slot = min(quantity, item_to_add.max_stack) if item_to_add.stackable else 1
+        slot = {'item': item_to_add, 'quantity': add_to_new_slot}
+        self.slots.append(slot)
+        if self.dirty_from is None:
+            self.dirty_from = len(self.slots) - 1
+        name = item_to_add.name
+        stacks = self.stacks_by_name.get(name)
+        if stacks is None:
+            stacks = self.stacks_by_name[name] = []
+            self.totals[name] = 0
+        stacks.append(slot)
+        self.totals[name] += add_to_new_slot
+        return add_to_new_slot
+
     def remove_item(self, item_name, quantity=1):
         """Removes a specified quantity of an item by name.
         Returns True if removal was successful, False otherwise.
         Removes from stacks in reverse order of finding them (or could be front).
         """
         removed_count = 0
-        # Iterate backwards to make slot removal by index easier if a slot becomes empty
-        for i in range(len(self.slots) - 1, -1, -1):
-            slot = self.slots[i]
-            if slot['item'].name == item_name:
-                if slot['quantity'] >= quantity - removed_count:
-                    slot['quantity'] -= (quantity - removed_count)
-                    removed_count = quantity
-                else: # Take all from this stack and continue
-                    removed_count += slot['quantity']
-                    slot['quantity'] = 0
-                
-                if slot['quantity'] == 0:
-                    self.slots.pop(i)
-                
-                if removed_count == quantity:
-                    # print(f"DEBUG: Removed {quantity} of {item_name}.")
-                    return True
+        stacks = self.stacks_by_name.get(item_name, [])
+        # Iterate backwards over this item's stacks (the last stacks are drained first)
+        for i in range(len(stacks) - 1, -1, -1):
+            slot = stacks[i]
+            take = min(slot['quantity'], quantity - removed_count) # Take all from this stack, or what's still needed
+            slot['quantity'] -= take
+            removed_count += take
+            self.totals[item_name] -= take
+
+            if slot['quantity'] == 0:
+                self._drop_empty_stack(item_name, i)
+            else:
+                self.dirty_slots[id(slot)] = slot
+
+            if removed_count == quantity:
+                # print(f"DEBUG: Removed {quantity} of {item_name}.")
+                return True
         
         # If not all items were removed (e.g. not enough in inventory)
         # We might want to revert changes or handle partial removal based on game design.
         # For now, if we couldn't remove the full quantity, consider it a failure.
         if removed_count > 0 and removed_count < quantity:
-             print(f"DEBUG: Could only remove {removed_count} of {quantity} requested for {item_name}. Operation failed as incomplete.")
+             if event_log.enabled(event_log.INVENTORY, event_log.DEBUG):
+                 event_log.log(event_log.INVENTORY, event_log.DEBUG,
+                               f"Could only remove {removed_count} of {quantity} requested for {item_name}. Operation failed as incomplete.",
+                               event="remove_incomplete", item=item_name, quantity=quantity, removed=removed_count)
              # This part would need logic to 'put back' the partially removed items if strict transaction needed.
              # For simplicity now, partial removal is not automatically reverted.
              return False # Or True if partial removal is acceptable
         
-        print(f"DEBUG: Item {item_name} not found in sufficient quantity to remove {quantity}.")
+        if event_log.enabled(event_log.INVENTORY, event_log.DEBUG):
+            event_log.log(event_log.INVENTORY, event_log.DEBUG,
+                          f"Item {item_name} not found in sufficient quantity to remove {quantity}.",
+                          event="remove_failed", item=item_name, quantity=quantity)
         return False
 
+    def _drop_empty_stack(self, item_name, stack_position):
+        """Removes this item's emptied stack (stacks_by_name[item_name][stack_position]) from the inventory."""
+        stacks = self.stacks_by_name[item_name]
+        slot = stacks.pop(stack_position)
+        slots = self.slots
+        # Identity search from the end, where recently added stacks (the usual ones to empty) are;
+        # list.index would compare every slot dict it passes by value
+        for position in range(len(slots) - 1, -1, -1):
+            if slots[position] is slot:
+                del slots[position]
+                if self.dirty_from is None or position < self.dirty_from:
+                    self.dirty_from = position # Everything after it moved up
+                break
+        self.slot_positions.pop(id(slot), None)
+        self.dirty_slots.pop(id(slot), None)
+        if not stacks:
+            del self.stacks_by_name[item_name]
+            del self.totals[item_name]
+
     def has_item(self, item_name, quantity=1):
         """Checks if the inventory contains at least a certain quantity of an item."""
         return self.get_item_count(item_name) >= quantity
 
     def get_item_count(self, item_name):
         """Returns the total quantity of an item by name across all stacks."""
-        count = 0
-        for slot in self.slots:
-            if slot['item'].name == item_name:
-                count += slot['quantity']
-        return count
+        return self.totals.get(item_name, 0)
+
+    def can_apply_batch(self, adds=(), removes=()):
+        """True if apply_batch(adds, removes) would succeed. Changes nothing."""
+        return self._plan_batch(adds, removes)[0] is None
+
+    def apply_batch(self, adds=(), removes=()):
+        """Removes and adds several items as one all-or-nothing operation (e.g. crafting or a trade).
+
+        removes is a list of (item_name, quantity) and adds a list of (item, quantity);
+        the removals happen first, so slots they empty can take the adds. Everything is
+        validated in one pass over the affected stacks before anything changes: if a
+        removal isn't covered or the adds wouldn't fit, returns False and the inventory
+        is untouched. Returns True once everything was applied.
+        """
+        problem, cuts = self._plan_batch(adds, removes)
+        if problem is not None:
+            if event_log.enabled(event_log.INVENTORY, event_log.INFO):
+                event_log.log(event_log.INVENTORY, event_log.INFO, f"Inventory batch rejected: {problem}.",
+                              event="batch_rejected", reason=problem)
+            return False
+
+        # Removals: the plan already says where each item's stacks end up
+        for item_name, (kept, last_quantity, removed) in cuts.items():
+            stacks = self.stacks_by_name[item_name]
+            for position in range(len(stacks) - 1, kept - 1, -1):
+                self._drop_empty_stack(item_name, position)
+            if kept:
+                stacks[kept - 1]['quantity'] = last_quantity
+                self.totals[item_name] -= removed
+                self.dirty_slots[id(stacks[kept - 1])] = stacks[kept - 1]
+        # Adds: known to fit, so they go straight into stacks and free slots
+        for item, quantity in adds:
+            if item.stackable:
+                quantity = self._fill_stacks(item, quantity)
+            while quantity > 0:
+                quantity -= self._new_stack(item, quantity)
+        return True
+
+    def _plan_batch(self, adds, removes):
+        """Simulates apply_batch on the affected item names only.
+
+        Returns (problem, cuts): problem says why the batch can't be applied (None if
+        it can); cuts maps each removed item name to (stacks kept, quantity left in the
+        last kept stack, quantity removed). Removals drain the last stacks first, like
+        remove_item; adds fill the room left in their item's stacks before taking new
+        slots, like add_item.
+        """
+        wanted = {}
+        for item_name, quantity in removes:
+            if quantity <= 0:
+                return f"invalid quantity {quantity} to remove of {item_name}", None
+            wanted[item_name] = wanted.get(item_name, 0) + quantity
+
+        totals = self.totals
+        free_slots = self.capacity - len(self.slots)
+        cuts = {}
+        for item_name, quantity in wanted.items():
+            if totals.get(item_name, 0) < quantity:
+                return f"only {totals.get(item_name, 0)} of {quantity} {item_name} available", None
+            stacks = self.stacks_by_name[item_name]
+            kept = len(stacks)
+            left = quantity
+            while left >= stacks[kept - 1]['quantity']: # Whole stacks emptied, from the last one back
+                left -= stacks[kept - 1]['quantity']
+                kept -= 1
+                if not left:
+                    break
+            free_slots += len(stacks) - kept
+            cuts[item_name] = (kept, stacks[kept - 1]['quantity'] - left if kept else 0, quantity)
+
+        room = None # item name -> units its stacks can still take, once an add of that name was planned
+        for item, quantity in adds:
+            if not isinstance(item, Item):
+                return f"cannot add non-Item object {item!r}", None
+            if quantity <= 0:
+                return f"invalid quantity {quantity} to add of {item.name}", None
+            if not item.stackable:
+                free_slots -= quantity # One slot each
+                continue
+            name = item.name
+            if room is None:
+                room = {}
+            free = room.get(name)
+            if free is None:
+                stacks = self.stacks_by_name.get(name)
+                if stacks is None:
+                    free = 0
+                elif len(stacks) == 1 and name not in cuts: # The usual case: one stack, not being removed from
+                    free = stacks[0]['item'].max_stack - stacks[0]['quantity']
+                else:
+                    free = self._stack_room(name, cuts.get(name))
+            if free >= quantity:
+                room[name] = free - quantity
+                continue
+            rest = quantity - free
+            new_slots = -(-rest // item.max_stack) # Ceiling division
+            free_slots -= new_slots
+            room[name] = new_slots * item.max_stack - rest
+        if free_slots < 0:
+            return f"needs {-free_slots} more free slot(s)", None
+        return None, cuts
+
+    def _stack_room(self, item_name, cut=None):
+        """Units this item's stacks can still take (after a planned removal cut, if given)."""
+        stacks = self.stacks_by_name.get(item_name)
+        if not stacks:
+            return 0
+        if cut is None:
+            kept, last_quantity = len(stacks), stacks[-1]['quantity']
+        else:
+            kept, last_quantity, _ = cut
+            if not kept:
+                return 0
+        room = stacks[kept - 1]['item'].max_stack - last_quantity
+        for position in range(kept - 1):
+            room += stacks[position]['item'].max_stack - stacks[position]['quantity']
+        return room
 
     def get_all_items(self):
         """Returns a list of all item slots (list of dicts)."""
@@ -112,42 +320,55 @@ class InventoryManager:
         Returns a list of dictionaries representing the inventory slots,
         suitable for JSON serialization.
         """
-        serializable_slots = []
-        for slot in self.slots:
-            serializable_slots.append({
-                "item_data": slot['item'].to_dict(), # Uses the item's own serialization method
-                "quantity": slot['quantity']
-            })
-        return serializable_slots
+        return [self.serialize_slot(slot) for slot in self.slots]
+
+    @staticmethod
+    def serialize_slot(slot):
+        return {
+            "item_data": slot['item'].to_dict(), # Uses the item's own serialization method
+            "quantity": slot['quantity']
+        }
 
     def load_from_serializable_data(self, data_list):
         """
-        Clears the current inventory and repopulates it from a list of
-        serialized slot data.
+        Replaces the inventory with serialized slot data, slot for slot as it was saved.
         Requires `create_item_from_dict` from `src.items`.
+
+        One pass over the data, without add_item: stacks keep their saved quantities
+        and order instead of being merged again, slots of the same item share its
+        interned definition, and the index is rebuilt once at the end. Slots that are
+        invalid or hold an unknown item are skipped. Returns False, leaving the
+        inventory unchanged, if more slots than the capacity remain.
         """
         from src.items import create_item_from_dict # Local import to avoid circular dependencies at module level if any
 
-        self.slots.clear()
         if data_list is None: # Handle cases where inventory data might be missing
             print("DEBUG: No inventory data provided to load.")
-            return
+            data_list = []
 
+        items_by_data = {} # id(item_data) -> item; binary saves share one item_data dict per item
+        slots = []
         for slot_data in data_list:
             item_dict = slot_data.get("item_data")
             quantity = slot_data.get("quantity")
-
-            if item_dict and quantity is not None:
+            if not item_dict or not isinstance(quantity, int) or quantity <= 0:
+                print(f"Warning: Invalid slot data encountered: {slot_data}")
+                continue
+            item_instance = items_by_data.get(id(item_dict))
+            if item_instance is None:
                 item_instance = create_item_from_dict(item_dict)
-                if item_instance:
-                    # The add_item method handles stacking and new slots correctly.
-                    # It expects an item instance and quantity.
-                    self.add_item(item_instance, quantity)
-                else:
+                if item_instance is None:
                     print(f"Warning: Failed to create item from data: {item_dict}")
-            else:
-                print(f"Warning: Invalid slot data encountered: {slot_data}")
+                    continue
+                items_by_data[id(item_dict)] = item_instance
+            slots.append({'item': item_instance, 'quantity': quantity})
 
+        if len(slots) > self.capacity:
+            print(f"Error: Saved inventory has {len(slots)} slots but the capacity is {self.capacity}. Inventory not loaded.")
+            return False
+        self.slots = slots
+        self.rebuild_index()
+        return True
 
 if __name__ == '__main__':
     from items import Item, ConsumableItem, HealthPotion, create_item_from_dict # For testing
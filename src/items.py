@@ -1,15 +1,40 @@
 # Defines game items (base Item class, specific item types like consumables, etc.)
+#
+# Items are immutable definitions shared by every stack of that item (flyweights):
+# an inventory slot holds a reference to one plus a quantity. get_item_definition()
+# and create_item_from_dict() return the interned instance for identical data, so a
+# thousand Monster Part drops are a thousand references to one object. The intern
+# tables only hold items weakly, so items built from loaded or modded data are
+# dropped once nothing (an inventory, a loot table) uses them any more.
+import weakref
+
 import pygame # Added just in case any item might need it for sprites later.
+import config
 
 class Item:
-    """Base class for all items in the game."""
+    """Base class for all items in the game. Instances are read-only once created."""
+    __slots__ = ("name", "description", "value", "stackable", "max_stack", "sprite_id", "__weakref__")
+
     def __init__(self, name, description, value=0, stackable=False, max_stack=1, sprite_id=None):
-        self.name = name
-        self.description = description
-        self.value = value  # Monetary value or some other metric
-        self.stackable = stackable
-        self.max_stack = max_stack if stackable else 1
-        self.sprite_id = sprite_id  # Conceptual, for future sprite rendering
+        _set = object.__setattr__ # Item.__setattr__ refuses changes
+        _set(self, "name", name)
+        _set(self, "description", description)
+        _set(self, "value", value)  # Monetary value or some other metric
+        _set(self, "stackable", stackable)
+        _set(self, "max_stack", max_stack if stackable else 1)
+        _set(self, "sprite_id", sprite_id)  # Conceptual, for future sprite rendering
+
+    def __setattr__(self, attr, value):
+        raise AttributeError(f"{self.__class__.__name__} is immutable; it may be shared by many inventory slots")
+
+    def __delattr__(self, attr):
+        raise AttributeError(f"{self.__class__.__name__} is immutable; it may be shared by many inventory slots")
+
+    def __copy__(self):
+        return self # Immutable, so a copy can be the same object
+
+    def __deepcopy__(self, memo):
+        return self
 
     def __str__(self):
         return f"{self.name}: {self.description}"
@@ -32,6 +57,8 @@ class Item:
 
 class ConsumableItem(Item):
     """Base class for items that can be consumed (e.g., potions)."""
+    __slots__ = ()
+
     def __init__(self, name, description, value=0, stackable=True, max_stack=10, sprite_id=None):
         # Consumables are often stackable by default
         super().__init__(name, description, value, stackable, max_stack, sprite_id)
@@ -46,10 +73,12 @@ class ConsumableItem(Item):
 
 class HealthPotion(ConsumableItem):
     """A potion that restores health."""
+    __slots__ = ("heal_amount",)
+
     def __init__(self, name="Health Potion", description="Restores a small amount of health.", 
                  value=25, stackable=True, max_stack=5, heal_amount=50, sprite_id=None, **kwargs): # Added **kwargs for flexibility
         super().__init__(name, description, value, stackable, max_stack, sprite_id, **kwargs) # Pass kwargs up
-        self.heal_amount = heal_amount
+        object.__setattr__(self, "heal_amount", heal_amount)
 
     def to_dict(self):
         """Adds heal_amount to the base item serialization."""
@@ -85,10 +114,43 @@ ITEM_CLASS_MAP = {
     # Add other item class names and their classes here as they are defined
 }
 
+# Interned items: item data describing the same item always gives back the same instance
+_interned_items = weakref.WeakValueDictionary() # sorted (key, value) pairs of the data passed in -> item
+_canonical_items = weakref.WeakValueDictionary() # sorted (key, value) pairs of item.to_dict() -> item (catches e.g. omitted defaults)
+_item_definitions = {} # GENERIC_ITEM_DEFAULTS id -> item; kept for the whole run, there are only a few
+
+def get_item_definition(item_id):
+    """The shared item for a config.GENERIC_ITEM_DEFAULTS id (e.g. "MonsterPart"), or None if unknown."""
+    item = _item_definitions.get(item_id)
+    if item is None:
+        item_data = config.GENERIC_ITEM_DEFAULTS.get(item_id)
+        if item_data is None:
+            return None
+        item = create_item_from_dict(item_data)
+        if item is not None:
+            _item_definitions[item_id] = item
+    return item
+
 def create_item_from_dict(item_data):
     """
     Factory function to create an item instance from its serialized dictionary representation.
+    Returns the interned instance, so equal data (e.g. every stack in a loaded save) shares one item.
     """
+    try:
+        key = tuple(sorted(item_data.items()))
+        item = _interned_items.get(key)
+    except TypeError: # Unhashable values: build an item of its own
+        return _build_item(item_data)
+    if item is not None:
+        return item
+    item = _build_item(item_data)
+    if item is None:
+        return None
+    item = _canonical_items.setdefault(tuple(sorted(item.to_dict().items())), item)
+    _interned_items[key] = item
+    return item
+
+def _build_item(item_data):
     class_name = item_data.get("item_class_name")
     item_class = ITEM_CLASS_MAP.get(class_name)
 
@@ -120,11 +182,10 @@ if __name__ == '__main__':
     print(stackable_item)
     print(repr(stackable_item))
 
-    non_stackable_unique = Item("Legendary Sword", "A unique powerful sword.", value=1000, stackable=True, max_stack=5) 
+    non_stackable_unique = Item("Legendary Sword", "A unique powerful sword.", value=1000, stackable=False, max_stack=5) 
     print(non_stackable_unique) 
-    non_stackable_unique.stackable = False 
-    non_stackable_unique.max_stack = 1 if not non_stackable_unique.stackable else 5 
-    print(repr(non_stackable_unique))
+    print(repr(non_stackable_unique)) # max_stack is 1: not stackable
+    print(f"Interned: {create_item_from_dict(stackable_item.to_dict()) is create_item_from_dict(stackable_item.to_dict())}")
     
     print("-" * 20)
     generic_consumable = ConsumableItem("Mysterious Brew", "What does it do?", value=10)
@@ -0,0 +1,108 @@
+# Seeded procedural levels, in the same layout as the level files (src/levels.py).
+#
+# generate_level() lays out a ground platform and `platform_count - 1` ledges over a
+# world that widens with the platform count, stands Grunts on random platforms and
+# scatters Flyers in the air, in monster groups of up to `group_size` with per-monster
+# x/y lists. The same arguments always give the same level. It's the workload of
+# the scale benchmarks, and can write a level file for playing one:
+#     python -m src.level_generator --seed 7 --platforms 10000 --monsters 5000 --output levels/level_05.json
+import argparse
+import json
+import random
+import time
+
+import config
+
+DEFAULT_MONSTER_MIX = {"Grunt": 0.7, "Flyer": 0.3} # Monster type -> share of the monsters
+DEFAULT_DROP_TABLES = { # Monster type -> drops lists its groups choose from (as in the level files)
+    "Grunt": [[{"item_id": "MonsterPart", "chance": 1.0, "quantity": 1},
+               {"item_id": "HealthPotion", "chance": 0.2, "quantity": 1}]],
+    "Flyer": [[{"item_id": "MonsterPart", "chance": 0.75, "quantity": 1},
+               {"item_id": "HealthPotion", "chance": 0.05, "quantity": 1}]],
+}
+GROUND_HEIGHT = 40
+LEDGE_HEIGHT = 20
+LEDGE_WIDTH_RANGE = (60, 200)
+LEDGE_Y_RANGE = (100, config.SCREEN_HEIGHT - 120) # Top edges; leaves room to jump under the lowest ones
+FLYER_Y_RANGE = (40, config.SCREEN_HEIGHT - 200)
+
+
+def generate_level(seed=0, platform_count=100, platform_spacing=40, monster_count=50, monster_mix=None,
+                   drop_tables=None, monster_stats=None, group_size=100, world_width=None):
+    """A level dict with `platform_count` platforms and `monster_count` monsters.
+
+    platform_spacing: world width per platform in pixels (the density); the world is
+        at least a screen wide, or world_width if given.
+    monster_mix: {monster type: weight}; the counts follow the weights exactly, rounded.
+    drop_tables: a list of drops lists each group picks from at random, instead of
+        the per-type DEFAULT_DROP_TABLES ([] for no drops).
+    monster_stats: stat overrides for every group, e.g. {"attack_damage": 0}.
+    """
+    rng = random.Random(seed)
+    if world_width is None:
+        world_width = max(config.SCREEN_WIDTH, platform_count * platform_spacing)
+
+    platforms = [[0, config.SCREEN_HEIGHT - GROUND_HEIGHT, world_width, GROUND_HEIGHT, "GREY"]] if platform_count else []
+    randint = rng.randint
+    for _ in range(platform_count - 1):
+        width = randint(*LEDGE_WIDTH_RANGE)
+        platforms.append([randint(0, max(0, world_width - width)), randint(*LEDGE_Y_RANGE), width, LEDGE_HEIGHT, "GREY"])
+
+    monsters = []
+    for monster_type, count in _split_counts(monster_count, monster_mix or DEFAULT_MONSTER_MIX):
+        stats = config.DEFAULT_GRUNT_STATS if monster_type == "Grunt" else config.DEFAULT_FLYER_STATS
+        width, height = stats["width"], stats["height"]
+        tables = drop_tables if drop_tables is not None else DEFAULT_DROP_TABLES.get(monster_type, [[]])
+        for start in range(0, count, group_size):
+            size = min(group_size, count - start)
+            if monster_type == "Grunt" and platforms: # On top of a random platform
+                xs, ys = [], []
+                for _ in range(size):
+                    px, py, pw = platforms[randint(0, len(platforms) - 1)][:3]
+                    xs.append(px + randint(0, max(0, pw - width)))
+                    ys.append(py - height)
+            else: # In the air anywhere along the level
+                xs = [randint(0, max(0, world_width - width)) for _ in range(size)]
+                ys = [randint(*FLYER_Y_RANGE) for _ in range(size)]
+            group = {"type": monster_type, "count": size, "x": xs, "y": ys,
+                     "drops": tables[randint(0, len(tables) - 1)] if tables else []}
+            if monster_stats:
+                group.update(monster_stats)
+            monsters.append(group)
+
+    return {"message": f"Generated level (seed {seed}): {platform_count} platforms, {monster_count} monsters",
+            "width": world_width, "platforms": platforms, "monsters": monsters}
+
+
+def _split_counts(total, mix):
+    """[(type, count)] dividing `total` monsters by the mix weights (largest remainders get the leftovers)."""
+    weight_sum = float(sum(mix.values()))
+    if total <= 0 or weight_sum <= 0:
+        return []
+    shares = [(monster_type, total * weight / weight_sum) for monster_type, weight in mix.items()]
+    counts = {monster_type: int(share) for monster_type, share in shares}
+    leftovers = total - sum(counts.values())
+    for monster_type, share in sorted(shares, key=lambda item: int(item[1]) - item[1])[:leftovers]:
+        counts[monster_type] += 1
+    return [(monster_type, counts[monster_type]) for monster_type in mix if counts[monster_type]]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Writes a seeded procedural level file.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--platforms", type=int, default=100, help="Platform count, ground included.")
+    parser.add_argument("--spacing", type=int, default=40, help="World width per platform, in pixels.")
+    parser.add_argument("--monsters", type=int, default=50)
+    parser.add_argument("--grunt-share", type=float, default=DEFAULT_MONSTER_MIX["Grunt"],
+                        help="Share of Grunts among the monsters; the rest are Flyers.")
+    parser.add_argument("--output", required=True, help="Level file to write, e.g. levels/level_05.json.")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    level = generate_level(seed=args.seed, platform_count=args.platforms, platform_spacing=args.spacing,
+                           monster_count=args.monsters,
+                           monster_mix={"Grunt": args.grunt_share, "Flyer": 1.0 - args.grunt_share})
+    elapsed = time.perf_counter() - start
+    with open(args.output, 'w') as f:
+        json.dump(level, f, separators=(",", ":"))
+    print(f"{level['message']} written to {args.output} (generated in {elapsed * 1e3:.1f} ms)")
@@ -0,0 +1,215 @@
+# Level files, loaded on demand and compiled once into ready-to-instantiate blueprints.
+#
+# Levels are JSON files in config.LEVELS_DIR (level_01.json, ...), played in file name
+# order; config.LEVEL_CONFIGS, when set to a list of the same dicts, is played instead.
+# A level is loose data: platforms as 4- or 5-element lists, monster groups that
+# override some of DEFAULT_GRUNT_STATS/DEFAULT_FLYER_STATS, an x and a y that are
+# numbers or lists (one per monster), drops as dicts. compile_level() validates and
+# normalizes a level once into a LevelBlueprint:
+#   - platforms: (x, y, width, height, color) tuples, and the world width they span
+#     (or the level's "width"), which bounds the player and the camera
+#   - spawns: one MonsterSpawn per monster, with its class, position and resolved
+#     constructor arguments, and the group's compiled LootTable
+# so Game.load_level_assets only constructs the objects. Blueprints are never
+# modified; get_level_blueprint() compiles each level the first time it's loaded
+# and keeps it for the rest of the run.
+#
+# prefetch_level() reads and compiles a level on a background worker, so the level
+# after the current one is ready by the time it's reached and the "level cleared"
+# transition only builds objects.
+import json
+import os
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+
+import config
+from src.loot import compile_loot_table
+from src.monster import Grunt, Flyer
+from src.world_elements import Platform
+
+GROUND_OFFSET = 40 # Grunts without a y stand on the ground platform, this high
+
+# world_width: the level's "width", or how far its platforms reach (at least a screen)
+LevelBlueprint = namedtuple("LevelBlueprint", ["platforms", "spawns", "message", "world_width"])
+# kwargs: read-only mapping of the remaining constructor arguments (stats and class-specific ones)
+MonsterSpawn = namedtuple("MonsterSpawn", ["monster_class", "x", "y", "kwargs", "drops", "loot_table"])
+
+LEVEL_FILE_PREFIX = "level_"
+LEVEL_FILE_EXTENSION = ".json"
+
+_cache = {} # level index -> LevelBlueprint (None for a level that failed to load) of the current source
+_pending = {} # level index -> Future of a prefetch not yet collected
+_source = {"levels": None, "dir": None, "files": None} # config.LEVEL_CONFIGS and LEVELS_DIR the cache belongs to; level file paths, once listed
+_worker = [None] # Started by the first prefetch_level()
+
+
+def _grunt_arguments(stats, y, screen_height):
+    actual_y = y if y is not None else screen_height - stats["height"] - GROUND_OFFSET
+    return actual_y, {"gravity_val": config.GRAVITY, "screen_height_val": config.SCREEN_HEIGHT,
+                      "patrol_range_x": stats["patrol_range_x"]}
+
+def _flyer_arguments(stats, y, screen_height):
+    actual_y = y if y is not None else stats["y_offset"]
+    return actual_y, {"vertical_amplitude": stats["vertical_amplitude"],
+                      "vertical_speed_factor": stats["vertical_speed_factor"],
+                      "patrol_range_x": stats["patrol_range_x"],
+                      "y_offset": actual_y} # The calculated y, as the Flyer's starting height
+
+# Monster type name in level files -> (class, default stats, function giving (y, class-specific arguments))
+MONSTER_TYPES = {
+    "Grunt": (Grunt, config.DEFAULT_GRUNT_STATS, _grunt_arguments),
+    "Flyer": (Flyer, config.DEFAULT_FLYER_STATS, _flyer_arguments),
+}
+_STAT_ARGUMENTS = ("width", "height", "color", "health", "attack_damage", "attack_range", "attack_cooldown", "speed")
+
+
+def _color(value):
+    """A platform color: [r, g, b] from a file, or the name of a color in config (e.g. "GREY")."""
+    if isinstance(value, str):
+        color = getattr(config, value, None)
+        if not isinstance(color, tuple):
+            print(f"Warning: Unknown color name {value!r} in level file; using the default platform color.")
+            return config.BLUE
+        return color
+    return tuple(value)
+
+def _positions(value):
+    """A group's x or y: one value for every monster, or a list of them."""
+    return list(value) if isinstance(value, (list, tuple)) and value else [value]
+
+def compile_level(level_data, screen_height=None):
+    """A LevelBlueprint of one level dict. Malformed platforms and monster groups are skipped with a warning."""
+    if screen_height is None:
+        screen_height = config.SCREEN_HEIGHT
+    platforms = []
+    for p_data in level_data.get("platforms", []):
+        if len(p_data) == 4: # x, y, width, height
+            platforms.append((p_data[0], p_data[1], p_data[2], p_data[3], config.BLUE)) # Platform's default color
+        elif len(p_data) == 5: # x, y, width, height, color
+            platforms.append((p_data[0], p_data[1], p_data[2], p_data[3], _color(p_data[4])))
+        else:
+            print(f"Warning: Platform {p_data} should be [x, y, width, height(, color)]. Skipped.")
+
+    spawns = []
+    for group in level_data.get("monsters", []):
+        monster_type = group.get("type")
+        if monster_type not in MONSTER_TYPES:
+            print(f"Warning: Unknown monster type {monster_type!r} in level config. Skipped.")
+            continue
+        count = group.get("count", 1)
+        if not isinstance(count, int) or count < 0:
+            print(f"Warning: Monster group count {count!r} should be a whole number. Skipped.")
+            continue
+        monster_class, defaults, class_arguments = MONSTER_TYPES[monster_type]
+        stats = dict(defaults)
+        stats.update({k: v for k, v in group.items() if k in defaults}) # Group overrides of the default stats
+        stat_arguments = {name: stats[name] for name in _STAT_ARGUMENTS}
+
+        x_positions = _positions(group.get("x", [100])) # Default x if not specified
+        y_positions = _positions(group.get("y"))
+        drops = group.get("drops", [])
+        loot_table = compile_loot_table(drops) # One table shared by the group's monsters
+        by_y = {} # y -> (actual y, read-only constructor arguments), shared by spawns at that height
+        for i in range(count): # Fewer positions than monsters: they're reused in turn
+            resolved = by_y.get(y_positions[i % len(y_positions)])
+            if resolved is None:
+                y = y_positions[i % len(y_positions)]
+                actual_y, arguments = class_arguments(stats, y, screen_height)
+                arguments.update(stat_arguments)
+                resolved = by_y[y] = (actual_y, MappingProxyType(arguments))
+            spawns.append(MonsterSpawn(monster_class, x_positions[i % len(x_positions)], resolved[0],
+                                       resolved[1], drops, loot_table))
+
+    world_width = level_data.get("width") or max([config.SCREEN_WIDTH] + [p[0] + p[2] for p in platforms])
+    return LevelBlueprint(tuple(platforms), tuple(spawns), level_data.get("message", ""), world_width)
+
+
+def _check_source():
+    """Starts over when config.LEVEL_CONFIGS or LEVELS_DIR was replaced (e.g. by a test)."""
+    if _source["levels"] is not config.LEVEL_CONFIGS or _source["dir"] != config.LEVELS_DIR:
+        _cache.clear()
+        _pending.clear() # Prefetches of the old levels finish, but nobody collects them
+        _source["levels"] = config.LEVEL_CONFIGS
+        _source["dir"] = config.LEVELS_DIR
+        _source["files"] = None
+
+def level_files():
+    """Paths of the level files in config.LEVELS_DIR, in play order (listed once per run)."""
+    if _source["files"] is None:
+        try:
+            names = sorted(name for name in os.listdir(config.LEVELS_DIR)
+                           if name.startswith(LEVEL_FILE_PREFIX) and name.endswith(LEVEL_FILE_EXTENSION))
+        except OSError as e:
+            print(f"Error listing level files in {config.LEVELS_DIR}: {e}")
+            names = []
+        _source["files"] = [os.path.join(config.LEVELS_DIR, name) for name in names]
+    return _source["files"]
+
+def level_count():
+    _check_source()
+    if config.LEVEL_CONFIGS is not None:
+        return len(config.LEVEL_CONFIGS)
+    return len(level_files())
+
+def load_level_data(level_index):
+    """The raw level dict (config.LEVEL_CONFIGS entry or parsed level file), or None if it can't be read."""
+    if config.LEVEL_CONFIGS is not None:
+        return config.LEVEL_CONFIGS[level_index]
+    path = level_files()[level_index]
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            level_data = json.load(f)
+    except (IOError, OSError) as e:
+        print(f"Error loading level file {path}: {e}")
+        return None
+    except ValueError as e:
+        print(f"Error decoding level file {path}: {e}")
+        return None
+    if not isinstance(level_data, dict):
+        print(f"Error: Level file {path} should hold a JSON object.")
+        return None
+    return level_data
+
+def _prepare(level_index):
+    level_data = load_level_data(level_index)
+    return compile_level(level_data) if level_data is not None else None
+
+def get_level_blueprint(level_index):
+    """The compiled blueprint of level level_index, or None if its file can't be loaded.
+
+    Read and compiled on first use, unless prefetch_level() already did (then this
+    only collects the result, waiting if the worker isn't done yet).
+    """
+    _check_source()
+    if level_index in _cache:
+        return _cache[level_index]
+    future = _pending.pop(level_index, None)
+    blueprint = future.result() if future is not None else _prepare(level_index)
+    _cache[level_index] = blueprint
+    return blueprint
+
+def prefetch_level(level_index):
+    """Starts reading and compiling a level on the background worker (if it exists and isn't ready yet)."""
+    if not 0 <= level_index < level_count() or level_index in _cache or level_index in _pending:
+        return
+    if _worker[0] is None:
+        _worker[0] = ThreadPoolExecutor(max_workers=1, thread_name_prefix="level-prefetch")
+    level_files() # Listed here, so the worker only reads the cached list
+    _pending[level_index] = _worker[0].submit(_prepare, level_index)
+
+def clear_cache():
+    """Forgets the compiled levels and the level file list (after editing levels during a run)."""
+    _cache.clear()
+    _pending.clear()
+    _source["files"] = None
+
+
+def build_platforms(blueprint):
+    return [Platform(x, y, width, height, color) for x, y, width, height, color in blueprint.platforms]
+
+
+def spawn_monsters(blueprint, sound_manager=None):
+    return [spawn.monster_class(x=spawn.x, y=spawn.y, sound_manager=sound_manager, possible_drops=spawn.drops,
+                                loot_table=spawn.loot_table, **spawn.kwargs)
+            for spawn in blueprint.spawns]
@@ -0,0 +1,100 @@
+# Loot tables compiled from the "drops" lists of the level files (src/levels.py).
+#
+# Every drop entry is an independent chance, e.g. a Grunt's
+#     [{"item_id": "MonsterPart", "chance": 1.0}, {"item_id": "HealthPotion", "chance": 0.2}]
+# A LootTable resolves the item ids to their shared definitions once (at level load)
+# and expands the entries into every combination of drops that can come out of a kill
+# (here: a part alone 80% of the time, a part and a potion 20%), stored with
+# cumulative probabilities. Rolling a kill is then one random number and a bisect,
+# instead of a random number, a config lookup and an item build per entry.
+#
+# Rolls draw from a module-level random.Random seeded with config.LOOT_RNG_SEED;
+# call seed() (or pass rng=) to make a run's loot reproducible.
+import random
+from bisect import bisect_right
+
+import config
+from src.items import get_item_definition
+
+loot_rng = random.Random(config.LOOT_RNG_SEED)
+
+
+def seed(value=None):
+    """Reseeds the shared loot RNG (None seeds from the OS, like random.seed)."""
+    loot_rng.seed(value)
+
+
+class LootTable:
+    """Ready-to-sample drops of one monster group.
+
+    roll() returns (item_id, item, quantity) tuples in the order the entries are
+    listed in the config, with `item` the shared definition from get_item_definition(). Tables are never modified after compiling, so every
+    monster of a group shares one.
+    """
+    def __init__(self, drops, max_combined_entries=None):
+        self.max_combined_entries = (max_combined_entries if max_combined_entries is not None
+                                     else config.LOOT_TABLE_MAX_COMBINED_ENTRIES)
+        self.entries = [] # (item_id, item, quantity, chance) of the entries that can drop
+        for drop_info in drops:
+            item_id = drop_info["item_id"]
+            chance = drop_info["chance"]
+            quantity = drop_info.get("quantity", 1) # Default to 1 if not specified
+            item = get_item_definition(item_id)
+            if item is None:
+                print(f"Warning: Loot table entry {item_id} has no item definition (check GENERIC_ITEM_DEFAULTS). Skipped.")
+                continue
+            if chance <= 0 or quantity <= 0:
+                continue
+            self.entries.append((item_id, item, quantity, min(chance, 1.0)))
+
+        uncertain = sum(1 for entry in self.entries if entry[3] < 1.0)
+        self.outcomes = None # Every combination of drops a kill can give, or None to roll each entry
+        self.thresholds = None # Cumulative probability of each outcome, for bisecting a random number
+        if uncertain <= self.max_combined_entries:
+            self._combine()
+
+    def _combine(self):
+        outcomes = [(1.0, ())]
+        for item_id, item, quantity, chance in self.entries:
+            drop = (item_id, item, quantity)
+            if chance >= 1.0: # Always drops: part of every outcome, no extra branch
+                outcomes = [(probability, drops + (drop,)) for probability, drops in outcomes]
+                continue
+            combined = []
+            for probability, drops in outcomes:
+                combined.append((probability * chance, drops + (drop,)))
+                combined.append((probability * (1.0 - chance), drops))
+            outcomes = combined
+
+        self.outcomes = []
+        self.thresholds = []
+        total = 0.0
+        for probability, drops in outcomes:
+            if probability <= 0.0:
+                continue
+            total += probability
+            self.outcomes.append(drops)
+            self.thresholds.append(total)
+        self.thresholds[-1] = 1.0 # Absorb rounding, so random() in [0, 1) always lands on an outcome
+
+    def __bool__(self):
+        return bool(self.entries)
+
+    def roll(self, rng=None):
+        """Drops of one kill, as a tuple of (item_id, item, quantity). Don't modify it."""
+        if self.outcomes is None:
+            random = (rng or loot_rng).random
+            return tuple((item_id, item, quantity) for item_id, item, quantity, chance in self.entries
+                         if chance >= 1.0 or random() < chance)
+        if len(self.outcomes) == 1: # Nothing left to chance
+            return self.outcomes[0]
+        return self.outcomes[bisect_right(self.thresholds, (rng or loot_rng).random())]
+
+
+EMPTY_TABLE = LootTable([]) # Shared by monsters that drop nothing
+
+
+def compile_loot_table(drops):
+    """A LootTable for a config drops list (EMPTY_TABLE for no drops)."""
+    return LootTable(drops) if drops else EMPTY_TABLE
+
@@ -1,9 +1,13 @@
 import pygame
 import math
 import config # Import the config file
+from src.spatial import nearby_platforms, in_attack_reach
+from src import event_log
+from src.loot import compile_loot_table
+from src.sprite_atlas import sprite_atlas
 
 class BaseMonster:
-    def __init__(self, x, y, width, height, color, health, attack_damage, attack_range, attack_cooldown, speed, sound_manager=None, possible_drops=None, gravity_val=0, screen_height_val=0): # Added sound_manager
+    def __init__(self, x, y, width, height, color, health, attack_damage, attack_range, attack_cooldown, speed, sound_manager=None, possible_drops=None, gravity_val=0, screen_height_val=0, loot_table=None): # Added sound_manager
         self.rect = pygame.Rect(x, y, width, height)
         self.color = color
         self.health = health
@@ -22,6 +26,8 @@ class BaseMonster:
         
         # Item drops
         self.possible_drops = possible_drops if possible_drops is not None else []
+        # Compiled once per monster group at level load (Game.load_level_assets) and shared
+        self.loot_table = loot_table if loot_table is not None else compile_loot_table(self.possible_drops)
 
         # Attributes to be initialized by subclasses if they use specific movement patterns
         self.gravity = gravity_val
@@ -29,15 +35,25 @@ class BaseMonster:
         # self.velocity_y, self.start_x, self.direction, self.patrol_range_x will be set by Grunt
 
     def draw(self, screen): # Removed HIT_COLOR from parameters
+        screen.blits(self.sprite_items(self.rect.topleft), doreturn=False)
+
+    def sprite_items(self, topleft):
+        """(sprite, position) pairs to blit for the monster drawn at topleft (src/sprite_atlas.py)."""
         color_to_draw = self.original_color
-        if self.is_hit and self.hit_flash_timer > 0:
+        if self.is_hit and self.hit_flash_timer > 0: # Timer is counted down by tick_hit_flash(), once per tick
             color_to_draw = config.HIT_COLOR # Use config.HIT_COLOR directly
+        return ((sprite_atlas.solid(self.rect.width, self.rect.height, color_to_draw), topleft),)
+
+    def tick_hit_flash(self):
+        """Counts the hit flash down by one simulation tick (called from update)."""
+        if self.is_hit:
             self.hit_flash_timer -= 1
-        elif self.is_hit and self.hit_flash_timer <= 0: # Check if is_hit was true and timer just ran out
-            self.is_hit = False
-            # self.color = self.original_color # Reset to original color - not needed due to color_to_draw logic
-        
-        pygame.draw.rect(screen, color_to_draw, self.rect)
+            if self.hit_flash_timer <= 0:
+                self.is_hit = False
+
+    def fall(self, platforms):
+        """Gravity and platform collisions, without the rest of update(); monsters that fly don't fall."""
+        pass
 
     def take_damage(self, amount):
         """Reduces monster's health and triggers hit flash."""
@@ -48,29 +64,45 @@ class BaseMonster:
         if self.sound_manager:
             self.sound_manager.play_sound(config.SOUND_MONSTER_HIT)
 
-        print(f"Monster (ID: {id(self)}, Type: {self.__class__.__name__}) took {amount} damage. Health: {self.health}")
+        if event_log.enabled(event_log.COMBAT, event_log.DEBUG):
+            event_log.log(event_log.COMBAT, event_log.DEBUG,
+                          f"Monster (ID: {id(self)}, Type: {self.__class__.__name__}) took {amount} damage. Health: {self.health}",
+                          event="monster_damaged", monster_id=id(self), monster_type=self.__class__.__name__,
+                          damage=amount, health=self.health)
         if self.health <= 0:
             self.health = 0
-            print(f"Monster (ID: {id(self)}, Type: {self.__class__.__name__}) defeated.")
+            if event_log.enabled(event_log.COMBAT, event_log.INFO):
+                event_log.log(event_log.COMBAT, event_log.INFO,
+                              f"Monster (ID: {id(self)}, Type: {self.__class__.__name__}) defeated.",
+                              event="monster_defeated", monster_id=id(self), monster_type=self.__class__.__name__)
             # Death handling (XP, drops) will be managed by GameplayScreen
 
     def attack(self, player):
         self.last_attack_time += 1
         if self.last_attack_time >= self.attack_cooldown:
-            effective_attack_rect = self.rect.inflate(self.attack_range, self.attack_range)
-            if effective_attack_rect.colliderect(player.rect):
-                # Player's take_damage method handles its own hit flash and sound.
-                # So, no need to play player_hit sound here.
-                player.take_damage(self.attack_damage) 
-                
-                # Potentially play a monster-specific attack sound here if desired in the future
-                # if self.sound_manager:
-                #     self.sound_manager.play_sound(config.SOUND_MONSTER_ATTACK_SOUND_KEY) # Needs new const
-                
-                print(f"Monster (ID: {id(self)}, Type: {self.__class__.__name__}) attacked player. Player health: {player.health}")
-                self.last_attack_time = 0
-
-    def update(self, platforms, player):
+            # Same test as self.rect.inflate(range, range).colliderect(player.rect), minus the temporary Rect
+            if in_attack_reach(self.rect, self.attack_range, player.rect):
+                self.strike(player)
+
+    def strike(self, player):
+        """Hits the player once. Callers have already checked cooldown and reach
+        (attack() here, MonsterBatch for batched updates)."""
+        # Player's take_damage method handles its own hit flash and sound.
+        # So, no need to play player_hit sound here.
+        player.take_damage(self.attack_damage) 
+        
+        # Potentially play a monster-specific attack sound here if desired in the future
+        # if self.sound_manager:
+        #     self.sound_manager.play_sound(config.SOUND_MONSTER_ATTACK_SOUND_KEY) # Needs new const
+        
+        if event_log.enabled(event_log.COMBAT, event_log.DEBUG):
+            event_log.log(event_log.COMBAT, event_log.DEBUG,
+                          f"Monster (ID: {id(self)}, Type: {self.__class__.__name__}) attacked player. Player health: {player.health}",
+                          event="monster_attack", monster_id=id(self), monster_type=self.__class__.__name__,
+                          damage=self.attack_damage, player_health=player.health)
+        self.last_attack_time = 0
+
+    def update(self, platforms, player, time_ticks=None):
         # Common update logic (like attack call) can remain here, or be called by subclasses.
         # For now, specific movement patterns are in subclasses.
         # self.attack(player) # Moved to subclass updates to allow specific attack conditions/timing
@@ -80,20 +112,26 @@ class BaseMonster:
 class Grunt(BaseMonster):
     def __init__(self, x, y, width, height, color, 
                  health, attack_damage, attack_range, attack_cooldown, speed, 
-                 patrol_range_x, gravity_val, screen_height_val, sound_manager=None, possible_drops=None): # Added sound_manager
-        super().__init__(x, y, width, height, color, health, attack_damage, attack_range, attack_cooldown, speed, sound_manager, possible_drops, gravity_val, screen_height_val) # Pass sound_manager
+                 patrol_range_x, gravity_val, screen_height_val, sound_manager=None, possible_drops=None, loot_table=None): # Added sound_manager
+        super().__init__(x, y, width, height, color, health, attack_damage, attack_range, attack_cooldown, speed, sound_manager, possible_drops, gravity_val, screen_height_val, loot_table) # Pass sound_manager
         self.patrol_range_x = patrol_range_x
         self.start_x = x 
         self.direction = 1 # 1 for right, -1 for left
         self.velocity_y = 0
     
-    def update(self, platforms, player): # Added player argument back
-        # Gravity and vertical collision
+    def update(self, platforms, player, time_ticks=None): # Added player argument back; time_ticks unused by Grunt
+        self.tick_hit_flash()
+        self.fall(platforms)
+        self.patrol(platforms)
+        super().attack(player) # Call BaseMonster's attack logic
+
+    def fall(self, platforms):
+        """Gravity and vertical collision with the platforms and the ground."""
         self.velocity_y += self.gravity
         old_rect_for_v_collision = self.rect.copy()
         self.rect.y += self.velocity_y
 
-        for platform in platforms:
+        for platform in nearby_platforms(platforms, self.rect.union(old_rect_for_v_collision)):
             if self.rect.colliderect(platform.rect):
                 if self.velocity_y > 0 and old_rect_for_v_collision.bottom <= platform.rect.top: # Landing on top
                     self.rect.bottom = platform.rect.top
@@ -106,7 +144,8 @@ class Grunt(BaseMonster):
             self.rect.bottom = self.screen_height
             self.velocity_y = 0
 
-        # Horizontal movement and patrol logic
+    def patrol(self, platforms):
+        """Horizontal movement and patrol logic, turning around at the patrol bounds and at platform sides."""
         old_rect_for_h_collision = self.rect.copy()
         self.rect.x += self.speed * self.direction
 
@@ -119,7 +158,7 @@ class Grunt(BaseMonster):
             self.rect.left = self.start_x - self.patrol_range_x
             
         # Horizontal collision with platforms
-        for platform in platforms:
+        for platform in nearby_platforms(platforms, self.rect.union(old_rect_for_h_collision)):
             if self.rect.colliderect(platform.rect):
                 # Check if it's a side collision (and not just landing/hitting head)
                 if not (old_rect_for_h_collision.bottom <= platform.rect.top or \
@@ -130,15 +169,13 @@ class Grunt(BaseMonster):
                     elif self.direction == -1: # Moving left, hit right side of platform
                         self.rect.left = platform.rect.right
                         self.direction = 1 # Turn around
-        
-        super().attack(player) # Call BaseMonster's attack logic
 
 
 class Flyer(BaseMonster):
     def __init__(self, x, y, width, height, color, 
                  health, attack_damage, attack_range, attack_cooldown, speed, 
-                 vertical_amplitude, vertical_speed_factor, patrol_range_x, y_offset, sound_manager=None, possible_drops=None): # Added sound_manager, y_offset
-        super().__init__(x, y, width, height, color, health, attack_damage, attack_range, attack_cooldown, speed, sound_manager, possible_drops) # Pass sound_manager
+                 vertical_amplitude, vertical_speed_factor, patrol_range_x, y_offset, sound_manager=None, possible_drops=None, loot_table=None): # Added sound_manager, y_offset
+        super().__init__(x, y, width, height, color, health, attack_damage, attack_range, attack_cooldown, speed, sound_manager, possible_drops, loot_table=loot_table) # Pass sound_manager
         # y_offset is used by GameplayScreen to place the flyer initially.
         # The Flyer's own initial_y for its sine wave movement should be its starting y.
         self.initial_y = y 
@@ -148,7 +185,9 @@ class Flyer(BaseMonster):
         self.start_x = x   
         self.patrol_range_x = patrol_range_x 
 
-    def update(self, platforms, player, monsters_list=None): # monsters_list not used by Flyer
+    def update(self, platforms, player, monsters_list=None, time_ticks=None): # monsters_list not used by Flyer
+        self.tick_hit_flash()
+
         # Horizontal patrol
         self.rect.x += self.speed * self.direction
         if self.direction == 1 and self.rect.right >= self.start_x + self.patrol_range_x:
@@ -159,7 +198,8 @@ class Flyer(BaseMonster):
             self.rect.left = self.start_x - self.patrol_range_x # Snap to boundary
         
         # Vertical sine wave movement
-        time_ticks = pygame.time.get_ticks() # Get current time in milliseconds
+        if time_ticks is None: # Callers normally pass the gameplay clock (Game.sim_time_ms)
+            time_ticks = pygame.time.get_ticks() # Get current time in milliseconds
         # Ensure vertical_speed_factor is scaled appropriately if it's small,
         # or adjust the divisor (1000.0) if the factor is already scaled.
         # For example, if vertical_speed_factor is 0.005, then time_ticks * 0.005 / 1000.0 might be too slow.
@@ -0,0 +1,267 @@
+# Batched monster updates: a level's monster state kept in NumPy arrays
+# (structure of arrays) and advanced in a few vectorized operations per tick.
+from collections import deque
+from itertools import compress, repeat
+from operator import attrgetter
+
+import pygame
+
+try:
+    import numpy as np
+except ImportError: # NumPy is optional; GameplayScreen falls back to per-object updates
+    np = None
+
+from src.monster import Grunt, Flyer
+from src.spatial import nearby_platforms
+
+GRUNT = 0
+FLYER = 1
+_KINDS = {Grunt: GRUNT, Flyer: FLYER}
+
+# Per-monster state columns; every array listed here is compacted when monsters die
+_COLUMNS = ('kind', 'x', 'y', 'width', 'height', 'velocity_y', 'gravity', 'floor_y', 'direction', 'speed',
+            'start_x', 'patrol_range_x', 'initial_y', 'vertical_amplitude', 'vertical_speed_factor',
+            'attack_range', 'attack_cooldown', 'last_attack_time', 'health')
+
+_health = attrgetter('health')
+_is_hit = attrgetter('is_hit')
+
+
+def _round(values):
+    """Rounds half away from zero, which is what pygame.Rect does with float coordinates."""
+    return np.trunc(values + np.copysign(0.5, values))
+
+
+def _column(objects, attribute, default=0):
+    return np.fromiter((getattr(obj, attribute, default) for obj in objects), dtype=float, count=len(objects))
+
+
+class MonsterBatch:
+    """Structure-of-arrays copy of a level's monsters.
+
+    update() gives the same results as calling Grunt.update / Flyer.update on
+    each monster of the live list in order, including which monsters hit the
+    player and when defeated monsters are reported, but moves every monster
+    with a handful of NumPy operations instead of one Python call each.
+
+    While batched, the arrays are authoritative: rects are written back every
+    tick (drawing and combat read them), the other per-object fields
+    (velocity_y, direction, last_attack_time) only by write_back(). Health
+    stays owned by the monsters, since combat changes it one hit at a time;
+    it is re-read each tick to find defeated monsters.
+    """
+    def __init__(self, monsters=None):
+        self.reset(monsters if monsters is not None else [])
+
+    @staticmethod
+    def can_batch(monsters):
+        """True if NumPy is available and every monster is a type the batch knows how to move."""
+        return np is not None and all(type(monster) in _KINDS for monster in monsters)
+
+    def __len__(self):
+        return len(self.tracked)
+
+    def reset(self, monsters):
+        """Tracks a new live monsters list (e.g. a freshly loaded level), reading state from the objects."""
+        self.monsters = monsters
+        self.tracked = list(monsters) # Monster objects, one per array row, in list order
+        self.rects = [monster.rect for monster in self.tracked]
+        tracked, rects = self.tracked, self.rects
+
+        self.kind = np.array([_KINDS[type(monster)] for monster in tracked], dtype=np.int8)
+        self.x = _column(rects, 'x')
+        self.y = _column(rects, 'y')
+        self.width = _column(rects, 'width')
+        self.height = _column(rects, 'height')
+        self.velocity_y = _column(tracked, 'velocity_y')
+        self.gravity = _column(tracked, 'gravity')
+        self.floor_y = _column(tracked, 'screen_height')
+        self.direction = _column(tracked, 'direction', 1)
+        self.speed = _column(tracked, 'speed')
+        self.start_x = _column(tracked, 'start_x')
+        self.patrol_range_x = _column(tracked, 'patrol_range_x')
+        self.initial_y = _column(tracked, 'initial_y')
+        self.vertical_amplitude = _column(tracked, 'vertical_amplitude')
+        self.vertical_speed_factor = _column(tracked, 'vertical_speed_factor')
+        self.attack_range = _column(tracked, 'attack_range')
+        self.attack_cooldown = _column(tracked, 'attack_cooldown')
+        self.last_attack_time = _column(tracked, 'last_attack_time')
+        self.health = _column(tracked, 'health')
+
+    def write_back(self):
+        """Copies the batched per-object state back onto the monster objects."""
+        rows = zip(self.tracked, self.kind.tolist(), self.velocity_y.tolist(),
+                   self.direction.astype(int).tolist(), self.last_attack_time.astype(int).tolist())
+        for monster, kind, velocity_y, direction, last_attack_time in rows:
+            if kind == GRUNT:
+                monster.velocity_y = velocity_y
+            monster.direction = direction
+            monster.last_attack_time = last_attack_time
+        self._write_rects()
+
+    def update(self, platforms, player, time_ticks=None, on_defeated=None, lod=None):
+        """Advances every monster one tick.
+
+        Defeated monsters (health <= 0) are not moved; on_defeated(monster) is
+        called for each of them instead, interleaved with the monsters' attacks
+        on the player in list order, exactly like GameplayScreen's per-object loop.
+        lod: a MonsterLOD (src/simulation_lod.py) choosing which live monsters
+        are updated this tick and which only fall, as it does for the per-object
+        loop; monsters it skips aren't moved and don't attack. None: every
+        monster is updated.
+        """
+        if self.monsters != self.tracked: # Monsters added or removed outside the batch
+            self.write_back()
+            self.reset(self.monsters)
+        if not self.tracked:
+            return
+        if time_ticks is None: # Callers normally pass the gameplay clock (Game.sim_time_ms)
+            time_ticks = pygame.time.get_ticks()
+
+        self.health = np.fromiter(map(_health, self.tracked), dtype=float, count=len(self.tracked))
+        alive = self.health > 0
+        due, falling = lod.step_masks(self.x, self.width, self.start_x, alive) if lod is not None else (alive, alive & False)
+        for monster in filter(_is_hit, compress(self.tracked, due.tolist())): # Few monsters are flashing at any time
+            monster.tick_hit_flash()
+        grunts = self.kind == GRUNT
+        self._fall_grunts((due | falling) & grunts, platforms)
+        self._patrol_grunts(due & grunts, platforms)
+        self._move_flyers(due & (self.kind == FLYER), time_ticks)
+        self._write_rects()
+        attacking = self._advance_attacks(due, player.rect)
+
+        # Attacks and defeats are rare, so they go back to the monster objects, in list order
+        events = np.flatnonzero(attacking | ~alive).tolist()
+        for row in events:
+            monster = self.tracked[row]
+            if alive[row]:
+                monster.strike(player)
+                self.last_attack_time[row] = 0
+            elif on_defeated is not None:
+                on_defeated(monster)
+
+        if not alive.all():
+            self._compact(alive)
+
+    def _fall_grunts(self, grunts, platforms):
+        """Vectorized Grunt.fall: gravity, platform landing and bumping, and the ground."""
+        if not grunts.any():
+            return
+        x, y, width, height, velocity_y = self.x, self.y, self.width, self.height, self.velocity_y
+
+        velocity_y[grunts] += self.gravity[grunts]
+        old_top = y.copy()
+        old_bottom = y + height
+        y[grunts] = _round(y[grunts] + velocity_y[grunts])
+
+        # Platforms are applied one at a time in level order, as the per-object loop does
+        for p, rows in self._platform_contacts(platforms, grunts, x, old_top):
+            rx, ry, rw, rh, rvy = x[rows], y[rows], width[rows], height[rows], velocity_y[rows]
+            hit = (rx < p.right) & (p.left < rx + rw) & (ry < p.bottom) & (p.top < ry + rh)
+            landing = hit & (rvy > 0) & (old_bottom[rows] <= p.top)
+            bumping = hit & ~landing & (rvy < 0) & (old_top[rows] >= p.bottom)
+            y[rows[landing]] = p.top - rh[landing]
+            y[rows[bumping]] = p.bottom
+            velocity_y[rows[landing | bumping]] = 0
+
+        on_ground = grunts & (y + height >= self.floor_y)
+        y[on_ground] = self.floor_y[on_ground] - height[on_ground]
+        velocity_y[on_ground] = 0
+
+    def _patrol_grunts(self, grunts, platforms):
+        """Vectorized Grunt.patrol: horizontal movement, patrol bounds and side collisions."""
+        if not grunts.any():
+            return
+        x, y, width, height, direction = self.x, self.y, self.width, self.height, self.direction
+
+        old_top = y.copy()
+        old_bottom = y + height
+        old_x = x.copy()
+        x[grunts] = _round(x[grunts] + self.speed[grunts] * direction[grunts])
+        self._clamp_patrol(grunts, inclusive=False)
+
+        for p, rows in self._platform_contacts(platforms, grunts, old_x, y):
+            rx, rw, rdir = x[rows], width[rows], direction[rows]
+            hit = ((rx < p.right) & (p.left < rx + rw) & (y[rows] < p.bottom) & (p.top < y[rows] + height[rows]) &
+                   ~((old_bottom[rows] <= p.top) | (old_top[rows] >= p.bottom))) # Side collisions only
+            moving_right = hit & (rdir == 1)
+            moving_left = hit & (rdir == -1)
+            x[rows[moving_right]] = p.left - rw[moving_right]
+            direction[rows[moving_right]] = -1
+            x[rows[moving_left]] = p.right
+            direction[rows[moving_left]] = 1
+
+    def _move_flyers(self, flyers, time_ticks):
+        """Vectorized Flyer.update movement: horizontal patrol and a sine bob from one shared tick value."""
+        if not flyers.any():
+            return
+        self.x[flyers] = _round(self.x[flyers] + self.speed[flyers] * self.direction[flyers])
+        self._clamp_patrol(flyers, inclusive=True)
+        phase = time_ticks * self.vertical_speed_factor[flyers]
+        self.y[flyers] = _round(self.initial_y[flyers] + np.sin(phase) * self.vertical_amplitude[flyers])
+
+    def _clamp_patrol(self, rows, inclusive):
+        """Turns monsters around at their patrol bounds (Flyers turn on touching them, Grunts on passing them)."""
+        x, width, direction = self.x, self.width, self.direction
+        right_bound = self.start_x + self.patrol_range_x
+        left_bound = self.start_x - self.patrol_range_x
+        if inclusive:
+            past_right = rows & (direction == 1) & (x + width >= right_bound)
+            past_left = rows & (direction == -1) & (x <= left_bound)
+        else:
+            past_right = rows & (direction == 1) & (x + width > right_bound)
+            past_left = rows & (direction == -1) & (x < left_bound)
+        direction[past_right] = -1
+        x[past_right] = _round(right_bound[past_right]) - width[past_right]
+        direction[past_left] = 1
+        x[past_left] = _round(left_bound[past_left])
+
+    def _platform_contacts(self, platforms, rows, old_x, old_y):
+        """(platform rect, row indices) for each platform touching the swept rect (old and
+        new position) of at least one of the given monsters, in level order.
+
+        This is the batched form of the per-object nearby_platforms(platforms, rect.union(old_rect)):
+        each monster is only tested against the platforms its own swept rect touches.
+        """
+        rows = np.flatnonzero(rows)
+        x, y, width, height = self.x[rows], self.y[rows], self.width[rows], self.height[rows]
+        old_x, old_y = old_x[rows], old_y[rows]
+        left, top = np.minimum(x, old_x), np.minimum(y, old_y)
+        right, bottom = np.maximum(x, old_x) + width, np.maximum(y, old_y) + height
+
+        area = pygame.Rect(int(left.min()), int(top.min()), int(right.max() - left.min()), int(bottom.max() - top.min()))
+        candidates = [p.rect for p in nearby_platforms(platforms, area) if p.rect.width > 0 and p.rect.height > 0]
+        if not candidates:
+            return []
+        bounds = np.array([(r.left, r.top, r.right, r.bottom) for r in candidates], dtype=float)
+        touching = ((left < bounds[:, 2, None]) & (bounds[:, 0, None] < right) &
+                    (top < bounds[:, 3, None]) & (bounds[:, 1, None] < bottom)) # platforms x monsters
+        return [(candidates[i], rows[touching[i]]) for i in np.flatnonzero(touching.any(axis=1)).tolist()]
+
+    def _advance_attacks(self, alive, target_rect):
+        """Ticks attack cooldowns; returns the rows whose attack lands this tick (see in_attack_reach)."""
+        self.last_attack_time[alive] += 1
+        ready = alive & (self.last_attack_time >= self.attack_cooldown)
+        if not ready.any() or target_rect.width <= 0 or target_rect.height <= 0:
+            return ready & False
+        half_range = np.trunc(self.attack_range / 2) # Rect.inflate truncates its half offsets
+        left = self.x - half_range
+        top = self.y - half_range
+        width = self.width + self.attack_range
+        height = self.height + self.attack_range
+        return (ready & (width > 0) & (height > 0) &
+                (left < target_rect.right) & (target_rect.left < left + width) &
+                (top < target_rect.bottom) & (target_rect.top < top + height))
+
+    def _write_rects(self):
+        """Moves every monster's rect to its batched position (one C-level loop)."""
+        positions = zip(self.x.astype(int).tolist(), self.y.astype(int).tolist())
+        deque(map(setattr, self.rects, repeat('topleft'), positions), maxlen=0)
+
+    def _compact(self, keep):
+        """Drops the rows not in keep (defeated monsters)."""
+        for name in _COLUMNS:
+            setattr(self, name, getattr(self, name)[keep])
+        kept = keep.tolist()
+        self.tracked = [monster for monster, k in zip(self.tracked, kept) if k]
+        self.rects = [rect for rect, k in zip(self.rects, kept) if k]
@@ -1,5 +1,8 @@
 import pygame
 import config # Import the config file
+from src.spatial import nearby_platforms
+from src.sprite_atlas import sprite_atlas
+from src import event_log
 
 class Pet:
     def __init__(self, x, y, width, height, color, owner, sound_manager=None): # Added sound_manager
@@ -25,17 +28,25 @@ class Pet:
         self.hit_flash_timer = 0
 
     def draw(self, surface): # Renamed screen to surface for consistency
+        surface.blits(self.sprite_items(self.rect.topleft), doreturn=False)
+
+    def sprite_items(self, topleft):
+        """(sprite, position) pairs to blit for the pet drawn at topleft (src/sprite_atlas.py)."""
         current_color = self.original_color 
-        if self.is_hit and self.hit_flash_timer > 0:
+        if self.is_hit and self.hit_flash_timer > 0: # Timer is counted down in update(), once per tick
             current_color = config.HIT_COLOR 
+        return ((sprite_atlas.solid(self.rect.width, self.rect.height, current_color), topleft),)
+
+    def tick_hit_flash(self):
+        """Counts the hit flash down by one simulation tick."""
+        if self.is_hit:
             self.hit_flash_timer -= 1
-        elif self.is_hit and self.hit_flash_timer <= 0: # Check if is_hit was true and timer just ran out
-            self.is_hit = False # Reset is_hit state
-            # self.color = self.original_color # No longer needed as current_color handles it
+            if self.hit_flash_timer <= 0:
+                self.is_hit = False
 
-        pygame.draw.rect(surface, current_color, self.rect)
+    def update(self, platforms, monsters, player, monster_index=None): 
+        self.tick_hit_flash()
 
-    def update(self, platforms, monsters, player): 
         # --- Follow Logic ---
         # Using self.follow_distance now
         dx_to_owner = self.owner.rect.centerx - self.rect.centerx
@@ -50,7 +61,7 @@ class Pet:
             old_rect = self.rect.copy()
             self.rect.x += norm_dx * self.speed
             self.rect.y += norm_dy * self.speed
-            for platform in platforms:
+            for platform in nearby_platforms(platforms, self.rect):
                 if self.rect.colliderect(platform.rect):
                     self.rect = old_rect
                     break
@@ -58,15 +69,19 @@ class Pet:
         # --- Attack Logic ---
         self.last_attack_time += 1
         if self.last_attack_time >= self.attack_cooldown and monsters: # Check if monsters list is not empty
-            closest_monster = None
-            min_dist_sq = float('inf')
+            if monster_index is not None:
+                # Only the closest monster within attack range matters, which the index answers directly
+                closest_monster, min_dist_sq = monster_index.nearest(self.rect.centerx, self.rect.centery, self.attack_range)
+            else:
+                closest_monster = None
+                min_dist_sq = float('inf')
 
-            for monster in monsters:
-                dist_sq = (self.rect.centerx - monster.rect.centerx)**2 + \
-                          (self.rect.centery - monster.rect.centery)**2
-                if dist_sq < min_dist_sq:
-                    min_dist_sq = dist_sq
-                    closest_monster = monster
+                for monster in monsters:
+                    dist_sq = (self.rect.centerx - monster.rect.centerx)**2 + \
+                              (self.rect.centery - monster.rect.centery)**2
+                    if dist_sq < min_dist_sq:
+                        min_dist_sq = dist_sq
+                        closest_monster = monster
             
             if closest_monster and min_dist_sq < self.attack_range**2:
                 # Check if the monster is also close to the player
@@ -85,7 +100,11 @@ class Pet:
                     if self.sound_manager:
                         self.sound_manager.play_sound(config.SOUND_PET_ATTACK)
                     
-                    print(f"Pet attacked monster (ID: {id(closest_monster)}). Monster health: {closest_monster.health}")
+                    if event_log.enabled(event_log.COMBAT, event_log.DEBUG):
+                        event_log.log(event_log.COMBAT, event_log.DEBUG,
+                                      f"Pet attacked monster (ID: {id(closest_monster)}). Monster health: {closest_monster.health}",
+                                      event="pet_attack", monster_id=id(closest_monster), damage=self.attack_damage,
+                                      monster_health=closest_monster.health)
                     self.last_attack_time = 0
                     # Monster death sound (SOUND_MONSTER_DEATH) is handled by GameplayScreen
 
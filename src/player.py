@@ -3,6 +3,9 @@ import config
 from src.pet import Pet 
 from src.inventory_manager import InventoryManager # Import InventoryManager
 from src.items import Item # Import Item for creating item instances
+from src.spatial import nearby_platforms
+from src.sprite_atlas import sprite_atlas, to_pixels
+from src import event_log
 # Placeholder constants previously here have been removed.
 
 # Player class and related logic.
@@ -21,6 +24,7 @@ class Player:
         self.speed = config.PLAYER_SPEED
         self.velocity_y = 0
         self.is_jumping = False
+        self.world_width = config.SCREEN_WIDTH # Right edge of the level; set by Game.load_level_assets
         self.max_health = config.PLAYER_MAX_HEALTH
         self.health = self.max_health
         self.attack_range = config.PLAYER_ATTACK_RANGE
@@ -61,28 +65,35 @@ class Player:
 
 
     def draw(self, screen):
+        screen.blits(self.sprite_items(self.rect.topleft), doreturn=False)
+
+    def sprite_items(self, topleft):
+        """(sprite, position) pairs to blit for the player drawn at topleft (src/sprite_atlas.py)."""
         current_player_color = self.original_color
-        if self.is_hit and self.hit_flash_timer > 0:
-            # This will become config.HIT_COLOR in the next step
+        if self.is_hit and self.hit_flash_timer > 0: # Timer is counted down in update(), once per tick
             current_player_color = config.HIT_COLOR 
-            self.hit_flash_timer -= 1
-        elif self.is_hit and self.hit_flash_timer <= 0:
-            self.is_hit = False
-        
-        pygame.draw.rect(screen, current_player_color, self.rect)
-
+        items = [(sprite_atlas.solid(self.rect.width, self.rect.height, current_player_color), topleft)]
 
         if self.is_attacking:
-            attack_rect_width = 30
-            attack_rect_height = self.rect.height * 0.8
-            attack_rect_y = self.rect.centery - attack_rect_height / 2
-            if self.direction == 1: 
-                attack_rect_x = self.rect.right
-            else: 
-                attack_rect_x = self.rect.left - attack_rect_width
-            attack_visual_rect = pygame.Rect(attack_rect_x, attack_rect_y, attack_rect_width, attack_rect_height)
-            # This will become config.ATTACK_VISUAL_COLOR in the next step
-            pygame.draw.rect(screen, config.ATTACK_VISUAL_COLOR, attack_visual_rect) 
+            dx, dy, width, height = self.attack_visual_layout()
+            items.append((sprite_atlas.solid(width, height, config.ATTACK_VISUAL_COLOR), (topleft[0] + dx, topleft[1] + dy)))
+        return items
+
+    def attack_visual_layout(self):
+        """The attack swipe's offset from rect.topleft and its size: (dx, dy, width, height).
+
+        It's beside the player on the side it faces, vertically centered.
+        """
+        attack_rect_width = 30
+        attack_rect_height = self.rect.height * 0.8
+        dy = to_pixels((0, self.rect.height // 2 - attack_rect_height / 2))[1] # centery - top
+        dx = self.rect.width if self.direction == 1 else -attack_rect_width
+        return dx, dy, attack_rect_width, to_pixels((0, attack_rect_height))[1]
+
+    def attack_visual_rect(self):
+        """Where the attack swipe is drawn."""
+        dx, dy, width, height = self.attack_visual_layout()
+        return pygame.Rect(self.rect.x + dx, self.rect.y + dy, width, height)
 
 
     def move(self, dx, dy, platforms):
@@ -91,35 +102,38 @@ class Player:
         elif dx < 0:
             self.direction = -1
 
-        self.rect.x += dx
-        for platform in platforms:
-            if self.rect.colliderect(platform.rect):
-                if dx > 0: 
-                    self.rect.right = platform.rect.left
-                elif dx < 0: 
-                    self.rect.left = platform.rect.right
-        
-        old_rect_bottom = self.rect.bottom 
-        old_rect_top = self.rect.top       
-        self.rect.y += dy                  
+        # Only platforms near the swept area (old + new position) can be hit.
+        # A zero component can't produce a collision response, so its pass is skipped.
+        if dx != 0:
+            self.rect.x += dx
+            for platform in nearby_platforms(platforms, self.rect, dx=dx):
+                if self.rect.colliderect(platform.rect):
+                    if dx > 0: 
+                        self.rect.right = platform.rect.left
+                    elif dx < 0: 
+                        self.rect.left = platform.rect.right
         
-        for platform in platforms:
-            if self.rect.colliderect(platform.rect):
-                if dy > 0:  
-                    if old_rect_bottom <= platform.rect.top:
-                        self.rect.bottom = platform.rect.top
-                        self.velocity_y = 0
-                        self.is_jumping = False
-                elif dy < 0:  
-                    if old_rect_top >= platform.rect.bottom:
-                        self.rect.top = platform.rect.bottom
-                        self.velocity_y = 0 
+        if dy != 0:
+            old_rect_bottom = self.rect.bottom 
+            old_rect_top = self.rect.top       
+            self.rect.y += dy                  
+
+            for platform in nearby_platforms(platforms, self.rect, dy=dy):
+                if self.rect.colliderect(platform.rect):
+                    if dy > 0:  
+                        if old_rect_bottom <= platform.rect.top:
+                            self.rect.bottom = platform.rect.top
+                            self.velocity_y = 0
+                            self.is_jumping = False
+                    elif dy < 0:  
+                        if old_rect_top >= platform.rect.bottom:
+                            self.rect.top = platform.rect.bottom
+                            self.velocity_y = 0 
 
         if self.rect.left < 0:
             self.rect.left = 0
-        # These will become config.SCREEN_WIDTH in the next step
-        if self.rect.right > config.SCREEN_WIDTH: 
-            self.rect.right = config.SCREEN_WIDTH 
+        if self.rect.right > self.world_width: # The level's width, which can span many screens
+            self.rect.right = self.world_width
         
         if self.rect.top < 0:
             self.rect.top = 0
@@ -161,10 +175,20 @@ class Player:
             self.attack_visual_timer -= 1
             if self.attack_visual_timer <= 0:
                 self.is_attacking = False
+
+        self.tick_hit_flash()
+
+    def tick_hit_flash(self):
+        """Counts the hit flash down by one simulation tick."""
+        if self.is_hit:
+            self.hit_flash_timer -= 1
+            if self.hit_flash_timer <= 0:
+                self.is_hit = False
                 
     # This method is intended to be called when an attack input is received (e.g., space bar)
     # The actual call will be managed by GameplayScreen based on input events.
-    def attempt_attack(self, monsters):
+    def attempt_attack(self, monsters, monster_index=None):
+        # monster_index (a spatial.MonsterIndex) narrows the hit test to monsters near the hitbox.
         if self.last_attack_time >= self.attack_cooldown:
             attack_occurred_this_attempt = False
             # Determine attack hitbox based on direction
@@ -183,12 +207,17 @@ class Player:
             # For now, a rect extending from the player's facing side.
             attack_rect = pygame.Rect(attack_hitbox_x, attack_hitbox_y, attack_hitbox_width, attack_hitbox_height)
 
-            for monster in monsters:
+            targets = monster_index.query_rect(attack_rect) if monster_index is not None else monsters
+            for monster in targets:
                 if monster.rect.colliderect(attack_rect):
                     monster.take_damage(self.attack_damage) # Monster handles its own hit flash
                     if self.sound_manager:
                         self.sound_manager.play_sound(config.SOUND_MONSTER_HIT) # Use config for sound key
-                    print(f"Player attacked monster (ID: {id(monster)}). Monster health: {monster.health}")
+                    if event_log.enabled(event_log.COMBAT, event_log.DEBUG):
+                        event_log.log(event_log.COMBAT, event_log.DEBUG,
+                                      f"Player attacked monster (ID: {id(monster)}). Monster health: {monster.health}",
+                                      event="player_attack", monster_id=id(monster), damage=self.attack_damage,
+                                      monster_health=monster.health)
                     
                     if monster.health <= 0:
                         # GameplayScreen will handle monster death (XP, drops)
@@ -211,7 +240,10 @@ class Player:
 
     def gain_xp(self, amount):
         self.experience_points += amount
-        print(f"Player gained {amount} XP. Total XP: {self.experience_points}/{self.xp_to_next_level}")
+        if event_log.enabled(event_log.XP, event_log.INFO):
+            event_log.log(event_log.XP, event_log.INFO,
+                          f"Player gained {amount} XP. Total XP: {self.experience_points}/{self.xp_to_next_level}",
+                          event="xp_gained", amount=amount, xp=self.experience_points, xp_to_next_level=self.xp_to_next_level)
         self.check_for_level_up()
 
     def check_for_level_up(self):
@@ -229,7 +261,11 @@ class Player:
             
             if self.sound_manager:
                 self.sound_manager.play_sound(config.SOUND_LEVEL_UP) # Use config for sound key
-            print(f"Player reached Level {self.level}! Max health increased to {self.max_health}. XP for next level: {self.xp_to_next_level}.")
+            if event_log.enabled(event_log.XP, event_log.INFO):
+                event_log.log(event_log.XP, event_log.INFO,
+                              f"Player reached Level {self.level}! Max health increased to {self.max_health}. XP for next level: {self.xp_to_next_level}.",
+                              event="level_up", level=self.level, max_health=self.max_health,
+                              xp_to_next_level=self.xp_to_next_level)
             # If experience_points is still >= new xp_to_next_level, the loop continues
             
     def calculate_xp_for_next_level(self):
@@ -245,7 +281,9 @@ class Player:
         
         if self.health <= 0:
             self.health = 0
-            print("Player has been defeated.")
+            if event_log.enabled(event_log.COMBAT, event_log.INFO):
+                event_log.log(event_log.COMBAT, event_log.INFO, "Player has been defeated.", event="player_defeated")
             # Game over logic will be handled by GameplayScreen or Game class
-        else:
-            print(f"Player took {amount} damage. Health: {self.health}/{self.max_health}")
+        elif event_log.enabled(event_log.COMBAT, event_log.DEBUG):
+            event_log.log(event_log.COMBAT, event_log.DEBUG, f"Player took {amount} damage. Health: {self.health}/{self.max_health}",
+                          event="player_damaged", damage=amount, health=self.health, max_health=self.max_health)
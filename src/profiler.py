@@ -0,0 +1,140 @@
+# Per-phase frame timers for the main loop, with rolling percentiles, an
+# on-screen overlay and a CSV/JSON dump.
+#
+# Game owns a FrameProfiler only while profiling is on (Game.profiler is None
+# otherwise), so timed call sites look like:
+#
+#     profiler = self.game_manager.profiler
+#     if profiler: mark = time.perf_counter()
+#     self.player.update(...)
+#     if profiler: mark = profiler.lap("player.update", mark)
+import csv
+import json
+import time
+from collections import deque
+
+import pygame
+
+import config
+
+# Phases in the order they run in a frame (and are listed in the overlay and dumps)
+PHASES = ("events", "player.update", "pet.update", "update_monsters", "draw", "display.flip", "frame")
+
+
+def percentile(sorted_samples, percent):
+    """Nearest-rank percentile of an already sorted, non-empty sequence."""
+    index = max(0, min(len(sorted_samples) - 1, int(round(percent / 100.0 * len(sorted_samples))) - 1))
+    return sorted_samples[index]
+
+
+class FrameProfiler:
+    """Keeps the last `window` durations of each phase.
+
+    Durations are in seconds (time.perf_counter); stats and dumps report milliseconds.
+    Update phases run once per simulation tick, so a frame that catches up on
+    several ticks records several samples for them.
+    """
+    def __init__(self, window=None, show_overlay=None):
+        self.window = window if window is not None else config.PROFILER_WINDOW
+        self.show_overlay = config.PROFILER_OVERLAY if show_overlay is None else show_overlay
+        self.samples = {phase: deque(maxlen=self.window) for phase in PHASES}
+        self.counters = {} # name -> latest value (e.g. monsters per simulation tier), listed under the phases
+        self.frames_since_refresh = 0
+        self.overlay_surfaces = [] # Rendered overlay lines, refreshed every PROFILER_OVERLAY_REFRESH_FRAMES
+        self.overlay_font = None
+
+    def record(self, phase, seconds):
+        samples = self.samples.get(phase)
+        if samples is None:
+            samples = self.samples[phase] = deque(maxlen=self.window)
+        samples.append(seconds)
+
+    def set_counters(self, counters):
+        """Records the latest values of some counters (a name -> number dict) for the overlay."""
+        self.counters.update(counters)
+
+    def lap(self, phase, start):
+        """Records the time since start for phase and returns now, to start the next phase."""
+        now = time.perf_counter()
+        self.record(phase, now - start)
+        return now
+
+    def stats(self, phase):
+        """Sample count, mean, p50/p95/p99 and max of a phase in ms, or None before any samples."""
+        samples = self.samples.get(phase)
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        return {
+            "count": len(ordered),
+            "mean_ms": sum(ordered) / len(ordered) * 1000.0,
+            "p50_ms": percentile(ordered, 50) * 1000.0,
+            "p95_ms": percentile(ordered, 95) * 1000.0,
+            "p99_ms": percentile(ordered, 99) * 1000.0,
+            "max_ms": ordered[-1] * 1000.0,
+        }
+
+    def summary(self):
+        """stats() of every phase that has samples, in frame order."""
+        result = {}
+        for phase in self.samples:
+            phase_stats = self.stats(phase)
+            if phase_stats is not None:
+                result[phase] = phase_stats
+        return result
+
+    def dump(self, path):
+        """Writes summary() as JSON, or as CSV if path ends with .csv."""
+        summary = self.summary()
+        try:
+            with open(path, 'w', newline='') as f:
+                if path.lower().endswith('.csv'):
+                    writer = csv.writer(f)
+                    writer.writerow(["phase", "count", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms"])
+                    for phase, phase_stats in summary.items():
+                        writer.writerow([phase, phase_stats["count"]] +
+                                        [f"{phase_stats[key]:.4f}" for key in ("mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms")])
+                else:
+                    json.dump(summary, f, indent=2)
+            print(f"Frame profile written to {path}")
+        except IOError as e:
+            print(f"Error writing frame profile to {path}: {e}")
+
+    def overlay_rect(self, surface):
+        """Screen area the overlay covers, or None when hidden or not rendered yet."""
+        if not self.show_overlay or not self.overlay_surfaces:
+            return None
+        width = max(line.get_width() for line in self.overlay_surfaces) + 8
+        height = sum(line.get_height() for line in self.overlay_surfaces) + 8
+        return pygame.Rect(surface.get_width() - width, 0, width, height)
+
+    def draw_overlay(self, surface):
+        """Draws the percentile table in the top-right corner; returns the rect drawn, or None.
+
+        The text is re-rendered only every PROFILER_OVERLAY_REFRESH_FRAMES frames so the
+        overlay itself barely shows up in the numbers it reports.
+        """
+        if not self.show_overlay:
+            return None
+        self.frames_since_refresh -= 1
+        if self.frames_since_refresh <= 0 or not self.overlay_surfaces:
+            self.frames_since_refresh = config.PROFILER_OVERLAY_REFRESH_FRAMES
+            self._render_overlay()
+        rect = self.overlay_rect(surface)
+        surface.fill(config.PROFILER_OVERLAY_BG_COLOR, rect)
+        y = rect.y + 4
+        for line in self.overlay_surfaces:
+            surface.blit(line, (rect.x + 4, y))
+            y += line.get_height()
+        return rect
+
+    def _render_overlay(self):
+        if self.overlay_font is None: # Monospaced, so the columns line up
+            self.overlay_font = pygame.font.SysFont(config.PROFILER_OVERLAY_FONT, config.PROFILER_OVERLAY_FONT_SIZE)
+        lines = [f"{'phase':<16}{'p50':>7}{'p95':>7}{'p99':>7} ms"]
+        for phase, phase_stats in self.summary().items():
+            lines.append(f"{phase:<16}{phase_stats['p50_ms']:>7.2f}{phase_stats['p95_ms']:>7.2f}{phase_stats['p99_ms']:>7.2f}")
+        for name, value in self.counters.items():
+            lines.append(f"{name:<16}{value:>7}")
+        # Rendered directly rather than through text_cache: these strings change constantly
+        self.overlay_surfaces = [self.overlay_font.render(line, True, config.PROFILER_OVERLAY_TEXT_COLOR) for line in lines]
@@ -0,0 +1,111 @@
+# Dirty-rectangle rendering: redraw and present only the parts of the frame that changed.
+import pygame
+
+import config
+from src.text_cache import text_cache
+
+
+class DirtyRectRenderer:
+    """Keeps a pre-rendered static level layer and tracks what changed on top of it.
+
+    The background colour and platforms never move, so they are drawn once per
+    level into `background`. Each frame:
+      1. begin_frame() erases everything drawn over the layer last frame by
+         blitting the layer back over those areas.
+      2. The caller reports the bounds of everything it is about to draw with
+         track(), then prepare_text() erases the HUD lines that need redrawing.
+      3. The caller draws; HUD lines go through draw_text(), which only
+         re-renders text that changed or was drawn over.
+      4. end_frame() returns the areas to present with pygame.display.update(rects).
+    """
+    def __init__(self, surface, background_color=config.BLACK):
+        self.surface = surface
+        self.screen_rect = surface.get_rect()
+        self.background_color = background_color
+        self.background = None # Pre-rendered static layer for the current level
+        self.level_key = None # Whatever identifies the current level layout (Game.platform_grid)
+        self.offset = (0, 0) # Camera position the layer was rendered at
+        self.previous_rects = [] # Drawn over the layer last frame; erased at the start of this one
+        self.drawn_rects = []
+        self.dirty_rects = []
+        self.text_lines = {} # line key -> (text, color, rect on screen)
+        self.full_redraw = True
+
+    def has_level(self, level_key, offset=(0, 0)):
+        """True if the static layer is already rendered for this level and camera offset."""
+        return level_key is self.level_key and offset == self.offset and self.background is not None
+
+    def set_level(self, level_key, platforms, offset=(0, 0)):
+        """Pre-renders the static layer when the level changes, or when a scrolling level's camera moved.
+
+        platforms only needs to hold the ones on screen at offset (the camera position).
+        """
+        if self.has_level(level_key, offset):
+            return
+        self.level_key = level_key
+        self.offset = offset
+        if self.background is None: # Reused while a level scrolls
+            self.background = pygame.Surface(self.surface.get_size(), 0, self.surface) # Same pixel format as the screen
+        self.background.fill(self.background_color)
+        ox, oy = offset
+        self.background.blits([(platform.image, (platform.rect.x - ox, platform.rect.y - oy)) for platform in platforms],
+                              doreturn=False)
+        self.full_redraw = True
+
+    def invalidate(self):
+        """Forces the next frame to redraw and present everything (e.g. after another screen drew)."""
+        self.full_redraw = True
+
+    def begin_frame(self):
+        if self.full_redraw:
+            self.surface.blit(self.background, (0, 0))
+            self.text_lines.clear()
+            self.dirty_rects = [self.screen_rect]
+        else:
+            for rect in self.previous_rects:
+                self.surface.blit(self.background, rect, rect)
+            self.dirty_rects = list(self.previous_rects)
+        self.drawn_rects = []
+
+    def track(self, rect):
+        """Records an area drawn over the static layer this frame."""
+        rect = rect.clip(self.screen_rect)
+        if rect.width > 0 and rect.height > 0:
+            self.drawn_rects.append(rect)
+
+    def prepare_text(self, lines):
+        """Erases HUD lines that must be drawn again this frame.
+
+        lines maps line key -> (text, color). A line is redrawn if its text
+        changed, or if something was erased or tracked over it this frame;
+        lines no longer shown are just erased. Call this after tracking the
+        frame's drawings but before drawing them, so erasing old text can't
+        wipe anything drawn this frame (text is blended, so it can't simply be
+        drawn again on top of itself).
+        """
+        for key, (text, color, rect) in list(self.text_lines.items()):
+            if (lines.get(key) != (text, color) or rect.collidelist(self.dirty_rects) != -1
+                    or rect.collidelist(self.drawn_rects) != -1):
+                self.surface.blit(self.background, rect, rect)
+                self.dirty_rects.append(rect)
+                del self.text_lines[key]
+
+    def draw_text(self, key, text, x, y, color, font):
+        """Draws a HUD line (positioned like Game.draw_text) unless it is still intact on screen."""
+        if key in self.text_lines:
+            return
+        text_surface = text_cache.render(font, text, color)
+        rect = text_surface.get_rect()
+        rect.midtop = (x, y)
+        self.surface.blit(text_surface, rect)
+        rect = rect.clip(self.screen_rect)
+        self.text_lines[key] = (text, color, rect)
+        self.dirty_rects.append(rect) # Stays on screen until prepare_text erases it, so not tracked
+
+    def end_frame(self):
+        """Returns the rects to present; tracked drawings are erased again next frame."""
+        self.previous_rects = self.drawn_rects
+        if self.full_redraw:
+            self.full_redraw = False
+            return [self.screen_rect]
+        return self.dirty_rects + self.drawn_rects
@@ -0,0 +1,249 @@
+# On-disk formats of game saves: compact binary (the default) and JSON.
+#
+# A binary save starts with a fixed-size header: magic bytes, schema version, a
+# little metadata for save menus (when it was saved, level, player level and
+# health), and the payload's length and CRC32. read_header() needs only those
+# bytes, so listing saves doesn't decode any of them, and deserialize() checks the
+# length and checksum before decoding anything (CorruptSaveError). The payload is
+# length-prefixed sections:
+#   - the item table: every distinct item's data once, as a JSON array
+#   - packed inventories: per inventory slot list, struct-packed arrays of
+#     item-table indices and quantities
+#   - the rest of the save dict as JSON, with each inventory slot list
+#     ([{"item_data": {...}, "quantity": n}, ...]) replaced by {"$inventory": block}
+# So a thousand stacks of one item carry its description once instead of a
+# thousand times, and the slots cost 8 bytes each. The small JSON sections go
+# through the C json codec, which decodes them faster than a pure-Python tag decoder.
+#
+# deserialize() detects the format from the first bytes, so JSON saves, including
+# those from before saves were versioned, keep loading. Saves older than
+# SAVE_VERSION are brought up to date by the registered migrations, one version at a time.
+import json
+import struct
+import time
+import zlib
+
+SAVE_VERSION = 2 # Schema version written into new saves
+BINARY_MAGIC = b"LSAV"
+JSON = "json"
+BINARY = "binary"
+
+_HEADER = struct.Struct("<4sH") # magic, schema version: the start of every binary save
+# Version 2 on: magic, schema version, saved_at, current_level_index, player level,
+# player health, payload length, CRC32 of everything before it and of the payload
+_META_HEADER = struct.Struct("<4sHdiIdII")
+HEADER_SIZE = _META_HEADER.size
+_COUNT = struct.Struct("<I")
+_QUANTITY_MAX = 2 ** 32 - 1
+_INVENTORY_KEY = "$inventory" # Stands in for an inventory slot list in the JSON section
+
+
+# --- Migrations ---
+MIGRATIONS = {} # from_version -> function(data) returning the data at from_version + 1
+
+def register_migration(from_version):
+    """Decorator registering the upgrade of save data from from_version to from_version + 1."""
+    def register(function):
+        MIGRATIONS[from_version] = function
+        return function
+    return register
+
+def migrate(data, version):
+    """Upgrades save data written at schema `version` to SAVE_VERSION."""
+    if version > SAVE_VERSION:
+        raise ValueError(f"save schema version {version} is newer than this game's ({SAVE_VERSION})")
+    while version < SAVE_VERSION:
+        migration = MIGRATIONS.get(version)
+        if migration is None:
+            raise ValueError(f"no migration from save schema version {version}")
+        data = migration(data)
+        version += 1
+    return data
+
+@register_migration(0)
+def _unversioned_json(data):
+    """JSON saves from before versioning: same layout, just no version stamp."""
+    return data
+
+@register_migration(1)
+def _headerless_binary(data):
+    """Version 1 binary saves had no metadata header; decode_binary reads both, the data is the same."""
+    return data
+
+
+class CorruptSaveError(ValueError):
+    """A save whose length or checksum doesn't match its header."""
+
+
+def save_metadata(data, saved_at=None):
+    """What a save menu shows about a save: {"saved_at", "current_level_index", "player_level", "health"}."""
+    player_data = data.get("player_data") or {}
+    return {
+        "saved_at": time.time() if saved_at is None else saved_at,
+        "current_level_index": data.get("current_level_index", 0),
+        "player_level": player_data.get("level", 1),
+        "health": player_data.get("health", 0),
+    }
+
+def header_checksum(head):
+    """The checksum a version 2+ header records for its save (not verified here; deserialize() does that)."""
+    return _META_HEADER.unpack_from(head, 0)[-1]
+
+def read_header(head):
+    """Metadata from the first HEADER_SIZE bytes of a binary save, or None if they aren't a version 2+ header."""
+    if len(head) < HEADER_SIZE or head[:len(BINARY_MAGIC)] != BINARY_MAGIC:
+        return None
+    _, version, saved_at, level_index, player_level, health, _, _ = _META_HEADER.unpack_from(head, 0)
+    if version < 2:
+        return None
+    return {"saved_at": saved_at, "current_level_index": level_index, "player_level": player_level,
+            "health": health, "save_version": version}
+
+
+# --- Reading and writing ---
+def serialize(data, save_format=BINARY):
+    """Save data as bytes in the given format, stamped with SAVE_VERSION."""
+    if save_format == JSON:
+        stamped = dict(data)
+        stamped["save_version"] = SAVE_VERSION
+        return json.dumps(stamped, separators=(",", ":")).encode("utf-8")
+    if save_format == BINARY:
+        return encode_binary(data)
+    raise ValueError(f"Unknown save format {save_format!r}")
+
+def detect_format(raw):
+    return BINARY if raw[:len(BINARY_MAGIC)] == BINARY_MAGIC else JSON
+
+def deserialize(raw):
+    """Save data from bytes in either format, migrated to SAVE_VERSION.
+
+    Raises ValueError (json.JSONDecodeError and CorruptSaveError are ones) or
+    struct.error for a damaged save.
+    """
+    if detect_format(raw) == BINARY:
+        version, data = decode_binary(raw)
+    else:
+        data = json.loads(raw)
+        if not isinstance(data, dict):
+            raise ValueError("save data is not a JSON object")
+        version = data.pop("save_version", 0)
+    return migrate(data, version)
+
+
+# --- Binary encoding ---
+def encode_binary(data):
+    table = {} # Item data, as (keys, values) -> index in the item table
+    table_items = []
+    blocks = []
+    document = _extract_inventories(data, table, table_items, blocks)
+
+    out = bytearray(HEADER_SIZE)
+    _append_section(out, json.dumps(table_items, separators=(",", ":")).encode("utf-8"))
+    out += _COUNT.pack(len(blocks))
+    for indices, quantities in blocks:
+        packed = struct.Struct(f"<{len(indices)}I")
+        out += _COUNT.pack(len(indices))
+        out += packed.pack(*indices)
+        out += packed.pack(*quantities)
+    _append_section(out, json.dumps(document, separators=(",", ":")).encode("utf-8"))
+
+    meta = save_metadata(data)
+    payload = memoryview(out)[HEADER_SIZE:]
+    header = _META_HEADER.pack(BINARY_MAGIC, SAVE_VERSION, meta["saved_at"], int(meta["current_level_index"]),
+                               int(meta["player_level"]), float(meta["health"]), len(payload), 0)
+    checksum = zlib.crc32(payload, zlib.crc32(header[:-4]))
+    out[:HEADER_SIZE] = header[:-4] + struct.pack("<I", checksum)
+    return bytes(out)
+
+def decode_binary(raw):
+    """(schema version, data) of a binary save."""
+    magic, version = _HEADER.unpack_from(raw, 0)
+    if magic != BINARY_MAGIC:
+        raise ValueError("not a binary save")
+    view = memoryview(raw)
+    offset = _check_header(view, version) if version >= 2 else _HEADER.size
+    section, offset = _read_section(view, offset)
+    table_items = json.loads(section)
+
+    block_count = _COUNT.unpack_from(view, offset)[0]
+    offset += _COUNT.size
+    inventories = []
+    for _ in range(block_count):
+        slot_count = _COUNT.unpack_from(view, offset)[0]
+        offset += _COUNT.size
+        packed = struct.Struct(f"<{slot_count}I")
+        indices = packed.unpack_from(view, offset)
+        quantities = packed.unpack_from(view, offset + packed.size)
+        offset += 2 * packed.size
+        # Slots of the same item share one item_data dict (don't modify it)
+        inventories.append([{"item_data": table_items[index], "quantity": quantity}
+                            for index, quantity in zip(indices, quantities)])
+
+    section, offset = _read_section(view, offset)
+    if offset != len(raw):
+        raise ValueError(f"{len(raw) - offset} unexpected bytes after the save data")
+
+    def restore_inventory(obj):
+        if len(obj) == 1 and _INVENTORY_KEY in obj:
+            return inventories[obj[_INVENTORY_KEY]]
+        return obj
+    return version, json.loads(section, object_hook=restore_inventory)
+
+def _check_header(view, version):
+    """Offset of the payload, once its length and checksum match the header."""
+    if len(view) < HEADER_SIZE:
+        raise CorruptSaveError("save header is truncated")
+    length, checksum = _META_HEADER.unpack_from(view, 0)[-2:]
+    if len(view) - HEADER_SIZE != length:
+        raise CorruptSaveError(f"save payload is {len(view) - HEADER_SIZE} bytes, its header says {length}")
+    if zlib.crc32(view[HEADER_SIZE:], zlib.crc32(view[:HEADER_SIZE - 4])) != checksum:
+        raise CorruptSaveError("save checksum doesn't match; the file is damaged")
+    return HEADER_SIZE
+
+def _append_section(out, payload):
+    out += _COUNT.pack(len(payload))
+    out += payload
+
+def _read_section(view, offset):
+    length = _COUNT.unpack_from(view, offset)[0]
+    offset += _COUNT.size
+    if offset + length > len(view):
+        raise ValueError("save data is truncated")
+    return str(view[offset:offset + length], "utf-8"), offset + length
+
+def _is_inventory(value):
+    """True for a non-empty list of inventory slot dicts that fits the packed layout."""
+    if not value:
+        return False
+    for slot in value:
+        if type(slot) is not dict or len(slot) != 2 or type(slot.get("item_data")) is not dict:
+            return False
+        quantity = slot.get("quantity")
+        if type(quantity) is not int or not 0 <= quantity <= _QUANTITY_MAX:
+            return False
+    return True
+
+def _extract_inventories(value, table, table_items, blocks):
+    """A copy of value whose inventory slot lists are moved into blocks and the item table."""
+    kind = type(value)
+    if kind is dict:
+        return {key: _extract_inventories(item, table, table_items, blocks) for key, item in value.items()}
+    if kind is list or kind is tuple:
+        if not _is_inventory(value):
+            return [_extract_inventories(item, table, table_items, blocks) for item in value]
+        indices = []
+        for slot in value:
+            item_data = slot["item_data"]
+            try: # Item.to_dict() always lists its keys in the same order, so no sorting needed
+                key = (tuple(item_data), tuple(item_data.values()))
+                index = table.get(key)
+            except TypeError: # Unhashable values: no sharing, but still saved
+                key = id(item_data)
+                index = None
+            if index is None:
+                index = table[key] = len(table_items)
+                table_items.append(item_data)
+            indices.append(index)
+        blocks.append((indices, [slot["quantity"] for slot in value]))
+        return {_INVENTORY_KEY: len(blocks) - 1}
+    return value
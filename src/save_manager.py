@@ -1,46 +1,390 @@
+# Game saves: crash-safe writes on a background thread, in named slots.
+#
+# A save is written to a temporary file next to the target, fsynced and then renamed
+# over the old save (os.replace is atomic), so a crash mid-save leaves the previous
+# save intact instead of a half-written file. save_data_async() hands serializing and
+# writing to one background worker: the frame that asks for a save only pays for
+# building the snapshot (Game.snapshot_game_state), and saves are written in the
+# order they were requested.
+#
+# Saves are written in the compact binary format unless the file name ends in .json
+# (see src/save_format.py); loading detects the format, so either kind of file loads.
+# read_metadata() and list_saves() only read the fixed-size header of binary saves
+# (and of their journals), so a save menu can describe every slot without decoding
+# or checksumming any of them; a damaged save is caught when it's loaded.
+#
+# A slot can also have a journal (<save file>.journal, JSON Lines) of changes made
+# after its snapshot, appended by autosaves (src/autosave.py). Its first line, padded
+# to JOURNAL_HEADER_SIZE bytes, names the snapshot it belongs to (its journal_id, and
+# for binary saves the header's checksum) and holds the level, player level and
+# health as of the last record, rewritten in place when a record changes them.
+# load_data() replays the records onto that snapshot.
 import json
 import os
+import re
+import struct
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from src.save_format import serialize, deserialize, read_header, header_checksum, save_metadata, CorruptSaveError, JSON, BINARY, HEADER_SIZE
+
+_SLOT_NAME = re.compile(r"^[A-Za-z0-9_-]+$") # Slot names become part of a file name
+JOURNAL_EXTENSION = ".journal"
+JOURNAL_HEADER_SIZE = 256 # Bytes of a journal's first line, newline included
+# Journal paths of the values a binary save's header holds -> their save_metadata keys
+_HEADER_PATHS = {"current_level_index": "current_level_index", "player_data.level": "player_level",
+                 "player_data.health": "health"}
+
+def apply_journal_record(data, record):
+    """Applies one journal record to save data, in place.
+
+    record["set"] maps dotted paths (e.g. "player_data.health") to new values;
+    record["lists"] maps dotted paths of lists to [new length, {position: value}].
+    """
+    for path, value in record.get("set", {}).items():
+        target, key = _walk_path(data, path)
+        target[key] = value
+    for path, (length, values) in record.get("lists", {}).items():
+        target, key = _walk_path(data, path)
+        items = target.get(key)
+        if items is None:
+            items = target[key] = []
+        del items[length:]
+        items.extend([None] * (length - len(items)))
+        for position, value in values.items():
+            items[int(position)] = value
+
+def _walk_path(data, path):
+    """(dict holding the last key of a dotted path, that key); creates missing dicts on the way."""
+    keys = path.split(".")
+    target = data
+    for key in keys[:-1]:
+        target = target.setdefault(key, {})
+    return target, keys[-1]
+
+def _journal_header_line(header):
+    """A journal's first line, padded to JOURNAL_HEADER_SIZE bytes so it can be rewritten in place."""
+    line = json.dumps(header, separators=(",", ":"))
+    return (line.ljust(JOURNAL_HEADER_SIZE - 1) + "\n").encode("utf-8")
+
+def _parse_journal_header(line):
+    """A journal's header dict; {} if the line isn't one (e.g. cut short by a crash)."""
+    try:
+        header = json.loads(line)
+    except ValueError:
+        return {}
+    return header if isinstance(header, dict) else {}
 
 class SaveManager:
-    def __init__(self, save_filename="savegame.json"):
-        self.save_filename = save_filename
+    def __init__(self, save_filename="savegame.sav", save_format=None):
+        self.save_filename = save_filename # The default slot; named slots are saved next to it
+        if save_format is None:
+            save_format = JSON if save_filename.lower().endswith(".json") else BINARY
+        self.save_format = save_format
+        self._worker = None # Started by the first save_data_async()
+        self._last_save = None # Future of the most recently queued save
+
+    def slot_path(self, slot=None):
+        """File of a save slot: save_filename for the default slot (None), else e.g. savegame_<slot>.sav."""
+        if slot is None:
+            return self.save_filename
+        if not _SLOT_NAME.match(slot):
+            raise ValueError(f"Invalid save slot name {slot!r}: use letters, digits, '-' and '_'")
+        root, extension = os.path.splitext(self.save_filename)
+        return f"{root}_{slot}{extension}"
+
+    def find_save(self, slot=None):
+        """Path of the slot's save file, or None if it has none.
+
+        A slot without a save of its own still loads a JSON save of the same name
+        from before saves were binary (savegame.json for savegame.sav); the next save
+        writes the new file.
+        """
+        path = self.slot_path(slot)
+        if os.path.exists(path):
+            return path
+        root, extension = os.path.splitext(path)
+        if extension.lower() != ".json" and os.path.exists(root + ".json"):
+            return root + ".json"
+        return None
+
+    def list_slots(self):
+        """Names of the named slots that have a save (the default slot isn't included)."""
+        directory = os.path.dirname(self.save_filename) or "."
+        root, extension = os.path.splitext(os.path.basename(self.save_filename))
+        prefix = root + "_"
+        try:
+            names = os.listdir(directory)
+        except OSError:
+            return []
+        slots = set()
+        for name in names:
+            name_root, name_extension = os.path.splitext(name)
+            if name.startswith(prefix) and name_extension in (extension, ".json"):
+                slot = name_root[len(prefix):]
+                if _SLOT_NAME.match(slot):
+                    slots.add(slot)
+        return sorted(slots)
+
+    def has_save(self, slot=None):
+        return self.find_save(slot) is not None
 
-    def save_data(self, data):
+    def read_metadata(self, slot=None):
+        """The slot's save metadata (see save_format.save_metadata), or None if it has no readable save.
+
+        Binary saves only have their header read, and their journal's header line:
+        the save's header describes the last full snapshot, the journal's holds the
+        level, player level and health its records set since (as loading would
+        replay them), and saved_at is when the journal was last appended to. The
+        checksum isn't verified here; a damaged save fails to load. JSON saves have
+        no header and are loaded in full.
+        """
+        path = self.find_save(slot)
+        if path is None:
+            return None
         try:
-            with open(self.save_filename, 'w') as f:
-                json.dump(data, f, indent=4)
+            with open(path, 'rb') as f:
+                head = f.read(HEADER_SIZE)
+            metadata = read_header(head)
+            if metadata is None: # JSON or a version 1 binary save
+                data = self.load_data(slot)
+                return save_metadata(data, os.path.getmtime(path)) if data is not None else None
+            journal = path + JOURNAL_EXTENSION
+            if os.path.exists(journal):
+                metadata["saved_at"] = max(metadata["saved_at"], os.path.getmtime(journal))
+                with open(journal, 'rb') as f:
+                    header = _parse_journal_header(f.readline(JOURNAL_HEADER_SIZE))
+                if header.get("snapshot_checksum") == header_checksum(head): # Else it's stale, as load_data() would find
+                    metadata.update(header.get("metadata", {}))
+            return metadata
+        except (IOError, OSError) as e:
+            print(f"Error reading save header from {path}: {e}")
+            return None
+
+    def list_saves(self):
+        """[(slot, metadata)] of every slot with a readable save, the default slot (None) first."""
+        saves = []
+        for slot in [None] + self.list_slots():
+            metadata = self.read_metadata(slot)
+            if metadata is not None:
+                saves.append((slot, metadata))
+        return saves
+
+    def save_data(self, data, slot=None):
+        """Writes data to a slot right away, atomically. Returns True on success."""
+        return self._write(self.slot_path(slot), data)
+
+    def journal_path(self, slot=None):
+        return self.slot_path(slot) + JOURNAL_EXTENSION
+
+    def save_snapshot_async(self, data, journal_id, slot=None, callback=None):
+        """save_data_async() for a snapshot that starts a new journal named journal_id.
+
+        data["journal_id"] must be journal_id. The old journal is replaced only once
+        the snapshot is on disk; until then it still names the old snapshot.
+        """
+        return self._submit(self.slot_path(slot), callback, self._write_snapshot, data, journal_id)
+
+    def append_journal_async(self, record, journal_id, slot=None, callback=None):
+        """Queues a record (see apply_journal_record) to be appended to the slot's journal; returns a Future.
+
+        The record is only appended if the journal is journal_id's, the snapshot it
+        was computed against; if that snapshot failed to write, the future's result
+        is False and nothing is appended.
+        """
+        return self._submit(self.slot_path(slot), callback, self._append_journal, record, journal_id)
+
+    def save_data_async(self, data, slot=None, callback=None):
+        """Queues data to be written to a slot on the background worker; returns a Future.
+
+        The future's result is True once the save is on disk, False if it failed.
+        data is serialized later, on the worker, so it must be a snapshot that
+        nothing modifies afterwards. callback(success, path) is called when the save
+        finishes, on the worker thread.
+        """
+        return self._submit(self.slot_path(slot), callback, self._write, data)
+
+    def _submit(self, path, callback, write, *args):
+        """Queues write(path, *args) on the worker; callback(success, path) runs when it's done."""
+        if self._worker is None:
+            self._worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="save-writer") # One worker keeps saves in order
+        future = self._worker.submit(write, path, *args)
+        if callback is not None:
+            future.add_done_callback(lambda done: callback(done.result(), path))
+        self._last_save = future
+        return future
+
+    def wait(self):
+        """Blocks until every queued save has been written."""
+        if self._last_save is not None:
+            self._last_save.result()
+
+    def close(self):
+        """Writes the queued saves and stops the worker (a later save_data_async() starts a new one)."""
+        if self._worker is not None:
+            self._worker.shutdown(wait=True)
+            self._worker = None
+
+    def _write(self, path, data):
+        payload = self._serialize(data)
+        return payload is not None and self._write_bytes(path, payload)
+
+    def _serialize(self, data):
+        try:
+            return serialize(data, self.save_format)
+        except Exception as e:
+            print(f"An unexpected error occurred while saving data: {e}")
+            return None
+
+    def _write_snapshot(self, path, data, journal_id):
+        payload = self._serialize(data)
+        if payload is None or not self._write_bytes(path, payload):
+            return False
+        metadata = save_metadata(data)
+        header = {"journal_id": journal_id, "metadata": {key: metadata[key] for key in _HEADER_PATHS.values()}}
+        if self.save_format == BINARY:
+            # The journal_id is inside the payload; read_metadata() matches the header's checksum instead
+            header["snapshot_checksum"] = header_checksum(payload)
+        return self._write_bytes(path + JOURNAL_EXTENSION, _journal_header_line(header))
+
+    def _append_journal(self, path, record, journal_id):
+        journal = path + JOURNAL_EXTENSION
+        try:
+            with open(journal, 'r+b') as f:
+                head = f.readline(JOURNAL_HEADER_SIZE)
+                header = _parse_journal_header(head)
+                if header.get("journal_id") != journal_id:
+                    print(f"Error appending to save journal {journal}: it belongs to another snapshot")
+                    return False
+                f.seek(0, os.SEEK_END)
+                f.write((json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8"))
+                f.flush()
+                os.fsync(f.fileno())
+                # The record is on disk first: a crash in between only leaves the menu's metadata behind
+                values = record.get("set", {})
+                if "metadata" in header and any(field in values for field in _HEADER_PATHS):
+                    for field, key in _HEADER_PATHS.items():
+                        if field in values:
+                            header["metadata"][key] = values[field]
+                    line = _journal_header_line(header)
+                    if len(line) == len(head) == JOURNAL_HEADER_SIZE: # Rewritten in place
+                        f.seek(0)
+                        f.write(line)
+                        f.flush()
+                        os.fsync(f.fileno())
             return True
-        except IOError as e:
-            print(f"Error saving game data to {self.save_filename}: {e}")
+        except (IOError, OSError) as e:
+            print(f"Error appending to save journal {journal}: {e}")
+            return False
+
+    def _write_bytes(self, path, payload):
+        """Atomically replaces path with payload: temp file, fsync, rename."""
+        temp_path = None
+        try:
+            directory = os.path.dirname(path) or "."
+            fd, temp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=directory)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno()) # On disk before it replaces the old save
+            os.replace(temp_path, path)
+            temp_path = None
+            self._sync_directory(directory)
+            return True
+        except (IOError, OSError) as e:
+            print(f"Error saving game data to {path}: {e}")
             return False
         except Exception as e:
             print(f"An unexpected error occurred while saving data: {e}")
             return False
+        finally:
+            if temp_path is not None and os.path.exists(temp_path):
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+
+    @staticmethod
+    def _sync_directory(directory):
+        """Makes the rename itself durable where the OS allows it (not on Windows)."""
+        try:
+            fd = os.open(directory, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
 
-    def load_data(self):
-        if not os.path.exists(self.save_filename):
+    def load_data(self, slot=None):
+        """The slot's save data in either format, migrated to the current schema, or None."""
+        self.wait() # A save still being written is what the caller expects to load
+        path = self.find_save(slot)
+        if path is None:
             return None
         try:
-            with open(self.save_filename, 'r') as f:
-                data = json.load(f)
+            with open(path, 'rb') as f:
+                data = deserialize(f.read())
+            if isinstance(data.get("journal_id"), str):
+                self._replay_journal(path + JOURNAL_EXTENSION, data)
             return data
         except IOError as e:
-            print(f"Error loading game data from {self.save_filename}: {e}")
+            print(f"Error loading game data from {path}: {e}")
+            return None
+        except CorruptSaveError as e: # Caught by the header check, before anything was decoded
+            print(f"Save file {path} is damaged: {e}")
             return None
-        except json.JSONDecodeError as e:
-            print(f"Error decoding JSON from {self.save_filename}: {e}")
+        except (ValueError, struct.error, IndexError) as e: # Damaged, truncated or too new
+            print(f"Error decoding save data from {path}: {e}")
             return None
         except Exception as e:
             print(f"An unexpected error occurred while loading data: {e}")
             return None
 
-    def delete_save(self):
-        if os.path.exists(self.save_filename):
+    def _replay_journal(self, journal, data):
+        """Applies the journal's records to its snapshot's data (a journal naming another snapshot is stale)."""
+        journal_id = data.pop("journal_id")
+        header, records = self._read_journal(journal)
+        if header.get("journal_id") != journal_id:
+            return
+        for record in records:
+            apply_journal_record(data, record)
+
+    def _read_journal(self, journal):
+        """(header, records) of a journal; ({}, []) if there is none.
+
+        A record cut short by a crash ends the journal: everything before it still applies.
+        """
+        if not os.path.exists(journal):
+            return {}, []
+        with open(journal, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        header = _parse_journal_header(lines[0]) if lines else {}
+        records = []
+        for number, line in enumerate(lines[1:], start=2):
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                print(f"Warning: Save journal {journal} ends in a damaged record (line {number}); ignoring it.")
+                break
+        return header, records
+
+    def delete_save(self, slot=None):
+        self.wait()
+        path = self.find_save(slot)
+        if path is not None:
+            if os.path.exists(path + JOURNAL_EXTENSION):
+                try:
+                    os.remove(path + JOURNAL_EXTENSION)
+                except OSError as e:
+                    print(f"Error deleting save journal {path + JOURNAL_EXTENSION}: {e}")
             try:
-                os.remove(self.save_filename)
+                os.remove(path)
                 return True
             except OSError as e:
-                print(f"Error deleting save file {self.save_filename}: {e}")
+                print(f"Error deleting save file {path}: {e}")
                 return False
         else:
             return False
@@ -8,9 +8,15 @@ import config # Import config
 from src.ui_elements import Button
 import os
 import math
-import random # Added for loot drop chance
+import time
 
-from src.items import create_item_from_dict # For creating item instances from drops
+from src.spatial import MonsterIndex
+from src.levels import level_count
+from src.monster_batch import MonsterBatch
+from src.renderer import DirtyRectRenderer
+from src.simulation_lod import MonsterLOD, UPDATE, FALL
+from src.sprite_atlas import to_pixels
+from src import event_log
 
 # Note: The BaseScreen in the provided code uses game_manager for screen, fonts, colors.
 # This refactoring will assume game_manager provides these, initialized from config.
@@ -48,10 +54,17 @@ class MainMenuScreen(BaseScreen):
         button_height = config.UI_BUTTON_HEIGHT
         spacing = config.UI_BUTTON_PADDING
         
-        num_buttons = 2
-        # Check for save file using game_manager's save_manager and config filename
-        if self.game_manager.save_manager and os.path.exists(config.SAVE_GAME_FILENAME):
-            num_buttons = 3
+        # (label, slot) of the saves to offer: the autosave, then the default slot's save.
+        # Only their headers are read, for the labels; a damaged save fails to load
+        save_manager = self.game_manager.save_manager
+        offered = [("Continue", config.AUTOSAVE_SLOT)] if config.AUTOSAVE_SLOT is not None else []
+        offered.append(("Load Game", None))
+        saves = []
+        for label, slot in offered if save_manager else []:
+            save_info = save_manager.read_metadata(slot)
+            if save_info is not None:
+                saves.append((f"{label} (Level {save_info['current_level_index'] + 1})", slot))
+        num_buttons = 2 + len(saves)
         
         total_button_height = (button_height * num_buttons) + (spacing * (num_buttons - 1))
         start_y = self.screen.get_height() // 2 - total_button_height // 2
@@ -71,16 +84,17 @@ class MainMenuScreen(BaseScreen):
         ))
         current_y += button_height + spacing
 
-        if self.game_manager.save_manager and os.path.exists(config.SAVE_GAME_FILENAME):
+        for text, slot in saves:
             self.buttons.append(Button(
-                text="Load Game",
+                text=text,
                 rect=pygame.Rect(self.screen.get_width() // 2 - button_width // 2, current_y, button_width, button_height),
                 font=self.ui_font,
                 text_color=config.UI_BUTTON_TEXT_COLOR,
                 button_color=config.UI_BUTTON_COLOR, # Could vary this for different buttons
                 hover_color=config.UI_BUTTON_HOVER_COLOR,
                 sound_manager=self.sound_manager,
-                action=self.game_manager.load_saved_game
+                action=self.game_manager.load_saved_game,
+                action_args=[slot]
             ))
             current_y += button_height + spacing
 
@@ -122,6 +136,16 @@ class MainMenuScreen(BaseScreen):
         for button in self.buttons:
             button.draw(self.screen)
 
+        if self.game_manager.menu_message:
+            self.game_manager.draw_text(
+                self.screen, self.game_manager.menu_message,
+                config.UI_FONT_SIZE,
+                self.screen.get_width() // 2,
+                self.screen.get_height() - config.UI_BUTTON_HEIGHT,
+                color=config.RED,
+                font_object=self.ui_font
+            )
+
 class PauseScreen(BaseScreen):
     def __init__(self, screen_surface, game_manager, font_object): # Matching Game's instantiation
         super().__init__(game_manager)
@@ -202,6 +226,12 @@ class GameplayScreen(BaseScreen):
         self.player = player # game_manager.player
         self.monsters_list = monsters # game_manager.monsters_list
         self.platforms_list = platforms # game_manager.platforms_list
+        # Broad phase for combat queries; refreshed lazily after monsters move
+        self.monster_index = MonsterIndex(self.monsters_list)
+        self.monster_batch = self._make_monster_batch() # None when monsters update one object at a time
+        self.monster_lod = MonsterLOD() # Simulation tiers; monster_lod.counts has the last tick's tier sizes
+        self.previous_positions = {} # entity -> rect.topleft before the last tick, for interpolated drawing
+        self.renderer = DirtyRectRenderer(self.screen) # Used by draw_dirty()
         # self.ui_font is from BaseScreen (game_manager.ui_font)
         
         # Colors are accessed via config directly or through game_manager.colors if dynamic
@@ -228,7 +258,7 @@ class GameplayScreen(BaseScreen):
                 if self.player.sound_manager:
                     self.player.sound_manager.play_sound(config.SOUND_PLAYER_JUMP) # Use config key
             if event.key == pygame.K_LSHIFT or event.key == pygame.K_RSHIFT: # Example attack key
-                self.player.attempt_attack(self.monsters_list)
+                self.player.attempt_attack(self.monsters_list, self.monster_index)
 
 
         keys = pygame.key.get_pressed()
@@ -239,76 +269,169 @@ class GameplayScreen(BaseScreen):
             player_dx += self.player.speed
         
         # Player.move now handles horizontal platform collision
-        self.player.move(player_dx, 0, self.platforms_list)
+        self.player.move(player_dx, 0, self.game_manager.platform_grid)
+
 
+    def _make_monster_batch(self):
+        """A MonsterBatch for the current monsters if batching is enabled and pays off, else None."""
+        if (config.USE_BATCHED_MONSTERS and len(self.monsters_list) >= config.MONSTER_BATCH_MIN_COUNT
+                and MonsterBatch.can_batch(self.monsters_list)):
+            return MonsterBatch(self.monsters_list)
+        return None
+
+    def sync_monsters(self):
+        """Copies batched monster state back onto the monster objects (before this screen is dropped)."""
+        if self.monster_batch is not None:
+            self.monster_batch.write_back()
 
     def update_monsters(self, dt):
         """Handles monster updates, death, and XP/drop mechanics."""
-        for monster in list(self.monsters_list): # Iterate on a copy if modifying list
-            if monster.health <= 0:
-                # Award XP
-                self.player.gain_xp(config.XP_PER_MONSTER_DEFEAT) # Use config
-                
-                # Handle drops
-                if monster.possible_drops:
-                    for drop_info in monster.possible_drops:
-                        if random.random() < drop_info["chance"]:
-                            item_id = drop_info["item_id"]
-                            quantity = drop_info.get("quantity", 1) # Default to 1 if not specified
-                            
-                            base_item_config = config.GENERIC_ITEM_DEFAULTS.get(item_id)
-                            if not base_item_config:
-                                print(f"Warning: Item ID '{item_id}' not found in GENERIC_ITEM_DEFAULTS.")
-                                continue
-
-                            # Determine the class name for item creation
-                            # This could be stored in GENERIC_ITEM_DEFAULTS or inferred
-                            item_class_name = "Item" # Default to base Item class
-                            if item_id == "HealthPotion": # Specific case
-                                item_class_name = "HealthPotion"
-                            # Add more specific items here if they have their own classes
-                            # Or, better: add "item_class_name" to GENERIC_ITEM_DEFAULTS entries
-
-                            item_data_for_creation = base_item_config.copy()
-                            item_data_for_creation["item_class_name"] = item_class_name 
-                            # name, description, value etc. are already in item_data_for_creation
-
-                            new_item_instance = create_item_from_dict(item_data_for_creation)
-                            
-                            if new_item_instance:
-                                # The add_item method in InventoryManager handles stacking.
-                                # It needs the item instance and the quantity to add.
-                                self.player.inventory.add_item(new_item_instance, quantity)
-                                print(f"Player obtained {quantity}x {new_item_instance.name}!")
-                                if self.sound_manager:
-                                    self.sound_manager.play_sound(config.SOUND_ITEM_PICKUP)
-                            else:
-                                print(f"Warning: Could not create item instance for {item_id}.")
-                
-                self.monsters_list.remove(monster)
-                if self.sound_manager:
-                    self.sound_manager.play_sound(config.SOUND_MONSTER_DEATH) # Use config key
-                print(f"Monster (ID: {id(monster)}) removed.")
-            else:
-                monster.update(self.platforms_list, self.player)
-
+        # Far-off monsters in a scrolling level update less often, or not at all (src/simulation_lod.py)
+        camera = self.game_manager.camera
+        lod = self.monster_lod
+        lod.begin_tick(camera.view_at(self.player.rect.centerx, self.player.rect.centery) if camera.scrolls else None)
+        if self.monster_batch is not None: # Same results, one vectorized pass over all monsters
+            self.monster_batch.update(self.game_manager.platform_grid, self.player,
+                                      time_ticks=self.game_manager.sim_time_ms, on_defeated=self.defeat_monster, lod=lod)
+        else:
+            for monster in list(self.monsters_list): # Iterate on a copy if modifying list
+                if monster.health <= 0:
+                    self.defeat_monster(monster)
+                else:
+                    step = lod.step(monster)
+                    if step == UPDATE:
+                        monster.update(self.game_manager.platform_grid, self.player, time_ticks=self.game_manager.sim_time_ms)
+                    elif step == FALL:
+                        monster.fall(self.game_manager.platform_grid)
+        self.monster_index.mark_dirty() # Monsters moved or died; re-sorted on the next combat query
+
+    def defeat_monster(self, monster):
+        """Awards XP and drops for a defeated monster and removes it from the level."""
+        # Award XP
+        self.player.gain_xp(config.XP_PER_MONSTER_DEFEAT) # Use config
+        
+        # Handle drops: the monster's compiled loot table gives shared items, ready to add
+        for item_id, item, quantity in monster.loot_table.roll():
+            self._award_drop(item_id, item, quantity, monster_id=id(monster))
+        
+        self._remove_defeated(monster)
+
+    def _award_drop(self, item_id, item, quantity, **fields):
+        # The add_item method in InventoryManager handles stacking.
+        self.player.inventory.add_item(item, quantity)
+        if event_log.enabled(event_log.LOOT, event_log.INFO):
+            event_log.log(event_log.LOOT, event_log.INFO, f"Player obtained {quantity}x {item.name}!",
+                          event="item_dropped", item_id=item_id, quantity=quantity, **fields)
+        if self.sound_manager:
+            self.sound_manager.play_sound(config.SOUND_ITEM_PICKUP)
+
+    def _remove_defeated(self, monster):
+        self.monsters_list.remove(monster)
+        if self.sound_manager:
+            self.sound_manager.play_sound(config.SOUND_MONSTER_DEATH) # Use config key
+        if event_log.enabled(event_log.COMBAT, event_log.DEBUG):
+            event_log.log(event_log.COMBAT, event_log.DEBUG, f"Monster (ID: {id(monster)}) removed.",
+                          event="monster_removed", monster_id=id(monster))
+
+
+    def _moving_entities(self):
+        """Everything that moves, in drawing order."""
+        entities = [self.player]
+        if self.player.pet:
+            entities.append(self.player.pet)
+        return entities + self.monsters_list
+
+    def _remember_positions(self):
+        """Positions before this tick, so draw() can blend from them to the new ones."""
+        self.previous_positions = {entity: entity.rect.topleft for entity in self._moving_entities()}
+
+    def _draw_position(self, entity):
+        """Where entity is drawn this frame: between its previous and current tick positions (Game.render_alpha)."""
+        current = entity.rect.topleft
+        previous = self.previous_positions.get(entity)
+        alpha = self.game_manager.render_alpha
+        if not config.INTERPOLATE_RENDERING or previous is None or alpha >= 1.0:
+            return current
+        dx, dy = current[0] - previous[0], current[1] - previous[1]
+        if (dx == 0 and dy == 0) or abs(dx) > config.INTERPOLATION_MAX_JUMP or abs(dy) > config.INTERPOLATION_MAX_JUMP:
+            return current
+        return (previous[0] + dx * alpha, previous[1] + dy * alpha)
+
+    def _drawn_entities(self):
+        """(entity, screen position) of everything drawn this frame, in drawing order."""
+        camera = self.game_manager.camera
+        return [(entity, to_pixels(camera.to_screen(self._draw_position(entity)))) for entity in self._visible_entities()]
+
+    def _blit_entities(self, drawn):
+        """Draws the entities' pre-rendered sprites (src/sprite_atlas.py) with one Surface.blits call."""
+        items = []
+        for entity, topleft in drawn:
+            items.extend(entity.sprite_items(topleft))
+        self.screen.blits(items, doreturn=False)
+
+    def _point_camera(self):
+        """Centers the camera on where the player is drawn this frame."""
+        x, y = self._draw_position(self.player)
+        self.game_manager.camera.look_at(x + self.player.rect.width / 2, y + self.player.rect.height / 2)
+
+    def _visible_platforms(self):
+        """Platforms intersecting the camera's view, in level order."""
+        camera = self.game_manager.camera
+        if not camera.scrolls:
+            return self.platforms_list
+        view = camera.view_rect
+        return [platform for platform in self.game_manager.platform_grid.query(view) if platform.rect.colliderect(view)]
+
+    def _visible_entities(self):
+        """_moving_entities() that may be on screen, in drawing order."""
+        camera = self.game_manager.camera
+        if not camera.scrolls:
+            return self._moving_entities()
+        entities = [self.player]
+        if self.player.pet:
+            entities.append(self.player.pet)
+        # Monsters are looked up at their tick positions, but drawn up to a blend step behind
+        margin = config.INTERPOLATION_MAX_JUMP if config.INTERPOLATE_RENDERING else 0
+        return entities + self.monster_index.query_rect(camera.view_rect.inflate(2 * margin, 2 * margin))
+
+    def _entity_bounds(self, entity, topleft):
+        """Screen area entity covers when drawn at topleft (including the player's attack swipe)."""
+        bounds = entity.rect.copy()
+        bounds.topleft = topleft
+        if entity is self.player and self.player.is_attacking:
+            dx, dy, width, height = self.player.attack_visual_layout()
+            bounds.union_ip((bounds.x + dx, bounds.y + dy, width, height))
+        return bounds
 
     def update(self, dt):
-        self.player.update(self.platforms_list, self.monsters_list) 
+        if config.INTERPOLATE_RENDERING and not self.game_manager.headless: # Nothing is drawn when headless
+            self._remember_positions()
+        self.game_manager.sim_time_ms += dt * 1000.0
+        platform_grid = self.game_manager.platform_grid # Rebuilt on level load, so read it every tick
+        profiler = self.game_manager.profiler # None unless profiling
+        if profiler: mark = time.perf_counter()
+        self.player.update(platform_grid, self.monsters_list) 
+        if profiler: mark = profiler.lap("player.update", mark)
         if self.player.pet:
-            self.player.pet.update(self.platforms_list, self.monsters_list, self.player)
+            self.player.pet.update(platform_grid, self.monsters_list, self.player, self.monster_index)
+            if profiler: mark = profiler.lap("pet.update", mark)
 
         self.update_monsters(dt) # Call new monster update method
+        if profiler:
+            profiler.lap("update_monsters", mark)
+            profiler.set_counters({f"monsters {tier}": count for tier, count in self.monster_lod.counts.items()})
         
         if not self.monsters_list and self.player.health > 0: # Check if all monsters are defeated
             print(f"Level {self.game_manager.current_level_index + 1} cleared!")
             self.game_manager.current_level_index += 1
-            if self.game_manager.current_level_index < len(config.LEVEL_CONFIGS):
+            if self.game_manager.current_level_index < level_count():
                 # Game manager should handle loading next level's assets and then
                 # potentially re-configuring this screen or transitioning.
                 # For now, let's assume Game.start_new_game or similar would be called by a higher logic
                 # or GameplayScreen tells Game to load next level.
                 self.game_manager.load_level_assets(self.game_manager.current_level_index)
+                self.monster_index.reset(self.monsters_list)
+                self.monster_batch = self._make_monster_batch()
                 # Player position might need resetting by game_manager or here
                 self.player.rect.topleft = (config.PLAYER_START_X, config.PLAYER_START_Y)
                 # If GameplayScreen needs to be "restarted" for the new level data:
@@ -322,36 +445,21 @@ class GameplayScreen(BaseScreen):
             print("Game Over! Player has been defeated.")
             self.game_manager.set_game_state(config.STATE_GAME_OVER) 
 
-    def draw(self):
-        self.screen.fill(config.BLACK) # Use config color
-        for plat in self.platforms_list: # Use the list passed in __init__
-            plat.draw(self.screen)
-        
-        self.player.draw(self.screen)
-        if self.player.pet:
-            self.player.pet.draw(self.screen)
-
-        for monster in self.monsters_list: # Use the list passed in __init__
-            monster.draw(self.screen) # Monster.draw now uses config.HIT_COLOR internally
-
-        # UI Text (Health, Level, XP, Inventory)
-        # game_manager.draw_text is static, can be called via self.game_manager
-        
+    def _hud_lines(self):
+        """HUD text as (text, x, y, color) lines: health, level, XP and inventory."""
+        lines = []
         # Health
         health_text = f"Health: {self.player.health}/{self.player.max_health}"
-        self.game_manager.draw_text(self.screen, health_text, config.UI_FONT_SIZE, 10, 10, 
-                                    color=config.WHITE, font_object=self.ui_font)
+        lines.append((health_text, 10, 10, config.WHITE))
 
         # Level
         level_text = f"Level: {self.player.level}"
-        self.game_manager.draw_text(self.screen, level_text, config.UI_FONT_SIZE, 10, 40, 
-                                    color=config.WHITE, font_object=self.ui_font)
+        lines.append((level_text, 10, 40, config.WHITE))
 
         # XP Display
         xp_text = f"XP: {self.player.experience_points} / {self.player.xp_to_next_level}"
         xp_text_y_position = 70 
-        self.game_manager.draw_text(self.screen, xp_text, config.UI_FONT_SIZE, 10, xp_text_y_position, 
-                                    color=config.WHITE, font_object=self.ui_font)
+        lines.append((xp_text, 10, xp_text_y_position, config.WHITE))
 
         # Inventory Display
         inventory_y_start = xp_text_y_position + 30 
@@ -360,14 +468,10 @@ class GameplayScreen(BaseScreen):
         if hasattr(self.player, 'inventory') and hasattr(self.player.inventory, 'get_all_items'):
             item_slots = self.player.inventory.get_all_items()
             
-            inventory_title_text = "Inventory:"
-            self.game_manager.draw_text(self.screen, inventory_title_text, config.UI_FONT_SIZE,
-                                        10, inventory_y_start, color=config.WHITE, font_object=self.ui_font)
+            lines.append(("Inventory:", 10, inventory_y_start, config.WHITE))
             
             if not item_slots:
-                inventory_empty_text = "  Empty"
-                self.game_manager.draw_text(self.screen, inventory_empty_text, config.UI_FONT_SIZE, 
-                                            10, inventory_y_start + line_height, color=config.WHITE, font_object=self.ui_font)
+                lines.append(("  Empty", 10, inventory_y_start + line_height, config.WHITE))
             else:
                 current_y = inventory_y_start + line_height
                 for slot_idx, slot in enumerate(item_slots):
@@ -375,14 +479,50 @@ class GameplayScreen(BaseScreen):
                     quantity = slot.get('quantity')
                     if item and quantity is not None: 
                         item_line = f"  {slot_idx+1}. {item.name}: {quantity}" # Numbered list
-                        self.game_manager.draw_text(self.screen, item_line, config.UI_FONT_SIZE, 
-                                                    10, current_y, color=config.WHITE, font_object=self.ui_font)
+                        lines.append((item_line, 10, current_y, config.WHITE))
                         current_y += line_height
                         if current_y > self.screen.get_height() - 20: 
                             break 
         else:
-            self.game_manager.draw_text(self.screen, "Inventory: N/A", config.UI_FONT_SIZE,
-                                        10, inventory_y_start, color=config.RED, font_object=self.ui_font)
+            lines.append(("Inventory: N/A", 10, inventory_y_start, config.RED))
+        return lines
+
+    def draw(self):
+        """Full redraw of the frame."""
+        self.screen.fill(config.BLACK) # Use config color
+        self._point_camera()
+        camera = self.game_manager.camera # Stays at (0, 0) in levels no wider than the screen
+        self.screen.blits([(plat.image, camera.to_screen(plat.rect.topleft)) for plat in self._visible_platforms()],
+                          doreturn=False)
+        self._blit_entities(self._drawn_entities()) # Player, pet, then monsters
+
+        # UI Text (Health, Level, XP, Inventory)
+        # game_manager.draw_text is static, can be called via self.game_manager
+        for text, x, y, color in self._hud_lines():
+            self.game_manager.draw_text(self.screen, text, config.UI_FONT_SIZE, x, y, 
+                                        color=color, font_object=self.ui_font)
+
+    def draw_dirty(self):
+        """Same frame as draw(), but only redraws what changed over the cached level layer.
+        Returns the rects to present with pygame.display.update()."""
+        renderer = self.renderer
+        self._point_camera()
+        camera = self.game_manager.camera
+        # Re-rendered when a level loads, or when the camera scrolled (then the whole frame is redrawn)
+        if not renderer.has_level(self.game_manager.platform_grid, camera.offset):
+            renderer.set_level(self.game_manager.platform_grid, self._visible_platforms(), camera.offset)
+        renderer.begin_frame()
+
+        drawn = self._drawn_entities()
+        for entity, topleft in drawn:
+            renderer.track(self._entity_bounds(entity, topleft))
+        hud_lines = self._hud_lines()
+        renderer.prepare_text({key: (text, color) for key, (text, x, y, color) in enumerate(hud_lines)})
+
+        self._blit_entities(drawn)
+        for key, (text, x, y, color) in enumerate(hud_lines):
+            renderer.draw_text(key, text, x, y, color, self.ui_font)
+        return renderer.end_frame()
 
 
 class GameOverScreen(BaseScreen):
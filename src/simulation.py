@@ -0,0 +1,53 @@
+# Headless simulation helpers for automated balance playthroughs.
+# Game(headless=True) does the heavy lifting; this module supplies a simple
+# player controller and a one-call entry point used by main.py --headless.
+import config
+from src.game import Game
+from src import loot
+
+
+class AutoBattleController:
+    """Drives the player like a very simple bot: walk toward the nearest monster,
+    jump when it is above us, and attack whenever the cooldown allows."""
+
+    def __call__(self, gameplay_screen):
+        player = gameplay_screen.player
+        monsters = gameplay_screen.monsters_list
+        if not monsters:
+            return
+
+        target = min(monsters, key=lambda m: abs(m.rect.centerx - player.rect.centerx))
+        dx_to_target = target.rect.centerx - player.rect.centerx
+
+        if abs(dx_to_target) > player.attack_range // 2:
+            step = player.speed if dx_to_target > 0 else -player.speed
+            player.move(step, 0, gameplay_screen.game_manager.platform_grid)
+        else:
+            player.direction = 1 if dx_to_target >= 0 else -1
+
+        if target.rect.bottom < player.rect.top and not player.is_jumping:
+            player.is_jumping = True
+            player.velocity_y = config.JUMP_STRENGTH
+
+        player.attempt_attack(monsters, gameplay_screen.monster_index)
+
+
+def run_headless_playthrough(max_ticks=None, controller=None, seed=None):
+    """Runs one complete headless playthrough and returns Game.run_headless's statistics.
+
+    seed reseeds the loot RNG first, so runs with the same seed get the same drops.
+    """
+    if seed is not None:
+        loot.seed(seed)
+    game = Game(headless=True)
+    if controller is None:
+        controller = AutoBattleController()
+    return game.run_headless(max_ticks=max_ticks, controller=controller)
+
+
+def format_report(stats):
+    """One-line summary of a headless run, including speed relative to the real-time simulation rate."""
+    return (f"Headless run: {stats['ticks']} ticks in {stats['elapsed_seconds']:.3f}s "
+            f"({stats['ticks_per_second']:.0f} ticks/sec, {stats['realtime_factor']:.1f}x real time at {config.SIMULATION_HZ} Hz). "
+            f"Final state: {stats['final_state']}, levels cleared: {stats['levels_cleared']}, "
+            f"player level: {stats['player_level']}, player health: {stats['player_health']}")
@@ -0,0 +1,86 @@
+# Simulation levels of detail for monsters in levels wider than the screen.
+#
+# Each tick, monsters are sorted into tiers by how far they are beyond the player's
+# view (what the camera shows when centered on the player):
+#   - active: within config.MONSTER_ACTIVE_DISTANCE; updated every tick
+#   - reduced: within config.MONSTER_SLEEP_DISTANCE; updated every
+#     config.MONSTER_REDUCED_TICK_INTERVAL ticks, staggered by spawn x so about the
+#     same share of them is updated each tick. In between they still fall (gravity
+#     and platform collisions, BaseMonster.fall), so they don't drop in steps; only
+#     their AI (patrol) and attacks are throttled
+#   - frozen: farther out; not updated at all, so they keep their place and
+#     cooldowns until the player comes near again
+# Defeated monsters are handled every tick whatever their tier. Tiers only depend
+# on positions and the tick count, so runs stay deterministic. In a level that fits
+# the screen every monster is active.
+import config
+
+ACTIVE = "active"
+REDUCED = "reduced"
+FROZEN = "frozen"
+TIERS = (ACTIVE, REDUCED, FROZEN)
+
+# What a monster does on a tick (MonsterLOD.step)
+UPDATE = "update" # A full update
+FALL = "fall" # Gravity and platform collisions only
+
+
+class MonsterLOD:
+    """Picks the monsters updated each tick, for GameplayScreen's per-object loop and MonsterBatch.
+
+    counts holds how many live monsters were in each tier on the last tick.
+    """
+    def __init__(self):
+        self.tick = 0
+        self.counts = dict.fromkeys(TIERS, 0)
+        self.active_range = None # (low, high) world x of the active tier, None while everything is active
+        self.awake_range = None # (low, high) world x outside which monsters are frozen
+        self.interval = 1
+
+    def begin_tick(self, view):
+        """Starts a tick; view is the player's view rect (world coordinates), or None to update every monster."""
+        self.tick += 1
+        self.counts = dict.fromkeys(TIERS, 0)
+        if view is None:
+            self.active_range = None
+            return
+        active, sleep = config.MONSTER_ACTIVE_DISTANCE, config.MONSTER_SLEEP_DISTANCE
+        self.active_range = (view.left - active, view.right + active)
+        self.awake_range = ((view.left - sleep, view.right + sleep) if sleep is not None
+                            else (float('-inf'), float('inf')))
+        self.interval = max(1, config.MONSTER_REDUCED_TICK_INTERVAL)
+
+    def step(self, monster):
+        """UPDATE, FALL or None (not updated): what monster does this tick; counts it in its tier."""
+        if self.active_range is None:
+            self.counts[ACTIVE] += 1
+            return UPDATE
+        left, right = monster.rect.left, monster.rect.right
+        low, high = self.active_range
+        if right > low and left < high:
+            self.counts[ACTIVE] += 1
+            return UPDATE
+        low, high = self.awake_range
+        if right > low and left < high:
+            self.counts[REDUCED] += 1
+            return UPDATE if (self.tick + int(getattr(monster, "start_x", 0))) % self.interval == 0 else FALL
+        self.counts[FROZEN] += 1
+        return None
+
+    def step_masks(self, x, width, start_x, alive):
+        """step() for the rows of MonsterBatch's NumPy columns: masks of the live rows updated
+        this tick and of those that only fall (update, fall)."""
+        if self.active_range is None:
+            self.counts[ACTIVE] += int(alive.sum())
+            return alive, alive & False
+        right = x + width
+        low, high = self.active_range
+        active = alive & (right > low) & (x < high)
+        low, high = self.awake_range
+        reduced = alive & (right > low) & (x < high) & ~active
+        active_count, reduced_count = int(active.sum()), int(reduced.sum())
+        self.counts[ACTIVE] += active_count
+        self.counts[REDUCED] += reduced_count
+        self.counts[FROZEN] += int(alive.sum()) - active_count - reduced_count
+        reduced_due = reduced & ((start_x.astype(int) + self.tick) % self.interval == 0)
+        return active | reduced_due, reduced & ~reduced_due
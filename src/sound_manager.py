@@ -2,10 +2,14 @@ import pygame
 import os # For joining paths if used internally, though paths are passed in
 
 class SoundManager:
-    def __init__(self):
+    def __init__(self, enable_mixer=True):
         self.mixer_initialized = False
         self.sounds = {}
         self.music_playing = False
+        self.current_music_path = None
+        if not enable_mixer:
+            # Headless runs never touch the audio device; every method below becomes a no-op.
+            return
         try:
             pygame.mixer.init()
             self.mixer_initialized = True
@@ -46,6 +50,7 @@ class SoundManager:
             pygame.mixer.music.set_volume(volume)
             pygame.mixer.music.play(loops)
             self.music_playing = True
+            self.current_music_path = file_path
             print(f"SoundManager: Playing music from '{file_path}'")
         except pygame.error as e:
             print(f"SoundManager Error: Playing music from '{file_path}': {e}")
@@ -58,10 +63,27 @@ class SoundManager:
         try:
             pygame.mixer.music.stop()
             self.music_playing = False
+            self.current_music_path = None
             print("SoundManager: Music stopped.")
         except pygame.error as e:
             print(f"SoundManager Error: Stopping music: {e}")
 
+    def pause_music(self):
+        if not self.mixer_initialized or not self.music_playing:
+            return
+        try:
+            pygame.mixer.music.pause()
+        except pygame.error as e:
+            print(f"SoundManager Error: Pausing music: {e}")
+
+    def unpause_music(self):
+        if not self.mixer_initialized or not self.music_playing:
+            return
+        try:
+            pygame.mixer.music.unpause()
+        except pygame.error as e:
+            print(f"SoundManager Error: Unpausing music: {e}")
+
     def set_music_volume(self, volume):
         if not self.mixer_initialized:
             return
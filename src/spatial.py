@@ -0,0 +1,190 @@
+# Spatial indexes used to avoid scanning every platform/monster each frame.
+from bisect import bisect_left, bisect_right
+from operator import attrgetter
+
+import config
+
+
+class PlatformGrid:
+    """Static uniform grid over a level's platforms.
+
+    Platforms never move, so the grid is built once per level (Game.load_level_assets)
+    and movement code asks it for the platforms near a rect instead of scanning the
+    whole level. Iterating the grid yields every platform in level order, so it can be
+    passed anywhere a plain platforms list is expected.
+    """
+    # Below this many platforms a straight scan beats hashing into cells.
+    LINEAR_SCAN_LIMIT = 16
+
+    def __init__(self, platforms, cell_size=None):
+        self.cell_size = cell_size if cell_size is not None else config.PLATFORM_GRID_CELL_SIZE
+        self.platforms = list(platforms)
+        self.cells = {} # (cell_x, cell_y) -> platforms overlapping that cell, in level order
+        self.cell_indices = {} # Same keys -> level-order indices, for merging multi-cell queries
+
+        size = self.cell_size
+        for index, platform in enumerate(self.platforms):
+            rect = platform.rect
+            for cell_x in range(rect.left // size, (rect.right - 1) // size + 1):
+                for cell_y in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                    self.cells.setdefault((cell_x, cell_y), []).append(platform)
+                    self.cell_indices.setdefault((cell_x, cell_y), []).append(index)
+
+    def __iter__(self):
+        return iter(self.platforms)
+
+    def __len__(self):
+        return len(self.platforms)
+
+    def query(self, rect, dx=0, dy=0):
+        """Returns the platforms near rect, in level order.
+
+        dx/dy widen the area to the swept region of a mover that has just been
+        moved by (dx, dy) to rect, covering both its old and new position.
+        Level order matters: collision response snaps the mover against each
+        platform in turn, so results must match a full scan of the list.
+        The returned list must not be modified.
+        """
+        if len(self.platforms) <= self.LINEAR_SCAN_LIMIT:
+            return self.platforms
+
+        size = self.cell_size
+        dx = round(dx) # Rect coordinates are ints; keep the cell ranges integral too
+        dy = round(dy)
+        min_x = (rect.left - (dx if dx > 0 else 0)) // size
+        max_x = (rect.right - (dx if dx < 0 else 0) - 1) // size
+        min_y = (rect.top - (dy if dy > 0 else 0)) // size
+        max_y = (rect.bottom - (dy if dy < 0 else 0) - 1) // size
+
+        if min_x == max_x and min_y == max_y: # Common case: the mover sits inside one cell
+            return self.cells.get((min_x, min_y), ())
+
+        found = set()
+        cell_indices = self.cell_indices
+        for cell_x in range(min_x, max_x + 1):
+            for cell_y in range(min_y, max_y + 1):
+                indices = cell_indices.get((cell_x, cell_y))
+                if indices:
+                    found.update(indices)
+        platforms = self.platforms
+        return [platforms[i] for i in sorted(found)]
+
+
+def nearby_platforms(platforms, rect, dx=0, dy=0):
+    """Platforms worth collision-testing against rect (see PlatformGrid.query).
+
+    Accepts either a PlatformGrid or a plain list of platforms (tests and
+    tools still pass lists), so movement code works with both.
+    """
+    if isinstance(platforms, PlatformGrid):
+        return platforms.query(rect, dx, dy)
+    return platforms
+
+
+class MonsterIndex:
+    """Broad phase for combat queries over a live monsters list.
+
+    Monsters are kept sorted by rect center x, so the player's attack hitbox
+    and the pet's target search only look at the slice of monsters whose
+    x-range can match instead of the whole list. Results come back in
+    monsters-list order, so ties resolve exactly as a full scan would.
+
+    The index keeps a reference to the live list. GameplayScreen calls
+    mark_dirty() after monsters move, and the order is refreshed lazily by the
+    first query that needs it, so ticks where every cooldown is still running
+    pay nothing. Monsters only drift a few pixels per tick, so re-sorting the
+    previous order is close to linear and runs in C.
+    """
+    def __init__(self, monsters=None):
+        self.reset(monsters if monsters is not None else [])
+
+    def __len__(self):
+        return len(self.monsters)
+
+    def reset(self, monsters):
+        """Tracks a new set of monsters (e.g. a freshly loaded level).
+
+        The largest monster half-width is only computed here: monsters are
+        added only when a level loads, and removing one can only make it
+        conservative, never wrong.
+        """
+        self.monsters = monsters
+        self.max_half_width = max((m.rect.width for m in monsters), default=0) // 2 + 1
+        self.indexed = [] # Snapshot of the monsters list at the last refresh
+        self.center_xs = [] # center x per indexed monster
+        self.order = [] # indices into self.indexed, sorted by center x
+        self.dirty = True
+
+    def mark_dirty(self):
+        """Monsters moved or died since the last refresh."""
+        self.dirty = True
+
+    def refresh(self):
+        """Re-sorts the monsters by their current center x if anything changed."""
+        if not self.dirty:
+            return
+        self.indexed = list(self.monsters)
+        self.center_xs = center_xs = list(map(_rect_center_x, self.indexed))
+        if len(self.order) == len(center_xs):
+            self.order.sort(key=center_xs.__getitem__) # Nearly sorted already: close to linear
+        else: # Monsters were removed (or this is the first refresh), so old indices are stale
+            self.order = sorted(range(len(center_xs)), key=center_xs.__getitem__)
+        self.dirty = False
+
+    def _indices_with_center_x_in(self, low, high):
+        """Indices (ascending) of indexed monsters whose center x is within [low, high]."""
+        order = self.order
+        key = self.center_xs.__getitem__
+        start = bisect_left(order, low, key=key)
+        end = bisect_right(order, high, key=key)
+        return sorted(order[start:end])
+
+    def query_rect(self, rect):
+        """Monsters whose rect overlaps rect, in list order."""
+        self.refresh()
+        left, top, right, bottom = rect.left, rect.top, rect.right, rect.bottom
+        monsters = self.indexed
+        hits = []
+        for index in self._indices_with_center_x_in(left - self.max_half_width, right + self.max_half_width):
+            other = monsters[index].rect
+            if other.left < right and left < other.right and other.top < bottom and top < other.bottom:
+                hits.append(monsters[index])
+        return hits
+
+    def nearest(self, x, y, max_distance):
+        """Closest monster (by rect center) strictly within max_distance of (x, y).
+
+        Returns (monster, squared_distance), or (None, inf) if none is in range.
+        Equal distances resolve to the monster earliest in the list.
+        """
+        self.refresh()
+        max_dist_sq = max_distance * max_distance
+        monsters = self.indexed
+        best_monster = None
+        best_dist_sq = float('inf')
+        for index in self._indices_with_center_x_in(x - max_distance, x + max_distance): # Ascending, so the first of equals wins
+            rect = monsters[index].rect
+            dist_sq = (x - rect.centerx)**2 + (y - rect.centery)**2
+            if dist_sq < best_dist_sq:
+                best_dist_sq = dist_sq
+                best_monster = monsters[index]
+        if best_monster is None or best_dist_sq >= max_dist_sq:
+            return None, float('inf')
+        return best_monster, best_dist_sq
+
+
+_rect_center_x = attrgetter('rect.centerx')
+
+
+def in_attack_reach(rect, attack_range, target_rect):
+    """Same result as rect.inflate(attack_range, attack_range).colliderect(target_rect),
+    without allocating the inflated Rect."""
+    half_range = int(attack_range / 2) # Rect.inflate halves with C integer division (truncates toward zero)
+    left = rect.left - half_range
+    top = rect.top - half_range
+    width = rect.width + attack_range
+    height = rect.height + attack_range
+    if width <= 0 or height <= 0 or target_rect.width <= 0 or target_rect.height <= 0:
+        return False
+    return (left < target_rect.right and target_rect.left < left + width and
+            top < target_rect.bottom and target_rect.top < top + height)
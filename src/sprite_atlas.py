@@ -0,0 +1,52 @@
+# Pre-rendered sprites for the game's code-drawn visuals.
+#
+# The player, pet, monsters and platforms are flat coloured rectangles, and every
+# state they're drawn in (normal, hit flash, the player's attack swipe on either
+# side) is just a size and a colour. Each such look is rendered once into a surface
+# in the display's pixel format and shared; entities return their sprites from
+# sprite_items(topleft), and GameplayScreen draws a frame's worth of them with a
+# single Surface.blits() call instead of a pygame.draw.rect() per entity.
+import math
+
+import pygame
+
+
+def to_pixels(position):
+    """Rounds an (x, y) position the way pygame.Rect does (half away from zero)."""
+    x, y = position
+    if type(x) is int and type(y) is int:
+        return position
+    return (int(math.copysign(math.floor(abs(x) + 0.5), x)), int(math.copysign(math.floor(abs(y) + 0.5), y)))
+
+
+class SpriteAtlas:
+    """Shared sprites keyed by how they look.
+
+    The returned surfaces are shared between callers: blit them, never draw on them.
+    """
+    def __init__(self):
+        self.sprites = {} # (width, height, color) -> Surface
+
+    def __len__(self):
+        return len(self.sprites)
+
+    def solid(self, width, height, color):
+        """A width x height surface filled with color (rendered on first use)."""
+        key = (width, height, color)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            if not self.sprites:
+                pygame.register_quit(self.clear) # Rendered for the display that's closing
+            display = pygame.display.get_surface() # None until a window is open (e.g. headless)
+            size = (max(0, width), max(0, height)) # pygame.draw.rect draws nothing for these either
+            sprite = pygame.Surface(size, 0, display) if display is not None else pygame.Surface(size)
+            sprite.fill(color)
+            self.sprites[key] = sprite
+        return sprite
+
+    def clear(self):
+        self.sprites.clear()
+
+
+# Shared by the entities, the platforms and the gameplay renderers
+sprite_atlas = SpriteAtlas()
@@ -0,0 +1,86 @@
+# Caches for text drawing: one Font object per (name, size), and rendered text
+# surfaces per (font, text, color, antialias), so HUD and menu text that didn't
+# change isn't rendered again every frame.
+from collections import OrderedDict
+
+import pygame
+
+import config
+
+_fonts = {} # (name, size) -> pygame.font.Font
+
+
+def get_font(name, size):
+    """Shared Font for (name, size). Falls back to pygame's default font if name can't be loaded."""
+    key = (name, size)
+    font = _fonts.get(key)
+    if font is None:
+        try:
+            font = pygame.font.Font(name, size)
+        except (pygame.error, OSError) as e:
+            print(f"Error loading font {name}: {e}. Using default pygame font.")
+            font = pygame.font.Font(None, size)
+        if not _fonts:
+            pygame.register_quit(_forget_fonts) # Runs once, on the next pygame.quit()
+        _fonts[key] = font
+    return font
+
+
+def _forget_fonts():
+    """Fonts don't survive pygame.quit(); using one after a new pygame.init() crashes."""
+    _fonts.clear()
+    text_cache.clear() # Its keys hold the old fonts
+
+
+class TextCache:
+    """Bounded LRU cache of rendered text surfaces.
+
+    The returned surfaces are shared between callers: blit them, never draw on them.
+    hits/misses count render() calls, so you can check that per-frame text
+    (e.g. the gameplay HUD) is served from the cache while it doesn't change.
+    """
+    def __init__(self, max_entries=None):
+        self.max_entries = max_entries if max_entries is not None else config.TEXT_CACHE_MAX_ENTRIES
+        self.surfaces = OrderedDict() # (font, text, color, antialias) -> Surface, least recently used first
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.surfaces)
+
+    def render(self, font, text, color, antialias=True):
+        """Same result as font.render(text, antialias, color), rendered only on a cache miss."""
+        key = (font, text, tuple(color), antialias) # pygame.Color isn't hashable
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False) # Evict the least recently used
+        return surface
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self.surfaces),
+        }
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self):
+        self.surfaces.clear()
+        self.reset_stats()
+
+
+# Shared by Game.draw_text and the gameplay HUD
+text_cache = TextCache()
@@ -1,19 +1,30 @@
 import pygame
 from config import BLUE # Using BLUE as a placeholder color, can be changed
+from src.sprite_atlas import sprite_atlas
 
 class Platform(pygame.sprite.Sprite):
     def __init__(self, x, y, width, height, color=BLUE):
         super().__init__()
         self.rect = pygame.Rect(x, y, width, height)
         self.color = color
-        # self.image is not strictly necessary if we're just drawing rects,
-        # but good practice if we later want to use sprite drawing routines
-        # or add textures.
-        self.image = pygame.Surface([width, height])
-        self.image.fill(self.color)
-
-    def draw(self, surface):
-        pygame.draw.rect(surface, self.color, self.rect)
+        # self.image is what draw() blits. It's looked up on first use in the shared
+        # sprite atlas, so platforms of the same size and color share one surface and
+        # loading a level with many platforms doesn't fill a surface per platform.
+        self._image = None
+
+    @property
+    def image(self):
+        if self._image is None:
+            self._image = sprite_atlas.solid(self.rect.width, self.rect.height, self.color)
+        return self._image
+
+    @image.setter
+    def image(self, surface):
+        self._image = surface
+
+    def draw(self, surface, offset=None):
+        """Draws the platform; offset is the camera position (see src/camera.py) when the level scrolls."""
+        surface.blit(self.image, self.rect if offset is None else (self.rect.x - offset[0], self.rect.y - offset[1]))
 
 # Example usage (optional, for testing this file directly)
 if __name__ == '__main__':
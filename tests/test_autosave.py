@@ -0,0 +1,160 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from src.game import Game
+from src.autosave import Autosaver
+from src.save_manager import SaveManager, apply_journal_record
+from src.inventory_manager import InventoryManager
+from src.items import Item, get_item_definition
+import config
+
+class TestInventoryDirtyTracking(unittest.TestCase):
+
+    def test_replayed_changes_match_the_inventory(self):
+        """Applying each take_dirty_slots() result to a copy keeps it identical to the inventory."""
+        rng = random.Random(8)
+        items = [Item(f"Thing {i}", "", stackable=True, max_stack=5) for i in range(6)] + [Item("Sword", "")]
+        inventory = InventoryManager(capacity=40)
+        mirror = {"inventory": []}
+        for _ in range(400):
+            for _ in range(rng.randint(0, 6)):
+                item = rng.choice(items)
+                roll = rng.random()
+                if roll < 0.5:
+                    inventory.add_item(item, rng.randint(1, 12))
+                elif roll < 0.85:
+                    inventory.remove_item(item.name, rng.randint(1, 8))
+                else:
+                    inventory.apply_batch(adds=[(rng.choice(items), rng.randint(1, 6))],
+                                          removes=[(item.name, rng.randint(1, 4))])
+            slot_count, slots = inventory.take_dirty_slots()
+            apply_journal_record(mirror, {"lists": {"inventory": [slot_count, {
+                str(position): inventory.serialize_slot(slot) for position, slot in slots.items()}]}})
+            self.assertEqual(mirror["inventory"], inventory.get_serializable_data())
+
+    def test_only_changed_slots_are_reported(self):
+        inventory = InventoryManager(capacity=100)
+        for i in range(50):
+            inventory.add_item(Item(f"Thing {i}", "", stackable=True, max_stack=10), 5)
+        inventory.take_dirty_slots()
+        inventory.add_item(Item("Thing 3", "", stackable=True, max_stack=10), 1)
+        self.assertEqual(list(inventory.take_dirty_slots()[1]), [3])
+        inventory.remove_item("Thing 47", 5) # Slots after it move up
+        self.assertEqual(sorted(inventory.take_dirty_slots()[1]), [47, 48])
+        self.assertEqual(inventory.take_dirty_slots(), (49, {}))
+
+
+class TestAutosaver(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.game = Game(headless=True) # Headless games don't autosave on their own
+        self.game.save_manager = SaveManager(os.path.join(self.directory, "savegame.sav"))
+        self.game.start_new_game()
+        self.autosaver = Autosaver(self.game, slot=None, interval=1.0, full_every=3)
+        self.player = self.game.player
+
+    def tearDown(self):
+        self.game.save_manager.close()
+        shutil.rmtree(self.directory)
+
+    def load(self):
+        data = self.game.save_manager.load_data()
+        self.assertEqual(data, self.game.snapshot_game_state())
+        return data
+
+    def test_records_hold_only_changes_and_replay_onto_the_snapshot(self):
+        self.autosaver.autosave() # First one is a snapshot
+        self.load()
+
+        self.player.health -= 30
+        self.player.inventory.add_item(get_item_definition("MonsterPart"), 3)
+        self.assertTrue(self.autosaver.autosave().result(timeout=5))
+        with open(self.game.save_manager.journal_path()) as f:
+            record = f.read().splitlines()[-1]
+        self.assertIn('"player_data.health"', record)
+        self.assertNotIn('"player_data.level"', record)
+        self.load()
+
+        self.assertIsNone(self.autosaver.autosave()) # Nothing changed, nothing written
+        self.game.current_level_index = 1
+        self.player.inventory.remove_item("Monster Part", 3)
+        self.autosaver.autosave()
+        self.load()
+
+    def test_snapshots_start_a_new_journal(self):
+        for health in (90, 80, 70, 60, 50, 40):
+            self.player.health = health
+            self.autosaver.autosave()
+        self.assertEqual(self.autosaver.records_since_snapshot, 1) # Snapshot, 3 records, snapshot, record
+        self.load()
+
+    def test_metadata_includes_journaled_changes(self):
+        """The save menu shows the level, player level and health that loading the slot restores."""
+        self.autosaver.autosave()
+        self.game.current_level_index = 1
+        self.player.level = 2
+        self.player.health = 45
+        self.autosaver.autosave().result(timeout=5)
+        with mock.patch.object(SaveManager, "_read_journal") as read_records:
+            metadata = self.game.save_manager.read_metadata()
+            read_records.assert_not_called() # Only the journal's header line is read
+        data = self.load()
+        self.assertEqual((metadata["current_level_index"], metadata["player_level"], metadata["health"]),
+                         (data["current_level_index"], data["player_data"]["level"], data["player_data"]["health"]))
+        self.assertEqual(metadata["current_level_index"], 1)
+
+    def test_records_after_a_failed_snapshot_are_not_appended(self):
+        self.autosaver.autosave().result(timeout=5)
+        health = self.player.health
+        self.player.health = 70
+        self.autosaver.records_since_snapshot = self.autosaver.full_every # The next autosave is a snapshot
+        with mock.patch.object(self.game.save_manager, "_serialize", return_value=None):
+            self.assertFalse(self.autosaver.autosave().result(timeout=5))
+        self.player.health = 60
+        self.player.inventory.add_item(get_item_definition("MonsterPart"), 2)
+        with mock.patch("builtins.print"):
+            self.assertFalse(self.autosaver.save_changes().result(timeout=5)) # Against the snapshot that wasn't written
+        self.assertEqual(self.game.save_manager.load_data()["player_data"]["health"], health)
+        self.assertTrue(self.autosaver.autosave().result(timeout=5)) # Writes the snapshot again
+        self.load()
+
+    def test_autosaves_have_a_slot_of_their_own(self):
+        self.assertEqual(Autosaver(self.game).slot, config.AUTOSAVE_SLOT)
+        self.assertIsNotNone(config.AUTOSAVE_SLOT) # Never the default slot, a manual save's
+        self.assertTrue(self.game.save_game_state().result(timeout=5))
+        self.player.health = 12
+        Autosaver(self.game).autosave().result(timeout=5)
+        self.assertNotEqual(self.game.save_manager.load_data()["player_data"]["health"], 12)
+        self.assertEqual(self.game.save_manager.load_data(config.AUTOSAVE_SLOT)["player_data"]["health"], 12)
+
+        self.game.set_game_state(config.STATE_MAIN_MENU)
+        labels = [button.text for button in self.game.current_screen.buttons]
+        self.assertEqual(labels, ["New Game", "Continue (Level 1)", "Load Game (Level 1)", "Quit"])
+        self.game.load_saved_game(config.AUTOSAVE_SLOT)
+        self.assertEqual(self.player.health, 12)
+
+    def test_ticks_autosave_on_the_interval(self):
+        for _ in range(5):
+            self.autosaver.tick(0.25)
+        self.assertIsNotNone(self.autosaver.journal_id)
+
+    def test_damaged_and_stale_journals(self):
+        self.autosaver.autosave()
+        self.player.health = 55
+        self.autosaver.autosave()
+        self.game.save_manager.wait()
+        with open(self.game.save_manager.journal_path(), 'a') as f:
+            f.write('{"set": {"player_data.hea') # Cut off by a crash
+        self.assertEqual(self.game.save_manager.load_data()["player_data"]["health"], 55)
+
+        with open(self.game.save_manager.journal_path(), 'w') as f: # Belongs to another snapshot
+            f.write('{"journal_id": "old"}\n{"set": {"player_data.health": 1}}\n')
+        self.assertNotEqual(self.game.save_manager.load_data()["player_data"]["health"], 1)
+        self.assertNotEqual(self.game.save_manager.read_metadata()["health"], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import json
+import os
+import tempfile
+import unittest
+from src import event_log
+from src.player import Player
+from src.monster import Grunt
+import config
+
+class TestEventLog(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "events.jsonl")
+
+    def tearDown(self):
+        event_log.configure() # Back to the config defaults
+        self.directory.cleanup()
+
+    def read_records(self):
+        event_log.flush()
+        with open(self.path, encoding='utf-8') as f:
+            return [json.loads(line) for line in f]
+
+    def test_levels_and_categories_filter_records(self):
+        event_log.configure(levels={"combat": "INFO", "xp": None}, console=False, jsonl_path=self.path)
+        self.assertTrue(event_log.enabled(event_log.COMBAT, event_log.INFO))
+        self.assertFalse(event_log.enabled(event_log.COMBAT, event_log.DEBUG))
+        self.assertFalse(event_log.enabled(event_log.XP, event_log.ERROR))
+        self.assertFalse(event_log.enabled(event_log.LOOT)) # Categories not listed are off
+
+        event_log.log(event_log.COMBAT, event_log.DEBUG, "dropped")
+        event_log.log(event_log.XP, event_log.INFO, "dropped")
+        event_log.log(event_log.COMBAT, event_log.WARNING, "kept", monster_id=7)
+        records = self.read_records()
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]["message"], "kept")
+        self.assertEqual(records[0]["level"], "WARNING")
+        self.assertEqual(records[0]["category"], "combat")
+        self.assertEqual(records[0]["monster_id"], 7)
+
+    def test_gameplay_events_are_structured(self):
+        event_log.configure(levels={"combat": "DEBUG", "xp": "INFO"}, console=False, jsonl_path=self.path)
+        player = Player(0, 0, config.PLAYER_WIDTH, config.PLAYER_HEIGHT, config.PLAYER_COLOR)
+        grunt = Grunt(x=0, y=0, width=30, height=30, color=config.RED, health=10, attack_damage=5,
+                      attack_range=10, attack_cooldown=1, speed=1, patrol_range_x=50,
+                      gravity_val=config.GRAVITY, screen_height_val=config.SCREEN_HEIGHT)
+        grunt.take_damage(10)
+        grunt.strike(player)
+        player.gain_xp(config.XP_PER_LEVEL_BASE)
+        events = [record["event"] for record in self.read_records()]
+        self.assertEqual(events, ["monster_damaged", "monster_defeated", "player_damaged", "monster_attack",
+                                  "xp_gained", "level_up"])
+
+    def test_disabled_log_starts_no_writer(self):
+        event_log.disable()
+        event_log.log(event_log.COMBAT, event_log.ERROR, "dropped")
+        self.assertIsNone(event_log._writer)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+import copy
+import random
+import unittest
+from unittest import mock
+from src.inventory_manager import InventoryManager
+from src.items import Item, HealthPotion
+
+class TestInventoryIndex(unittest.TestCase):
+
+    def assert_index_matches_slots(self, inventory):
+        """stacks_by_name and totals must describe exactly what's in slots, in slot order."""
+        expected_stacks, expected_totals = {}, {}
+        for slot in inventory.slots:
+            name = slot['item'].name
+            expected_stacks.setdefault(name, []).append(slot)
+            expected_totals[name] = expected_totals.get(name, 0) + slot['quantity']
+        self.assertEqual(inventory.totals, expected_totals)
+        self.assertEqual(set(inventory.stacks_by_name), set(expected_stacks))
+        for name, stacks in expected_stacks.items():
+            self.assertEqual([id(slot) for slot in inventory.stacks_by_name[name]], [id(slot) for slot in stacks])
+            self.assertEqual(inventory.get_item_count(name), expected_totals[name])
+
+    def test_index_follows_stacking_and_removal(self):
+        rng = random.Random(3)
+        items = [Item("Monster Part", "", stackable=True, max_stack=5), Item("Ore", "", stackable=True, max_stack=3),
+                 Item("Basic Sword", "", stackable=False), HealthPotion(name="Health Potion", description="")]
+        inventory = InventoryManager(capacity=10)
+        for _ in range(500):
+            item = rng.choice(items)
+            if rng.random() < 0.6:
+                inventory.add_item(item, rng.randint(1, 8))
+            else:
+                inventory.remove_item(item.name, rng.randint(1, 8)) # Often more than held: partial removal
+            self.assert_index_matches_slots(inventory)
+
+    def test_removal_drains_last_stacks_first(self):
+        inventory = InventoryManager(capacity=5)
+        part = Item("Monster Part", "", stackable=True, max_stack=5)
+        inventory.add_item(Item("Ore", "", stackable=True, max_stack=5), 2)
+        inventory.add_item(part, 12) # Stacks of 5, 5, 2
+        self.assertTrue(inventory.remove_item("Monster Part", 4))
+        self.assertEqual([slot['quantity'] for slot in inventory.slots], [2, 5, 3])
+        self.assertFalse(inventory.remove_item("Monster Part", 20)) # Not enough; what was there is gone
+        self.assertEqual(inventory.get_item_count("Monster Part"), 0)
+        self.assertNotIn("Monster Part", inventory.stacks_by_name)
+        self.assert_index_matches_slots(inventory)
+
+    def test_index_rebuilt_on_load(self):
+        inventory = InventoryManager(capacity=8)
+        inventory.add_item(HealthPotion(name="Health Potion", description="", max_stack=5), 13)
+        inventory.add_item(Item("Monster Part", "", stackable=True, max_stack=20), 25)
+        saved = inventory.get_serializable_data()
+
+        loaded = InventoryManager(capacity=8)
+        loaded.add_item(Item("Stale", "", stackable=True, max_stack=5), 3)
+        loaded.load_from_serializable_data(saved)
+        self.assertEqual(loaded.get_item_count("Health Potion"), 13)
+        self.assertEqual(loaded.get_item_count("Monster Part"), 25)
+        self.assertEqual(loaded.get_item_count("Stale"), 0)
+        self.assert_index_matches_slots(loaded)
+
+    def test_restore_keeps_the_saved_layout(self):
+        """Part-filled stacks are restored as saved, not merged the way add_item would merge them."""
+        part = Item("Monster Part", "", stackable=True, max_stack=20)
+        potion = HealthPotion(name="Health Potion", description="", max_stack=5)
+        inventory = InventoryManager(capacity=8)
+        inventory.slots = [{'item': part, 'quantity': 3}, {'item': potion, 'quantity': 2},
+                           {'item': part, 'quantity': 20}, {'item': part, 'quantity': 7},
+                           {'item': potion, 'quantity': 5}]
+        inventory.rebuild_index()
+        saved = inventory.get_serializable_data()
+
+        loaded = InventoryManager(capacity=8)
+        self.assertTrue(loaded.load_from_serializable_data(saved))
+        self.assertEqual(loaded.get_serializable_data(), saved)
+        self.assertIs(loaded.slots[0]['item'], loaded.slots[2]['item']) # One shared item per saved item
+        self.assert_index_matches_slots(loaded)
+
+        too_small = InventoryManager(capacity=4)
+        too_small.add_item(part, 1)
+        self.assertFalse(too_small.load_from_serializable_data(saved)) # Checked before anything changes
+        self.assertEqual(too_small.get_item_count("Monster Part"), 1)
+
+    def test_skipped_slots_dont_count_against_the_capacity(self):
+        part = Item("Monster Part", "", stackable=True, max_stack=20)
+        inventory = InventoryManager(capacity=2)
+        inventory.add_item(part, 25)
+        saved = inventory.get_serializable_data()
+        damaged = [saved[0], {"item_data": None, "quantity": 1}, {"item_data": saved[0]["item_data"], "quantity": 0},
+                   {"item_data": {"item_class_name": "NoSuchItem", "name": "?"}, "quantity": 1}, saved[1]]
+        loaded = InventoryManager(capacity=2)
+        with mock.patch("builtins.print"):
+            self.assertTrue(loaded.load_from_serializable_data(damaged))
+        self.assertEqual(loaded.get_serializable_data(), saved)
+
+class TestInventoryBatch(unittest.TestCase):
+
+    def slot_contents(self, inventory):
+        return [(slot['item'].name, slot['quantity']) for slot in inventory.slots]
+
+    def test_batch_matches_single_calls_or_changes_nothing(self):
+        """A batch succeeds exactly when the same removes then adds would all succeed one by one."""
+        rng = random.Random(11)
+        items = [Item(f"Item {i}", "", stackable=(i % 3 != 0), max_stack=rng.randint(1, 6)) for i in range(6)]
+        for _ in range(1000):
+            inventory = InventoryManager(capacity=rng.randint(1, 8))
+            for _ in range(rng.randint(0, 10)):
+                inventory.add_item(rng.choice(items), rng.randint(1, 6))
+            removes = [(rng.choice(items).name, rng.randint(1, 6)) for _ in range(rng.randint(0, 3))]
+            adds = [(rng.choice(items), rng.randint(1, 6)) for _ in range(rng.randint(0, 3))]
+
+            reference = copy.deepcopy(inventory)
+            expected = (all(reference.remove_item(name, quantity) for name, quantity in removes)
+                        and all(reference.add_item(item, quantity) for item, quantity in adds))
+            before = self.slot_contents(inventory)
+            self.assertEqual(inventory.can_apply_batch(adds, removes), expected)
+            self.assertEqual(self.slot_contents(inventory), before) # can_apply_batch changes nothing
+            self.assertEqual(inventory.apply_batch(adds, removes), expected)
+            if expected:
+                self.assertEqual(self.slot_contents(inventory), self.slot_contents(reference))
+            else:
+                self.assertEqual(self.slot_contents(inventory), before)
+            self.assertEqual(inventory.totals, {name: sum(slot['quantity'] for slot in stacks)
+                                                for name, stacks in inventory.stacks_by_name.items()})
+
+    def test_crafting_uses_slots_freed_by_its_removals(self):
+        ore = Item("Ore", "", stackable=True, max_stack=5)
+        sword = Item("Basic Sword", "", stackable=False)
+        inventory = InventoryManager(capacity=2)
+        inventory.add_item(ore, 7) # Both slots taken: 5 + 2
+        self.assertFalse(inventory.apply_batch(adds=[(sword, 1)], removes=[("Ore", 1)]))
+        self.assertTrue(inventory.apply_batch(adds=[(sword, 1)], removes=[("Ore", 2)]))
+        self.assertEqual(self.slot_contents(inventory), [("Ore", 5), ("Basic Sword", 1)])
+        self.assertFalse(inventory.apply_batch(removes=[("Ore", 3), ("Ore", 3)])) # Same item twice adds up
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import copy
+import gc
+import unittest
+import weakref
+from src import items
+from src.items import Item, HealthPotion, create_item_from_dict, get_item_definition
+from src.inventory_manager import InventoryManager
+import config
+
+class TestItemDefinitions(unittest.TestCase):
+
+    def test_items_are_immutable_and_slotted(self):
+        potion = get_item_definition("HealthPotion")
+        self.assertIsInstance(potion, HealthPotion)
+        self.assertFalse(hasattr(potion, '__dict__'))
+        with self.assertRaises(AttributeError):
+            potion.heal_amount = 500
+        with self.assertRaises(AttributeError):
+            potion.name = "Elixir"
+        self.assertIs(copy.deepcopy(potion), potion)
+
+    def test_definitions_are_shared(self):
+        part = get_item_definition("MonsterPart")
+        self.assertIs(get_item_definition("MonsterPart"), part)
+        self.assertIs(create_item_from_dict(part.to_dict()), part) # Loaded saves reuse it too
+        self.assertIs(create_item_from_dict(dict(config.GENERIC_ITEM_DEFAULTS["MonsterPart"])), part)
+        self.assertIsNone(get_item_definition("NoSuchItem"))
+
+    def test_unused_items_are_not_kept(self):
+        """Items from loaded or modded data leave the intern tables once nothing uses them."""
+        data = {"item_class_name": "Item", "name": "Modded Gem", "description": "", "value": 999}
+        gem = create_item_from_dict(data)
+        self.assertIs(create_item_from_dict(dict(data)), gem)
+        gem_ref = weakref.ref(gem)
+        del gem
+        gc.collect()
+        self.assertIsNone(gem_ref())
+        self.assertNotIn(tuple(sorted(data.items())), items._interned_items)
+        self.assertIs(get_item_definition("MonsterPart"), get_item_definition("MonsterPart")) # Definitions stay
+
+    def test_serialization_round_trip(self):
+        potion = get_item_definition("HealthPotion")
+        data = potion.to_dict()
+        self.assertEqual(data["heal_amount"], config.GENERIC_ITEM_DEFAULTS["HealthPotion"]["heal_amount"])
+        self.assertEqual(create_item_from_dict(data).to_dict(), data)
+        self.assertEqual(Item("Sword", "", stackable=False, max_stack=5).max_stack, 1)
+
+    def test_loaded_inventory_references_shared_items(self):
+        inventory = InventoryManager(capacity=10)
+        inventory.add_item(get_item_definition("MonsterPart"), 45) # Three stacks
+        loaded = InventoryManager(capacity=10)
+        loaded.load_from_serializable_data(inventory.get_serializable_data())
+        self.assertEqual(len(loaded.slots), 3)
+        for slot in loaded.slots:
+            self.assertIs(slot['item'], get_item_definition("MonsterPart"))
+
+if __name__ == '__main__':
+    unittest.main()
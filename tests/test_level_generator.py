@@ -0,0 +1,47 @@
+import unittest
+from unittest import mock
+import config
+from src.level_generator import generate_level
+from src.levels import compile_level
+from src.game import Game
+
+class TestLevelGenerator(unittest.TestCase):
+
+    def test_same_seed_same_level(self):
+        self.assertEqual(generate_level(seed=5), generate_level(seed=5))
+        self.assertNotEqual(generate_level(seed=5), generate_level(seed=6))
+
+    def test_counts_and_mix(self):
+        level = generate_level(seed=1, platform_count=500, monster_count=301, group_size=40,
+                               monster_mix={"Grunt": 2, "Flyer": 1})
+        self.assertEqual(len(level["platforms"]), 500)
+        counts = {}
+        for group in level["monsters"]:
+            self.assertLessEqual(group["count"], 40)
+            self.assertEqual(len(group["x"]), group["count"])
+            counts[group["type"]] = counts.get(group["type"], 0) + group["count"]
+        self.assertEqual(counts, {"Grunt": 201, "Flyer": 100})
+
+    def test_output_compiles_and_grunts_stand_on_platforms(self):
+        level = generate_level(seed=2, platform_count=200, monster_count=100,
+                               drop_tables=[[]], monster_stats={"attack_damage": 0})
+        blueprint = compile_level(level)
+        self.assertEqual((len(blueprint.platforms), len(blueprint.spawns)), (200, 100))
+        world_width = level["platforms"][0][2]
+        tops = {(x, y) for x, y, width, height, color in blueprint.platforms for x in range(x, x + width)}
+        for spawn in blueprint.spawns:
+            self.assertTrue(0 <= spawn.x <= world_width)
+            self.assertEqual(spawn.kwargs["attack_damage"], 0)
+            self.assertFalse(spawn.loot_table)
+            if spawn.monster_class.__name__ == "Grunt":
+                self.assertIn((spawn.x, spawn.y + spawn.kwargs["height"]), tops)
+
+    def test_game_plays_a_generated_level(self):
+        game = Game(headless=True)
+        with mock.patch.object(config, "LEVEL_CONFIGS", [generate_level(seed=3, platform_count=300, monster_count=150)]), \
+                mock.patch("builtins.print"):
+            game.load_level_assets(0)
+        self.assertEqual((len(game.platforms_list), len(game.monsters_list)), (300, 150))
+
+if __name__ == '__main__':
+    unittest.main()
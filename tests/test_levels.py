@@ -0,0 +1,135 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+import config
+from src import levels
+from src.levels import compile_level, get_level_blueprint, build_platforms, spawn_monsters, load_level_data, level_count
+from src.monster import Grunt, Flyer
+from src.game import Game
+
+SHIPPED_LEVELS_DIR = config.LEVELS_DIR
+
+class TestLevelCompiler(unittest.TestCase):
+
+    def test_groups_resolve_to_one_spawn_per_monster(self):
+        blueprint = compile_level({
+            "platforms": [[0, 560, 800, 40, config.GREY], [200, 400, 150, 20]],
+            "monsters": [
+                {"type": "Grunt", "count": 3, "x": [100, 300], "health": 500},
+                {"type": "Flyer", "count": 1, "x": 400,
+                 "drops": [{"item_id": "MonsterPart", "chance": 1.0, "quantity": 2}]},
+            ],
+            "message": "Test",
+        }, screen_height=600)
+        self.assertEqual(blueprint.platforms, ((0, 560, 800, 40, config.GREY), (200, 400, 150, 20, config.BLUE)))
+        grunts, flyer = blueprint.spawns[:3], blueprint.spawns[3]
+        self.assertEqual([spawn.x for spawn in grunts], [100, 300, 100]) # x positions reused in turn
+        self.assertEqual(grunts[0].y, 600 - config.DEFAULT_GRUNT_STATS["height"] - 40) # On the ground
+        self.assertEqual(grunts[0].kwargs["health"], 500)
+        self.assertEqual(grunts[0].kwargs["speed"], config.DEFAULT_GRUNT_STATS["speed"])
+        self.assertIs(grunts[0].kwargs, grunts[2].kwargs) # Shared by the group
+        self.assertEqual((flyer.y, flyer.kwargs["y_offset"]), (config.DEFAULT_FLYER_STATS["y_offset"],) * 2)
+
+        monsters = spawn_monsters(blueprint)
+        self.assertEqual([type(m) for m in monsters], [Grunt, Grunt, Grunt, Flyer])
+        self.assertEqual(monsters[2].health, 500)
+        self.assertEqual(monsters[3].loot_table.roll()[0][2], 2)
+        platforms = build_platforms(blueprint)
+        self.assertEqual(platforms[1].image.get_size(), (150, 20)) # Built on first use
+
+    def test_malformed_entries_are_skipped(self):
+        with mock.patch("builtins.print"):
+            blueprint = compile_level({"platforms": [[1, 2, 3]],
+                                       "monsters": [{"type": "Dragon", "count": 1}, {"type": "Grunt", "count": -1}]})
+        self.assertEqual((blueprint.platforms, blueprint.spawns), ((), ()))
+
+    def test_levels_compile_once(self):
+        self.assertIs(get_level_blueprint(3), get_level_blueprint(3))
+        with mock.patch.object(config, "LEVEL_CONFIGS", [{"platforms": [], "monsters": []}]):
+            self.assertEqual(get_level_blueprint(0).spawns, ()) # A replaced level list is compiled afresh
+        self.assertEqual(len(get_level_blueprint(0).spawns), 1)
+
+    def test_color_names_resolve_to_config_colors(self):
+        blueprint = compile_level({"platforms": [[0, 0, 10, 10, "DARK_GREY"], [0, 0, 10, 10, [1, 2, 3]]]})
+        self.assertEqual([p[4] for p in blueprint.platforms], [config.DARK_GREY, (1, 2, 3)])
+
+
+class TestLevelFiles(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        for number in (1, 2, 3):
+            with open(os.path.join(self.directory, f"level_{number:02d}.json"), 'w') as f:
+                json.dump({"platforms": [[0, 560, 800, 40]], "monsters": [{"type": "Grunt", "count": number}]}, f)
+        patcher = mock.patch.object(config, "LEVELS_DIR", self.directory)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_the_game_ships_its_levels_as_files(self):
+        with mock.patch.object(config, "LEVELS_DIR", SHIPPED_LEVELS_DIR):
+            self.assertEqual(level_count(), 4)
+            self.assertEqual([len(get_level_blueprint(i).spawns) for i in range(4)], [1, 2, 1, 2])
+
+    def test_levels_are_found_from_any_directory(self):
+        working_directory = os.getcwd()
+        self.addCleanup(os.chdir, working_directory)
+        os.chdir(self.directory) # Holds level files of its own, which must not be picked up
+        with mock.patch.object(config, "LEVELS_DIR", SHIPPED_LEVELS_DIR):
+            levels.clear_cache()
+            self.assertEqual(level_count(), 4)
+            self.assertEqual(len(get_level_blueprint(0).spawns), 1)
+
+    def test_levels_load_in_file_order_on_demand(self):
+        self.assertEqual(level_count(), 3)
+        with mock.patch.object(levels, "load_level_data", wraps=load_level_data) as load:
+            self.assertEqual(len(get_level_blueprint(2).spawns), 3)
+            get_level_blueprint(2)
+        load.assert_called_once_with(2)
+
+    def test_next_level_is_prepared_in_the_background(self):
+        threads = {}
+        def record_thread(level_index):
+            threads[level_index] = threading.current_thread().name
+            return load_level_data(level_index)
+        game = Game(headless=True)
+        with mock.patch.object(levels, "load_level_data", side_effect=record_thread), mock.patch("builtins.print"):
+            game.load_level_assets(0)
+            game.load_level_assets(1)
+        self.assertEqual(len(game.monsters_list), 2)
+        self.assertEqual(threads[0], threading.main_thread().name)
+        self.assertTrue(threads[1].startswith("level-prefetch"))
+
+    def test_damaged_level_file_returns_to_the_menu(self):
+        with open(os.path.join(self.directory, "level_02.json"), 'w') as f:
+            f.write('{"platforms": [')
+        game = Game(headless=True)
+        with mock.patch("builtins.print"):
+            self.assertIsNone(get_level_blueprint(1))
+            with mock.patch.object(game, "go_to_main_menu") as go_to_main_menu:
+                game.load_level_assets(1)
+        go_to_main_menu.assert_called_once()
+
+
+class TestLoadLevelAssets(unittest.TestCase):
+
+    def test_game_builds_the_configured_level(self):
+        game = Game(headless=True)
+        with mock.patch("builtins.print"):
+            game.load_level_assets(3) # A Grunt and a Flyer
+        level = load_level_data(3)
+        self.assertEqual([tuple(p.rect) + (p.color,) for p in game.platforms_list], list(get_level_blueprint(3).platforms))
+        grunt, flyer = game.monsters_list
+        self.assertEqual((type(grunt), grunt.rect.topleft), (Grunt, (level["monsters"][0]["x"], level["monsters"][0]["y"])))
+        self.assertEqual((type(flyer), flyer.initial_y), (Flyer, level["monsters"][1]["y"]))
+        self.assertIs(grunt.sound_manager, game.sound_manager)
+        self.assertEqual(len(game.platform_grid.platforms), len(level["platforms"]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import random
+import unittest
+from src.game import Game
+from src.items import get_item_definition
+from src.loot import LootTable, EMPTY_TABLE, compile_loot_table
+from src.levels import load_level_data
+import config
+
+GRUNT_DROPS = load_level_data(0)["monsters"][0]["drops"] # Monster Part 100%, Health Potion 20%
+THREE_WAY_DROPS = [
+    {"item_id": "MonsterPart", "chance": 0.5, "quantity": 2},
+    {"item_id": "HealthPotion", "chance": 0.3},
+    {"item_id": "MonsterPart", "chance": 0.1, "quantity": 1},
+]
+
+
+def roll_each_entry(drops, rng):
+    """The per-entry roll the compiled tables replace."""
+    return [(drop["item_id"], drop.get("quantity", 1)) for drop in drops if rng.random() < drop["chance"]]
+
+
+class TestLootTable(unittest.TestCase):
+
+    def test_compiles_every_outcome_with_cumulative_odds(self):
+        table = LootTable(GRUNT_DROPS)
+        part, potion = get_item_definition("MonsterPart"), get_item_definition("HealthPotion")
+        self.assertEqual(table.outcomes, [(("MonsterPart", part, 1), ("HealthPotion", potion, 1)),
+                                          (("MonsterPart", part, 1),)])
+        self.assertAlmostEqual(table.thresholds[0], 0.2)
+        self.assertEqual(table.thresholds[-1], 1.0)
+        self.assertIs(compile_loot_table([]), EMPTY_TABLE)
+        self.assertEqual(EMPTY_TABLE.roll(), ())
+
+    def test_odds_match_rolling_each_entry(self):
+        """Each outcome comes up as often as with a separate roll per entry."""
+        rolls = 20000
+        for table in (LootTable(THREE_WAY_DROPS), LootTable(THREE_WAY_DROPS, max_combined_entries=0)):
+            compiled_rng, reference_rng = random.Random(5), random.Random(6)
+            compiled, reference = {}, {}
+            for _ in range(rolls):
+                outcome = tuple((item_id, quantity) for item_id, item, quantity in table.roll(compiled_rng))
+                compiled[outcome] = compiled.get(outcome, 0) + 1
+                outcome = tuple(roll_each_entry(THREE_WAY_DROPS, reference_rng))
+                reference[outcome] = reference.get(outcome, 0) + 1
+            self.assertEqual(set(compiled), set(reference))
+            for outcome, count in reference.items():
+                self.assertAlmostEqual(compiled[outcome] / rolls, count / rolls, delta=0.015)
+
+    def test_same_seed_same_drops(self):
+        table = LootTable(THREE_WAY_DROPS)
+        first = [table.roll(random.Random(42)) for _ in range(3)]
+        self.assertEqual(first, [table.roll(random.Random(42)) for _ in range(3)])
+
+    def test_unknown_items_are_skipped(self):
+        table = LootTable([{"item_id": "NoSuchItem", "chance": 1.0}, {"item_id": "MonsterPart", "chance": 1.0}])
+        self.assertEqual(table.roll(), (("MonsterPart", get_item_definition("MonsterPart"), 1),))
+
+
+class TestGameplayDrops(unittest.TestCase):
+
+    def setUp(self):
+        self.game = Game(headless=True)
+        self.game.start_new_game()
+        self.screen = self.game.current_screen
+
+    def test_level_monsters_share_a_compiled_table(self):
+        self.game.load_level_assets(1) # Two Grunts from one group
+        first, second = self.game.monsters_list
+        self.assertIs(first.loot_table, second.loot_table)
+
+    def test_defeated_monsters_award_their_drops(self):
+        self.game.load_level_assets(1)
+        self.screen.monsters_list = self.game.monsters_list
+        inventory = self.screen.player.inventory
+        parts_before = inventory.get_item_count("Monster Part")
+        xp_before = self.screen.player.experience_points
+        for monster in list(self.screen.monsters_list):
+            self.screen.defeat_monster(monster)
+        self.assertEqual(self.screen.monsters_list, [])
+        self.assertEqual(inventory.get_item_count("Monster Part"), parts_before + 2) # Guaranteed drop
+        self.assertEqual(self.screen.player.experience_points, xp_before + 2 * config.XP_PER_MONSTER_DEFEAT)
+
+if __name__ == '__main__':
+    unittest.main()
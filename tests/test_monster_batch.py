@@ -0,0 +1,121 @@
+import random
+import unittest
+from unittest import mock
+import pygame
+from src.monster import Grunt, Flyer
+from src.monster_batch import MonsterBatch, np
+from src.player import Player
+from src.spatial import PlatformGrid
+from src.world_elements import Platform
+from src.game import Game
+from src.level_generator import generate_level
+import config
+
+def make_world(seed):
+    """Platforms, a mix of Grunts and Flyers and a player, all reproducible from seed."""
+    rng = random.Random(seed)
+    platforms = [Platform(0, config.SCREEN_HEIGHT - 40, 3000, 40)]
+    for _ in range(30):
+        platforms.append(Platform(rng.randint(0, 2900), rng.randint(100, 500), rng.randint(40, 250), rng.randint(10, 40)))
+    grunt, flyer = config.DEFAULT_GRUNT_STATS, config.DEFAULT_FLYER_STATS
+    monsters = []
+    platform_rects = [p.rect for p in platforms]
+    for _ in range(200):
+        x, y = rng.randint(0, 2900), rng.randint(0, 520)
+        # Spawn in free space: a monster embedded in a platform is an invalid state either way
+        while pygame.Rect(x, y, 40, 40).collidelist(platform_rects) != -1:
+            x += 10
+        if rng.random() < 0.7:
+            monsters.append(Grunt(x=x, y=y, width=grunt["width"], height=grunt["height"], color=grunt["color"],
+                                  health=grunt["health"], attack_damage=1, attack_range=rng.choice([30, 50, 75]),
+                                  attack_cooldown=rng.randint(20, 70), speed=rng.choice([1, 2, 3]),
+                                  patrol_range_x=rng.randint(20, 200), gravity_val=config.GRAVITY,
+                                  screen_height_val=config.SCREEN_HEIGHT))
+        else:
+            monsters.append(Flyer(x=x, y=y, width=flyer["width"], height=flyer["height"], color=flyer["color"],
+                                  health=flyer["health"], attack_damage=1, attack_range=rng.choice([40, 60]),
+                                  attack_cooldown=rng.randint(30, 100), speed=rng.choice([2, 3]),
+                                  vertical_amplitude=rng.randint(10, 40), vertical_speed_factor=rng.choice([0.01, 0.0033]),
+                                  patrol_range_x=rng.randint(20, 200), y_offset=0))
+    player = Player(400, 300, config.PLAYER_WIDTH, config.PLAYER_HEIGHT, config.PLAYER_COLOR)
+    player.health = player.max_health = 10**6 # Survive the whole run so every attack is compared
+    return platforms, monsters, player
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestMonsterBatch(unittest.TestCase):
+
+    def test_batched_update_matches_per_object_update(self):
+        """Positions, patrol state, cooldowns, hits on the player and defeats all match Grunt/Flyer.update."""
+        platforms, monsters, player = make_world(seed=1)
+        batch_platforms, batch_monsters, batch_player = make_world(seed=1)
+        grid = PlatformGrid(batch_platforms, cell_size=64)
+        batch = MonsterBatch(batch_monsters)
+        defeated, batch_defeated = [], []
+
+        def defeat(monster):
+            batch_defeated.append(batch_monsters.index(monster))
+            batch_monsters.remove(monster)
+
+        rng = random.Random(2)
+        time_ticks = 0.0
+        for tick in range(400):
+            time_ticks += 1000.0 / config.FPS
+            if tick % 10 == 0: # Kill a few monsters along the way, in both worlds
+                for _ in range(3):
+                    victim = rng.randrange(len(monsters))
+                    monsters[victim].health = 0
+                    batch_monsters[victim].health = 0
+
+            # GameplayScreen.update_monsters' per-object loop
+            for monster in list(monsters):
+                if monster.health <= 0:
+                    defeated.append(monsters.index(monster))
+                    monsters.remove(monster)
+                else:
+                    monster.update(platforms, player, time_ticks=time_ticks)
+            batch.update(grid, batch_player, time_ticks=time_ticks, on_defeated=defeat)
+
+            self.assertEqual([m.rect for m in monsters], [m.rect for m in batch_monsters], f"diverged at tick {tick}")
+            self.assertEqual(player.health, batch_player.health)
+        self.assertEqual(defeated, batch_defeated)
+        self.assertLess(player.health, player.max_health) # The run did exercise monster attacks
+
+        batch.write_back()
+        for monster, batch_monster in zip(monsters, batch_monsters):
+            self.assertEqual(monster.direction, batch_monster.direction)
+            self.assertEqual(monster.last_attack_time, batch_monster.last_attack_time)
+            self.assertEqual(getattr(monster, "velocity_y", None), getattr(batch_monster, "velocity_y", None))
+
+    def test_resyncs_when_list_changes_outside_the_batch(self):
+        """Monsters removed without going through update() are dropped from the arrays."""
+        platforms, monsters, player = make_world(seed=3)
+        batch = MonsterBatch(monsters)
+        batch.update(platforms, player, time_ticks=0)
+        removed = monsters.pop(5)
+        batch.update(platforms, player, time_ticks=16)
+        self.assertEqual(len(batch), len(monsters))
+        self.assertNotIn(removed, batch.tracked)
+
+    def test_pause_and_resume_keep_the_batched_state(self):
+        """The resumed screen's batch starts from where the monsters were, not from stale objects."""
+        level = generate_level(seed=6, platform_count=10, monster_count=40, world_width=config.SCREEN_WIDTH,
+                               monster_stats={"attack_damage": 0})
+        game = Game(headless=True)
+        with mock.patch("builtins.print"), mock.patch.object(config, "LEVEL_CONFIGS", [level]), \
+             mock.patch.object(config, "MONSTER_BATCH_MIN_COUNT", 1):
+            game.start_new_game()
+            for _ in range(150): # Long enough for patrols to turn around and cooldowns to run
+                game.current_screen.update_monsters(1.0 / config.SIMULATION_HZ)
+            batch = game.current_screen.monster_batch
+            state = [batch.direction.copy(), batch.velocity_y.copy(), batch.last_attack_time.copy()]
+            game.pause_game()
+            game.resume_game()
+        resumed = game.current_screen.monster_batch
+        self.assertIsNot(resumed, batch)
+        self.assertTrue((state[0] == -1).any())
+        for name, before, after in zip(("direction", "velocity_y", "last_attack_time"), state,
+                                       [resumed.direction, resumed.velocity_y, resumed.last_attack_time]):
+            self.assertEqual(before.tolist(), after.tolist(), name)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import csv
+import json
+import os
+import tempfile
+import unittest
+import pygame
+from src.game import Game
+from src.profiler import FrameProfiler, percentile
+import config
+
+class TestFrameProfiler(unittest.TestCase):
+
+    def test_percentiles_use_nearest_rank(self):
+        samples = list(range(1, 101))
+        self.assertEqual(percentile(samples, 50), 50)
+        self.assertEqual(percentile(samples, 95), 95)
+        self.assertEqual(percentile(samples, 99), 99)
+        self.assertEqual(percentile([7], 99), 7)
+
+    def test_rolling_window_keeps_latest_samples(self):
+        profiler = FrameProfiler(window=10, show_overlay=False)
+        for ms in range(100):
+            profiler.record("draw", ms / 1000.0)
+        stats = profiler.stats("draw")
+        self.assertEqual(stats["count"], 10)
+        self.assertAlmostEqual(stats["p50_ms"], 94.0)
+        self.assertAlmostEqual(stats["max_ms"], 99.0)
+        self.assertIsNone(profiler.stats("events"))
+
+    def test_gameplay_ticks_record_update_phases(self):
+        game = Game(headless=True, profile=True)
+        game.start_new_game()
+        game.run_headless(max_ticks=30)
+        summary = game.profiler.summary()
+        for phase in ("player.update", "pet.update", "update_monsters"):
+            self.assertEqual(summary[phase]["count"], 30, phase)
+        self.assertIsNone(Game(headless=True, profile=False).profiler)
+
+    def test_dump_writes_json_and_csv(self):
+        profiler = FrameProfiler(show_overlay=False)
+        profiler.record("frame", 0.016)
+        with tempfile.TemporaryDirectory() as directory:
+            json_path = os.path.join(directory, "profile.json")
+            csv_path = os.path.join(directory, "profile.csv")
+            profiler.dump(json_path)
+            profiler.dump(csv_path)
+            with open(json_path) as f:
+                self.assertAlmostEqual(json.load(f)["frame"]["p99_ms"], 16.0)
+            with open(csv_path, newline='') as f:
+                rows = list(csv.DictReader(f))
+            self.assertEqual(rows[0]["phase"], "frame")
+            self.assertAlmostEqual(float(rows[0]["p50_ms"]), 16.0)
+
+    def test_overlay_draws_in_top_right_corner(self):
+        pygame.font.init()
+        surface = pygame.Surface((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
+        profiler = FrameProfiler(show_overlay=True)
+        profiler.record("draw", 0.002)
+        rect = profiler.draw_overlay(surface)
+        self.assertEqual(rect.topright, (config.SCREEN_WIDTH, 0))
+        profiler.show_overlay = False
+        self.assertIsNone(profiler.draw_overlay(surface))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+import pygame
+from src.game import Game
+from src.items import create_item_from_dict
+import config
+
+class TestDirtyRectRendering(unittest.TestCase):
+
+    def setUp(self):
+        self.game = Game(headless=True)
+        self.game.start_new_game()
+        self.gameplay = self.game.current_screen
+        self.full_frame = pygame.Surface(self.game.screen.get_size())
+        self.presented = pygame.Surface(self.game.screen.get_size()) # What the display would show
+
+    def render_full(self):
+        """The full-redraw path, drawn into its own surface."""
+        self.gameplay.screen = self.full_frame
+        self.gameplay.draw()
+        self.gameplay.screen = self.game.screen
+
+    def present_dirty(self):
+        """The dirty-rect path; only the returned rects reach the 'display'."""
+        for rect in self.gameplay.draw_dirty():
+            self.presented.blit(self.game.screen, rect, rect)
+
+    def assert_same_frame(self, message):
+        self.assertEqual(pygame.image.tostring(self.presented, "RGB"), pygame.image.tostring(self.full_frame, "RGB"), message)
+
+    def test_presented_frames_match_full_redraw(self):
+        """Movement, interpolation, hit flashes, attack swipes and HUD changes all reach the screen."""
+        player = self.gameplay.player
+        step = 1.0 / config.SIMULATION_HZ
+        for frame in range(180):
+            self.gameplay._remember_positions() # Headless updates skip this; it feeds interpolation
+            if frame % 20 == 0:
+                player.move(player.speed * 5, 0, self.game.platform_grid)
+            if frame % 45 == 10:
+                player.take_damage(1) # Health text and hit flash change
+                player.last_attack_time = player.attack_cooldown
+                player.attempt_attack(self.gameplay.monsters_list)
+            if frame == 60:
+                item = create_item_from_dict(dict(config.GENERIC_ITEM_DEFAULTS["HealthPotion"]))
+                player.inventory.add_item(item, 1) # Inventory lines appear
+            if frame == 90 and self.gameplay.monsters_list:
+                monster = self.gameplay.monsters_list[0]
+                monster.start_x = 30 # Patrols under the HUD text while it falls
+                monster.rect.topleft = (20, 0)
+            self.gameplay.update(step)
+            self.game.render_alpha = (frame % 4) / 4.0
+            self.render_full()
+            self.present_dirty()
+            self.assert_same_frame(f"frame {frame}")
+
+    def test_level_change_redraws_everything(self):
+        self.present_dirty()
+        self.game.load_level_assets(1)
+        self.gameplay.monster_index.reset(self.gameplay.monsters_list)
+        self.assertEqual(self.gameplay.draw_dirty(), [self.game.screen.get_rect()])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+import json
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+from unittest import mock
+from src import save_format
+from src.save_format import serialize, deserialize, detect_format, read_header, JSON, BINARY, SAVE_VERSION
+from src.save_format import BINARY_MAGIC, HEADER_SIZE, CorruptSaveError
+from src.save_manager import SaveManager
+from src.inventory_manager import InventoryManager
+from src.items import get_item_definition
+
+def make_save(stacks=40):
+    inventory = InventoryManager(capacity=stacks)
+    for name in ("MonsterPart", "HealthPotion"):
+        item = get_item_definition(name)
+        inventory.add_item(item, item.max_stack * stacks // 2)
+    return {
+        "current_level_index": 2,
+        "player_data": {
+            "health": 90, "max_health": 120.5, "level": 3, "xp": 40, "xp_to_next_level": 300,
+            "inventory": inventory.get_serializable_data(),
+            "position": [100, 200],
+            "pet_data": {"health": 50, "position": [60, 200], "name": None, "active": True},
+        },
+    }
+
+class TestSaveFormat(unittest.TestCase):
+
+    def test_both_formats_round_trip(self):
+        data = make_save()
+        for fmt in (JSON, BINARY):
+            raw = serialize(data, fmt)
+            self.assertEqual(detect_format(raw), fmt)
+            self.assertEqual(deserialize(raw), data)
+
+    def test_binary_stores_each_item_once(self):
+        data = make_save(stacks=200)
+        binary, text = serialize(data, BINARY), serialize(data, JSON)
+        self.assertEqual(binary.count(b"Restores a small amount of health."), 1)
+        self.assertLess(len(binary), len(text) // 5)
+        slots = deserialize(binary)["player_data"]["inventory"]
+        self.assertIs(slots[0]["item_data"], slots[1]["item_data"]) # Shared through the item table
+
+    def test_unversioned_json_saves_still_load(self):
+        data = make_save()
+        raw = json.dumps(data, indent=4).encode("utf-8") # What saves looked like before versioning
+        self.assertEqual(deserialize(raw), data)
+
+    def test_migrations_run_in_order(self):
+        data = make_save()
+        raw = json.dumps(dict(data, save_version=SAVE_VERSION - 1)).encode("utf-8")
+        upgrade = lambda old: dict(old, migrated=True)
+        with mock.patch.dict(save_format.MIGRATIONS, {SAVE_VERSION - 1: upgrade}):
+            self.assertTrue(deserialize(raw)["migrated"])
+        too_new = json.dumps(dict(data, save_version=SAVE_VERSION + 1)).encode("utf-8")
+        with self.assertRaises(ValueError):
+            deserialize(too_new)
+
+    def test_damaged_binary_is_rejected(self):
+        raw = serialize(make_save(), BINARY)
+        for damaged in (raw[:len(raw) // 2], raw + b"x"):
+            with self.assertRaises((ValueError, struct.error)):
+                deserialize(damaged)
+
+    def test_checksum_catches_damage_before_decoding(self):
+        raw = bytearray(serialize(make_save(), BINARY))
+        raw[len(raw) // 2] ^= 0x01 # One flipped bit that still decodes
+        with mock.patch.object(save_format.json, "loads") as loads:
+            with self.assertRaises(CorruptSaveError):
+                deserialize(bytes(raw))
+            loads.assert_not_called()
+
+    def test_header_holds_the_menu_metadata(self):
+        raw = serialize(make_save(), BINARY)
+        metadata = read_header(raw[:HEADER_SIZE])
+        self.assertEqual((metadata["current_level_index"], metadata["player_level"], metadata["health"]), (2, 3, 90))
+        self.assertEqual(metadata["save_version"], SAVE_VERSION)
+        self.assertIsNone(read_header(serialize(make_save(), JSON)[:HEADER_SIZE]))
+
+    def test_version_1_binary_saves_still_load(self):
+        data = make_save()
+        payload = serialize(data, BINARY)[HEADER_SIZE:] # Sections are unchanged; version 1 had no metadata header
+        self.assertEqual(deserialize(struct.pack("<4sH", BINARY_MAGIC, 1) + payload), data)
+
+
+class TestSaveManagerFormats(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_format_follows_the_file_name_and_older_json_saves_load(self):
+        binary = SaveManager(os.path.join(self.directory, "savegame.sav"))
+        self.assertEqual(binary.save_format, BINARY)
+        self.assertEqual(SaveManager(os.path.join(self.directory, "savegame.json")).save_format, JSON)
+
+        data = make_save()
+        with open(os.path.join(self.directory, "savegame.json"), 'w') as f:
+            json.dump(data, f, indent=4)
+        self.assertTrue(binary.has_save())
+        self.assertEqual(binary.load_data(), data)
+
+        self.assertTrue(binary.save_data(data)) # Next save is binary
+        with open(os.path.join(self.directory, "savegame.sav"), 'rb') as f:
+            self.assertEqual(detect_format(f.read()), BINARY)
+        self.assertEqual(binary.load_data(), data)
+
+    def test_saves_are_listed_from_their_headers(self):
+        manager = SaveManager(os.path.join(self.directory, "savegame.sav"))
+        manager.save_data(make_save())
+        manager.save_data(dict(make_save(), current_level_index=0), slot="b")
+        with mock.patch("src.save_manager.deserialize") as full_load:
+            saves = manager.list_saves()
+            full_load.assert_not_called()
+        self.assertEqual([(slot, info["current_level_index"]) for slot, info in saves], [(None, 2), ("b", 0)])
+
+        path = manager.slot_path("b")
+        with open(path, 'r+b') as f: # Damage the payload, not the header
+            f.seek(HEADER_SIZE + 10)
+            f.write(b"\xff\xff")
+        self.assertEqual(manager.read_metadata("b")["current_level_index"], 0) # Caught when it's loaded
+        with mock.patch("builtins.print"):
+            self.assertIsNone(manager.load_data("b"))
+
+if __name__ == '__main__':
+    unittest.main()
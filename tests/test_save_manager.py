@@ -0,0 +1,94 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from src.game import Game
+from src.save_manager import SaveManager
+from src.items import get_item_definition
+import config
+
+class TestSaveManager(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.manager = SaveManager(save_filename=os.path.join(self.directory, "savegame.json"))
+
+    def tearDown(self):
+        self.manager.close()
+        shutil.rmtree(self.directory)
+
+    def test_save_and_load_slots(self):
+        self.assertTrue(self.manager.save_data({"level": 1}))
+        self.assertTrue(self.manager.save_data({"level": 2}, slot="quick"))
+        self.assertEqual(self.manager.load_data(), {"level": 1})
+        self.assertEqual(self.manager.load_data("quick"), {"level": 2})
+        self.assertEqual(self.manager.slot_path("quick"), os.path.join(self.directory, "savegame_quick.json"))
+        self.assertEqual(self.manager.list_slots(), ["quick"])
+        self.assertIsNone(self.manager.load_data("missing"))
+        with self.assertRaises(ValueError):
+            self.manager.slot_path("../outside")
+
+    def test_async_saves_report_completion_in_order(self):
+        finished = []
+        futures = [self.manager.save_data_async({"n": n}, slot="auto", callback=lambda ok, path: finished.append(ok))
+                   for n in range(5)]
+        self.assertTrue(futures[-1].result(timeout=5))
+        self.assertEqual(self.manager.load_data("auto"), {"n": 4}) # Last one requested wins
+        self.assertEqual(finished, [True] * 5)
+
+    def test_failed_write_keeps_previous_save(self):
+        """A crash before the rename leaves the old save untouched and no temp files behind."""
+        self.manager.save_data({"level": 1})
+        with mock.patch("src.save_manager.os.replace", side_effect=OSError("disk pulled")):
+            self.assertFalse(self.manager.save_data({"level": 2}))
+        self.assertEqual(self.manager.load_data(), {"level": 1})
+        self.assertEqual(os.listdir(self.directory), ["savegame.json"])
+
+
+class TestGameSaves(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.game = Game(headless=True)
+        self.game.save_manager = SaveManager(save_filename=os.path.join(self.directory, "savegame.json"))
+        self.game.start_new_game()
+
+    def tearDown(self):
+        self.game.save_manager.close()
+        shutil.rmtree(self.directory)
+
+    def test_save_then_load_game_state(self):
+        player = self.game.player
+        player.inventory.add_item(get_item_definition("MonsterPart"), 7)
+        player.health = 42
+        self.game.current_level_index = 2
+        future = self.game.save_game_state(slot="one")
+        player.health = 1 # Changes after the snapshot don't reach the save
+        self.assertTrue(future.result(timeout=5))
+
+        self.game.current_level_index = 0
+        self.assertTrue(self.game.load_game_state("one"))
+        self.assertEqual(self.game.current_level_index, 2)
+        self.assertEqual(player.health, 42)
+        self.assertEqual(player.inventory.get_item_count("Monster Part"), 7)
+        self.assertFalse(self.game.load_game_state("missing"))
+
+    def test_menu_explains_a_save_that_fails_to_load(self):
+        self.game.save_manager = SaveManager(save_filename=os.path.join(self.directory, "savegame.sav"))
+        self.assertTrue(self.game.save_game_state().result(timeout=5))
+        with open(self.game.save_manager.slot_path(), 'r+b') as f: # Damage the payload, not the header
+            f.seek(-4, os.SEEK_END)
+            f.write(b"\xff\xff\xff\xff")
+        self.game.set_game_state(config.STATE_MAIN_MENU)
+        self.assertIsNotNone(self.game.save_manager.read_metadata()) # Only the header is read for the menu
+        with mock.patch("builtins.print"):
+            self.game.load_saved_game()
+        self.assertEqual(self.game.current_game_state, config.STATE_MAIN_MENU)
+        self.assertIn("couldn't be loaded", self.game.menu_message)
+        self.game.current_screen.draw()
+        self.game.start_new_game()
+        self.assertIsNone(self.game.menu_message)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+from src.game import Game, STATE_GAMEPLAY
+from src.simulation import AutoBattleController
+import config
+
+class TestHeadlessSimulation(unittest.TestCase):
+
+    def setUp(self):
+        """Create a headless game: no window, no mixer, no frame pacing."""
+        self.game = Game(headless=True)
+
+    def test_headless_game_has_no_mixer(self):
+        """The sound manager should never initialize the mixer in headless mode."""
+        self.assertFalse(self.game.sound_manager.mixer_initialized)
+
+    def test_run_headless_respects_max_ticks(self):
+        """Without a controller nothing dies, so the run should stop at max_ticks."""
+        stats = self.game.run_headless(max_ticks=120)
+        self.assertEqual(stats["ticks"], 120)
+        self.assertEqual(stats["final_state"], STATE_GAMEPLAY)
+        self.assertGreater(stats["ticks_per_second"], 0)
+
+    def test_auto_battle_clears_first_level(self):
+        """The bot controller should defeat level 1 and move on to level 2."""
+        stats = self.game.run_headless(max_ticks=config.FPS * 60, controller=AutoBattleController())
+        self.assertGreaterEqual(stats["levels_cleared"], 1)
+
+class TestFixedTimestepLoop(unittest.TestCase):
+
+    def setUp(self):
+        self.game = Game(headless=True)
+        self.game.start_new_game()
+        self.step = 1.0 / config.SIMULATION_HZ
+
+    def test_runs_whole_steps_and_keeps_the_remainder(self):
+        """2.5 steps of real time run 2 simulation steps; the half step is left for interpolation."""
+        steps = self.game.advance_simulation(self.step * 2.5)
+        self.assertEqual(steps, 2)
+        self.assertAlmostEqual(self.game.render_alpha, 0.5)
+        self.assertAlmostEqual(self.game.sim_time_ms, 2000.0 / config.SIMULATION_HZ)
+        self.assertEqual(self.game.advance_simulation(self.step * 0.6), 1) # Remainder carries over
+
+    def test_catch_up_is_bounded(self):
+        """A long stall runs at most MAX_SIM_STEPS_PER_FRAME steps and drops the rest of the backlog."""
+        steps = self.game.advance_simulation(2.0)
+        self.assertEqual(steps, config.MAX_SIM_STEPS_PER_FRAME)
+        self.assertLess(self.game.sim_accumulator, self.step)
+        self.assertEqual(self.game.advance_simulation(0.0), 0)
+
+    def test_interpolated_draw_leaves_rects_untouched(self):
+        """Drawing between ticks must not move entities in the simulation."""
+        screen = self.game.current_screen
+        monster = screen.monsters_list[0]
+        screen.previous_positions = {monster: (monster.rect.x - 10, monster.rect.y)}
+        self.game.render_alpha = 0.5
+        before = monster.rect.copy()
+        screen.draw()
+        self.assertEqual(monster.rect, before)
+
+if __name__ == '__main__':
+    unittest.main()
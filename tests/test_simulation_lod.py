@@ -0,0 +1,104 @@
+import unittest
+from unittest import mock
+from src.game import Game
+from src.level_generator import generate_level
+from src.monster_batch import np
+from src.simulation_lod import ACTIVE, REDUCED, FROZEN
+import config
+
+def start_game(level=None, profile=False):
+    game = Game(headless=True, profile=profile)
+    with mock.patch("builtins.print"), mock.patch.object(config, "LEVEL_CONFIGS", [level] if level else None):
+        game.start_new_game()
+    return game
+
+def flyer_level(world_width=8000):
+    return generate_level(seed=5, platform_count=20, monster_count=400, world_width=world_width,
+                          monster_mix={"Flyer": 1}, monster_stats={"attack_damage": 0})
+
+def grunt_level(world_width=8000):
+    # Only the ground: no Grunt spawns inside a ledge
+    return generate_level(seed=6, platform_count=1, monster_count=300, world_width=world_width,
+                          monster_mix={"Grunt": 1}, monster_stats={"attack_damage": 0})
+
+
+class TestMonsterLOD(unittest.TestCase):
+
+    def test_tiers_by_distance_from_the_view(self):
+        game = start_game(flyer_level())
+        gameplay = game.current_screen
+        gameplay.update_monsters(1.0 / config.SIMULATION_HZ)
+        counts = gameplay.monster_lod.counts
+        self.assertEqual(sum(counts.values()), len(game.monsters_list))
+        self.assertTrue(all(counts[tier] > 0 for tier in (ACTIVE, REDUCED, FROZEN)), counts)
+
+        view = game.camera.view_at(game.player.rect.centerx, game.player.rect.centery)
+        low = view.right + config.MONSTER_ACTIVE_DISTANCE
+        high = view.right + config.MONSTER_SLEEP_DISTANCE
+        reduced = [m for m in game.monsters_list if m.rect.left >= low and m.rect.right <= high - 100]
+        starts = [m.rect.topleft for m in reduced]
+        interval = config.MONSTER_REDUCED_TICK_INTERVAL
+        moves = [0] * len(reduced)
+        for _ in range(interval * 5):
+            before = [m.rect.topleft for m in reduced]
+            gameplay.update_monsters(1.0 / config.SIMULATION_HZ)
+            for i, monster in enumerate(reduced):
+                moves[i] += monster.rect.topleft != before[i]
+        self.assertTrue(reduced)
+        self.assertEqual(moves, [5] * len(reduced)) # Once every interval ticks
+        self.assertNotEqual([m.rect.topleft for m in reduced], starts)
+
+    def test_reduced_grunts_fall_every_tick(self):
+        """Far-off Grunts fall smoothly and only patrol on their due ticks, batched or not."""
+        interval = config.MONSTER_REDUCED_TICK_INTERVAL
+        min_counts = (10**9, 1) if np is not None else (10**9,)
+        paths = []
+        for min_count in min_counts:
+            with mock.patch.object(config, "MONSTER_BATCH_MIN_COUNT", min_count):
+                game = start_game(grunt_level())
+            gameplay = game.current_screen
+            view = game.camera.view_at(game.player.rect.centerx, game.player.rect.centery)
+            low = view.right + config.MONSTER_ACTIVE_DISTANCE
+            high = view.right + config.MONSTER_SLEEP_DISTANCE
+            reduced = [m for m in game.monsters_list if m.rect.left >= low + 100 and m.rect.right <= high - 100]
+            for monster in reduced:
+                monster.rect.y -= 200 # In mid-air
+            if gameplay.monster_batch is not None:
+                gameplay.monster_batch.reset(game.monsters_list)
+            path = [[m.rect.topleft for m in reduced]]
+            for _ in range(interval * 3):
+                gameplay.update_monsters(1.0 / config.SIMULATION_HZ)
+                path.append([m.rect.topleft for m in reduced])
+            self.assertTrue(reduced)
+            for i in range(len(reduced)):
+                ys = [tick[i][1] for tick in path]
+                xs = [tick[i][0] for tick in path]
+                self.assertTrue(all(a < b for a, b in zip(ys, ys[1:])), ys) # Falling on every tick
+                self.assertEqual(sum(a != b for a, b in zip(xs, xs[1:])), 3) # Patrolling once every interval ticks
+            paths.append(path)
+        self.assertEqual(paths[0], paths[-1])
+
+    def test_levels_that_fit_the_screen_update_everything(self):
+        game = start_game()
+        game.current_screen.update_monsters(1.0 / config.SIMULATION_HZ)
+        self.assertEqual(game.current_screen.monster_lod.counts, {ACTIVE: len(game.monsters_list), REDUCED: 0, FROZEN: 0})
+
+    def test_runs_are_deterministic(self):
+        results = []
+        for _ in range(2):
+            game = start_game(flyer_level())
+            for tick in range(200):
+                game.player.rect.x = 20 * tick
+                game.current_screen.update_monsters(1.0 / config.SIMULATION_HZ)
+            results.append([m.rect.topleft for m in game.monsters_list])
+        self.assertEqual(results[0], results[1])
+
+    def test_tier_counts_reach_the_profiler(self):
+        game = start_game(flyer_level(), profile=True)
+        game.current_screen.update(1.0 / config.SIMULATION_HZ)
+        counters = game.profiler.counters
+        self.assertEqual(counters["monsters active"] + counters["monsters reduced"] + counters["monsters frozen"],
+                         len(game.monsters_list))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import random
+import unittest
+import pygame
+from src.spatial import PlatformGrid, MonsterIndex, in_attack_reach
+from src.world_elements import Platform
+from src.monster import Grunt
+from src.player import Player
+import config
+
+def make_platforms(count, seed):
+    rng = random.Random(seed)
+    platforms = [Platform(0, config.SCREEN_HEIGHT - 40, 4000, 40)]
+    for _ in range(count - 1):
+        platforms.append(Platform(rng.randint(0, 3800), rng.randint(50, 520), rng.randint(30, 300), rng.randint(10, 60)))
+    return platforms
+
+class TestPlatformGrid(unittest.TestCase):
+
+    def setUp(self):
+        self.platforms = make_platforms(200, seed=1)
+        self.grid = PlatformGrid(self.platforms, cell_size=64)
+
+    def test_query_finds_every_colliding_platform_in_level_order(self):
+        """Grid results must contain all platforms a full scan would hit, in list order."""
+        rng = random.Random(2)
+        for _ in range(500):
+            rect = pygame.Rect(rng.randint(-50, 4000), rng.randint(-50, 600), rng.randint(1, 150), rng.randint(1, 150))
+            expected = [p for p in self.platforms if rect.colliderect(p.rect)]
+            found = [p for p in self.grid.query(rect) if rect.colliderect(p.rect)]
+            self.assertEqual(found, expected)
+
+    def test_iterating_grid_yields_all_platforms(self):
+        self.assertEqual(list(self.grid), self.platforms)
+        self.assertEqual(len(self.grid), len(self.platforms))
+
+    def test_player_movement_matches_linear_scan(self):
+        """A player driven through the level ends up identical with a list or the grid."""
+        # Spawn somewhere free: a player embedded in a platform is an invalid state either way.
+        spawn = pygame.Rect(0, 100, config.PLAYER_WIDTH, config.PLAYER_HEIGHT)
+        while spawn.collidelist([p.rect for p in self.platforms]) != -1:
+            spawn.x += 10
+        players = [Player(spawn.x, spawn.y, config.PLAYER_WIDTH, config.PLAYER_HEIGHT, config.PLAYER_COLOR) for _ in range(2)]
+        rng = random.Random(3)
+        for frame in range(600):
+            dx = rng.choice([-config.PLAYER_SPEED, 0, config.PLAYER_SPEED])
+            jump = rng.random() < 0.05
+            for player, platforms in zip(players, (self.platforms, self.grid)):
+                if jump and not player.is_jumping:
+                    player.is_jumping = True
+                    player.velocity_y = config.JUMP_STRENGTH
+                player.move(dx, 0, platforms)
+                player.update(platforms, [])
+            self.assertEqual(players[0].rect, players[1].rect, f"diverged at frame {frame}")
+            self.assertEqual(players[0].velocity_y, players[1].velocity_y)
+
+class TestMonsterIndex(unittest.TestCase):
+
+    def setUp(self):
+        rng = random.Random(4)
+        stats = config.DEFAULT_GRUNT_STATS
+        self.monsters = [Grunt(x=rng.randint(0, 2000), y=rng.randint(0, 560), width=stats["width"], height=stats["height"],
+                               color=stats["color"], health=stats["health"], attack_damage=stats["attack_damage"],
+                               attack_range=rng.choice([40, 50, 90]), attack_cooldown=stats["attack_cooldown"],
+                               speed=stats["speed"], patrol_range_x=stats["patrol_range_x"],
+                               gravity_val=config.GRAVITY, screen_height_val=config.SCREEN_HEIGHT)
+                         for _ in range(300)]
+        self.index = MonsterIndex(self.monsters)
+
+    def test_query_rect_matches_linear_scan(self):
+        rng = random.Random(5)
+        for _ in range(300):
+            rect = pygame.Rect(rng.randint(-50, 2000), rng.randint(-50, 600), rng.randint(1, 120), rng.randint(1, 120))
+            expected = [m for m in self.monsters if m.rect.colliderect(rect)]
+            self.assertEqual(self.index.query_rect(rect), expected)
+
+    def test_nearest_matches_linear_scan(self):
+        """Same target and tie-breaking as Pet's original closest-monster loop."""
+        rng = random.Random(6)
+        for _ in range(300):
+            x, y, max_distance = rng.randint(0, 2000), rng.randint(0, 600), rng.choice([40, 75, 200])
+            closest, min_dist_sq = None, float('inf')
+            for monster in self.monsters:
+                dist_sq = (x - monster.rect.centerx)**2 + (y - monster.rect.centery)**2
+                if dist_sq < min_dist_sq:
+                    closest, min_dist_sq = monster, dist_sq
+            if min_dist_sq >= max_distance**2:
+                closest, min_dist_sq = None, float('inf')
+            self.assertEqual(self.index.nearest(x, y, max_distance), (closest, min_dist_sq))
+
+    def test_refresh_follows_live_list(self):
+        """Moved and removed monsters are seen once the index is marked dirty."""
+        self.index.query_rect(pygame.Rect(0, 0, 10, 10)) # Force an initial refresh
+        moved, removed = self.monsters[0], self.monsters[1]
+        moved.rect.topleft = (5000, 100)
+        self.monsters.remove(removed)
+        self.index.mark_dirty()
+        self.assertEqual(self.index.query_rect(moved.rect), [moved])
+        self.assertNotIn(removed, self.index.query_rect(removed.rect))
+
+    def test_in_attack_reach_matches_inflate(self):
+        """The allocation-free reach test must agree with Rect.inflate + colliderect."""
+        rng = random.Random(7)
+        for _ in range(2000):
+            rect = pygame.Rect(rng.randint(0, 200), rng.randint(0, 200), rng.randint(1, 60), rng.randint(1, 60))
+            target = pygame.Rect(rng.randint(0, 200), rng.randint(0, 200), rng.randint(1, 60), rng.randint(1, 60))
+            attack_range = rng.randint(0, 101)
+            self.assertEqual(in_attack_reach(rect, attack_range, target),
+                             rect.inflate(attack_range, attack_range).colliderect(target))
+
+if __name__ == '__main__':
+    unittest.main()
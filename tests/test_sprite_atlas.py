@@ -0,0 +1,69 @@
+import unittest
+import pygame
+from src.game import Game
+from src.monster import Grunt
+from src.player import Player
+from src.sprite_atlas import SpriteAtlas, sprite_atlas, to_pixels
+from src.world_elements import Platform
+import config
+
+def frame_bytes(surface):
+    return pygame.image.tostring(surface, "RGB")
+
+
+class TestSpriteAtlas(unittest.TestCase):
+
+    def setUp(self):
+        self.surface = pygame.Surface((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
+        self.expected = pygame.Surface((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
+
+    def test_each_look_is_rendered_once(self):
+        atlas = SpriteAtlas()
+        sprite = atlas.solid(40, 40, config.RED)
+        self.assertIs(atlas.solid(40, 40, config.RED), sprite)
+        self.assertIsNot(atlas.solid(40, 40, config.HIT_COLOR), sprite)
+        self.assertEqual((len(atlas), sprite.get_at((0, 0))[:3]), (2, config.RED))
+        self.assertEqual(atlas.solid(-5, 10, config.RED).get_size(), (0, 10))
+        first, second = Platform(0, 0, 100, 20), Platform(300, 50, 100, 20)
+        self.assertIs(first.image, second.image) # Same size and color: one surface
+
+    def test_sprites_look_like_the_drawn_rectangles(self):
+        """Hit flashes and the attack swipe on either side match the former pygame.draw.rect visuals."""
+        player = Player(200, 300, config.PLAYER_WIDTH, config.PLAYER_HEIGHT, config.PLAYER_COLOR)
+        monster = Grunt(x=500, y=0, width=40, height=40, color=config.RED, health=10, attack_damage=1,
+                        attack_range=30, attack_cooldown=60, speed=1, patrol_range_x=50,
+                        gravity_val=config.GRAVITY, screen_height_val=config.SCREEN_HEIGHT)
+        platform = Platform(100, 500, 300, 30, config.GREY)
+        player.is_attacking = True
+        monster.take_damage(1)
+        for direction in (1, -1):
+            player.direction = direction
+            self.surface.fill(config.BLACK)
+            self.expected.fill(config.BLACK)
+            for entity in (platform, player, player.pet, monster):
+                entity.draw(self.surface)
+            pygame.draw.rect(self.expected, config.GREY, platform.rect)
+            pygame.draw.rect(self.expected, config.PLAYER_COLOR, player.rect)
+            swipe_x = player.rect.right if direction == 1 else player.rect.left - 30
+            pygame.draw.rect(self.expected, config.ATTACK_VISUAL_COLOR,
+                             pygame.Rect(swipe_x, player.rect.centery - player.rect.height * 0.4, 30, player.rect.height * 0.8))
+            pygame.draw.rect(self.expected, config.PET_COLOR, player.pet.rect)
+            pygame.draw.rect(self.expected, config.HIT_COLOR, monster.rect)
+            self.assertEqual(frame_bytes(self.surface), frame_bytes(self.expected), f"direction {direction}")
+
+    def test_positions_round_like_rects(self):
+        rect = pygame.Rect(0, 0, 1, 1)
+        for position in ((2.5, -2.5), (1.5, -1.5), (0.49, -0.51), (3, 4)):
+            rect.topleft = position
+            self.assertEqual(to_pixels(position), rect.topleft)
+
+    def test_gameplay_draws_from_the_atlas(self):
+        game = Game(headless=True)
+        game.start_new_game()
+        game.current_screen.draw()
+        sprite_count = len(sprite_atlas)
+        game.current_screen.draw()
+        self.assertEqual(len(sprite_atlas), sprite_count) # Nothing new rendered for an unchanged frame
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+import pygame
+from src.game import Game
+from src.text_cache import TextCache, get_font, text_cache
+import config
+
+class TestTextCache(unittest.TestCase):
+
+    def setUp(self):
+        pygame.font.init()
+        self.font = get_font(None, config.UI_FONT_SIZE)
+
+    def test_same_text_is_rendered_once(self):
+        cache = TextCache(max_entries=8)
+        first = cache.render(self.font, "Health: 100", config.WHITE)
+        second = cache.render(self.font, "Health: 100", config.WHITE)
+        self.assertIs(first, second)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        color = pygame.Color(0, 255, 0) # Not hashable itself, still cacheable
+        self.assertIs(cache.render(self.font, "XP", color), cache.render(self.font, "XP", color))
+        cache.reset_stats()
+        cache.render(self.font, "Health: 100", config.WHITE)
+        cache.render(self.font, "Health: 100", config.RED) # Different colour is a different surface
+        cache.render(self.font, "Health: 100", config.WHITE, antialias=False)
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+    def test_fonts_are_reloaded_after_pygame_quit(self):
+        text_cache.render(self.font, "Level 1", config.WHITE)
+        pygame.quit() # As between two games in one process (e.g. benchmarks)
+        pygame.font.init()
+        font = get_font(None, config.UI_FONT_SIZE)
+        self.assertIsNot(font, self.font)
+        self.assertEqual(len(text_cache), 0)
+        text_cache.render(font, "Level 1", config.WHITE) # The old font would crash here
+
+    def test_least_recently_used_entries_are_evicted(self):
+        cache = TextCache(max_entries=2)
+        cache.render(self.font, "a", config.WHITE)
+        cache.render(self.font, "b", config.WHITE)
+        cache.render(self.font, "a", config.WHITE) # "b" is now the least recently used
+        cache.render(self.font, "c", config.WHITE)
+        self.assertEqual(len(cache), 2)
+        cache.render(self.font, "a", config.WHITE)
+        self.assertEqual(cache.hits, 2)
+        cache.render(self.font, "b", config.WHITE)
+        self.assertEqual(cache.misses, 4)
+
+    def test_fonts_are_shared_per_name_and_size(self):
+        self.assertIs(get_font(None, 30), get_font(None, 30))
+        self.assertIsNot(get_font(None, 30), get_font(None, 31))
+        self.assertIs(get_font("no_such_font.ttf", 30), get_font("no_such_font.ttf", 30)) # Falls back, once
+
+    def test_unchanged_hud_is_not_rendered_again(self):
+        game = Game(headless=True)
+        game.start_new_game()
+        gameplay = game.current_screen
+        gameplay.draw() # Full-redraw path; fills the cache with the current HUD
+        text_cache.reset_stats()
+        gameplay.draw()
+        self.assertEqual(text_cache.misses, 0)
+        self.assertEqual(text_cache.hits, len(gameplay._hud_lines()))
+
+if __name__ == '__main__':
+    unittest.main()